@@ -1,218 +1,1229 @@
 import dash
-from dash import dcc, html, Input, Output, State
+import flask
+from dash import dcc, html, Input, Output, State, Patch, ClientsideFunction, MATCH
 import dash_bootstrap_components as dbc
+from dash.development.base_component import Component
+from dash.exceptions import PreventUpdate
 import base64
+import bisect
+import codecs
+import functools
+import hashlib
+import io
 import re
 import os
-import pandas as pd
-from datetime import datetime
+import tempfile
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import date, datetime, timedelta
+from urllib.parse import parse_qs
+from metrics import Metrics
+from report_diff import ReportDiff
+from report_history import ReportHistory
+from report_snapshot import read_snapshot, write_snapshot
+from short_interest import CAP_BANDS, UNLISTED, ShortInterestTable, load_short_interest
+# numpy and pandas are imported inside the functions that use them, so importing app (a gunicorn worker
+# booting, a container starting) doesn't pay for them until the first report is parsed or mapped
 
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
 server = app.server  # This is important for deployment
 
+DEFAULT_REPORT_PATH = "ITM_Analysis_Summary.txt"
+# Uploaded reports are spooled here by content hash so every gunicorn worker can re-parse them on a cache miss
+UPLOAD_DIR = os.environ.get('ITM_UPLOAD_DIR', os.path.join(tempfile.gettempdir(), 'itm-dashboard-uploads'))
+# Parsed reports are published here as memory-mapped column files that other workers map instead of re-parsing;
+# set ITM_SNAPSHOT_DIR to an empty string to keep every parse private to its worker
+SNAPSHOT_DIR = os.environ.get('ITM_SNAPSHOT_DIR', os.path.join(UPLOAD_DIR, 'snapshots'))
+# Set by gunicorn.conf.py: parse the default report and load finviz_short.csv at import so forked workers
+# inherit them copy-on-write
+PRELOAD = os.environ.get('ITM_PRELOAD', '').lower() in ('1', 'true', 'yes')
+# Otherwise a background thread does the same after import, so the process serves its first page while
+# pandas, the default report and finviz_short.csv load
+WARM_UP = os.environ.get('ITM_WARM_UP', '1').lower() in ('1', 'true', 'yes')
+# /upload-report streams request bodies up to this size into the parser without holding the whole file
+MAX_UPLOAD_BYTES = int(float(os.environ.get('ITM_MAX_UPLOAD_MB', 512)) * 2 ** 20)
+UPLOAD_CHUNK_SIZE = 64 * 1024
+REPORT_CACHE_SIZE = int(os.environ.get('ITM_REPORT_CACHE_SIZE', 8))
+FILTERED_VIEWS_PER_REPORT = 16
+# Memory cap (estimated) for rendered ticker blocks reused across detail-pane callbacks
+FRAGMENT_CACHE_MB = float(os.environ.get('ITM_FRAGMENT_CACHE_MB', 64))
+# Ship each parsed report to the browser once and run expiry/ticker filtering and rendering in assets/clientside.js
+CLIENTSIDE_FILTERING = os.environ.get('ITM_CLIENTSIDE_FILTERING', '').lower() in ('1', 'true', 'yes')
+# Put rows rendered per ticker block before a "Load more" button, and ticker blocks per page of the detail panes
+PUT_PAGE_SIZE = int(os.environ.get('ITM_PUT_PAGE_SIZE', 20))
+TICKER_PAGE_SIZE = int(os.environ.get('ITM_TICKER_PAGE_SIZE', 25))
+
+# Opt-in SQLite file that every parsed report is appended to, for cross-report trends
+HISTORY_DB = os.environ.get('ITM_HISTORY_DB')
+HISTORY_TREND_REPORTS = 30
+
+# Opt-in diskcache directory for Dash background callbacks: uploads are then decoded, parsed, published and added
+# to the history in a separate process, with a progress bar and a cancel button, while the worker that received
+# them keeps answering filter callbacks. Needs dash[diskcache] and ITM_SNAPSHOT_DIR
+BACKGROUND_DIR = os.environ.get('ITM_BACKGROUND_DIR')
+
+# Opt-in per-stage timings and callback histograms on /metrics; setting ITM_SLOW_CALLBACK_MS also turns them on
+# and logs every callback slower than that many milliseconds with its stage breakdown
+SLOW_CALLBACK_MS = os.environ.get('ITM_SLOW_CALLBACK_MS')
+METRICS = Metrics(
+    enabled=os.environ.get('ITM_METRICS', '').lower() in ('1', 'true', 'yes') or bool(SLOW_CALLBACK_MS),
+    slow_callback_seconds=float(SLOW_CALLBACK_MS) / 1000 if SLOW_CALLBACK_MS else None,
+)
+
+SHORT_INTEREST_PATH = "finviz_short.csv"
+# Seconds between checks of the default report and finviz_short.csv for changes; 0 disables the watcher
+RELOAD_INTERVAL = float(os.environ.get('ITM_RELOAD_INTERVAL', 2))
+
+# Rows in the summary panel's top puts and top tickers tables
+SUMMARY_TOP_N = 10
+
+# Reports remembered per browser for the comparison dropdown, and rows in each table of the diff panel
+RECENT_REPORTS = 10
+DIFF_TOP_N = 25
+
+# Quick ranges offered above the expiry checklist, counted from the report's Generated date
+EXPIRY_RANGE_DAYS = (7, 30, 90)
+
+PUT_SORT_OPTIONS = [
+    {'label': 'Report order', 'value': 'report'},
+    {'label': 'Premium', 'value': 'premium'},
+    {'label': 'ITM by', 'value': 'itm_by'},
+    {'label': 'Expiry', 'value': 'expiration'},
+]
 
-# NEW: Load short interest tickers from finviz_short.csv
-def load_short_interest_tickers():
-    """Load tickers from finviz_short.csv for short interest indicator"""
+
+def _background_manager():
+    """DiskcacheManager for the upload callback, or None to parse uploads in the request"""
+    if not BACKGROUND_DIR:
+        return None
+    if not SNAPSHOT_DIR:
+        # The job's parse only reaches the web workers as a snapshot; without one each worker would parse again
+        print("⚠️ ITM_BACKGROUND_DIR needs ITM_SNAPSHOT_DIR. Uploads will be parsed in the request.")
+        return None
     try:
-        short_df = pd.read_csv("finviz_short.csv")
-        if 'Ticker' in short_df.columns:
-            short_tickers = set(short_df['Ticker'].str.strip().str.upper())
-            print(f"✓ Loaded {len(short_tickers)} tickers from finviz_short.csv")
-            return short_tickers
-        else:
-            print("⚠️ 'Ticker' column not found in finviz_short.csv")
-            return set()
-    except FileNotFoundError:
-        print("⚠️ finviz_short.csv not found. Short interest indicators will not be shown.")
-        return set()
-    except Exception as e:
-        print(f"⚠️ Error loading finviz_short.csv: {str(e)}")
-        return set()
+        import diskcache
+    except ImportError:
+        print("⚠️ diskcache not installed (pip install 'dash[diskcache]'). Uploads will be parsed in the request.")
+        return None
+    return dash.DiskcacheManager(diskcache.Cache(BACKGROUND_DIR))
 
 
-# Load short interest tickers at startup
-SHORT_INTEREST_TICKERS = load_short_interest_tickers()
+BACKGROUND_MANAGER = _background_manager()
 
 
-def parse_itm_content(content_str):
-    # Parse normal tickers data
-    tickers_data, puts_data, calls_data = {}, {}, {}
+def _file_stamp(path):
+    """(mtime_ns, size) of path, or None if it doesn't exist"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
 
-    # Parse earnings tickers data
-    earnings_tickers_data, earnings_puts_data, earnings_calls_data = {}, {}, {}
 
-    # NORMAL TICKERS PARSING (existing logic)
-    tickers_section = re.search(
-        r'FINAL QUALIFYING TICKERS WITH CURRENT PRICES:\s*=+\s*(.*?)\s*CALL ACTIVITY ANALYSIS:',
-        content_str, re.DOTALL
-    )
+def load_short_interest_table(previous=None):
+    """Load the finviz_short.csv screener for the short interest indicator and the sector/market-cap groups.
 
-    if tickers_section:
-        for line in tickers_section.group(1).splitlines():
-            match = re.match(
-                r'([A-Z]+):\s*Current Price \$?([\d,.]+),\s*(\d+)\s*ITM puts,\s*Total Premium \$?([\d,.]+)', line)
+    previous is kept when the file's content hasn't changed.
+    """
+    try:
+        with METRICS.stage('short_interest'):
+            table = load_short_interest(SHORT_INTEREST_PATH, previous)
+        if table is previous:
+            print("✓ finviz_short.csv unchanged, keeping the loaded table")
+        else:
+            print(f"✓ Loaded {len(table)} tickers from finviz_short.csv ({table.load_seconds * 1000:.1f} ms)")
+        return table
+    except FileNotFoundError:
+        print("⚠️ finviz_short.csv not found. Short interest indicators will not be shown.")
+        return ShortInterestTable.empty()
+    except Exception as e:
+        print(f"⚠️ Error loading finviz_short.csv: {str(e)}")
+        return ShortInterestTable.empty()
+
+
+# The short interest table is loaded on first use rather than at import. The reload watcher starts from the
+# stamp at import, so a file written before the first load is at worst loaded twice (and the second time reused)
+_SHORT_INTEREST_STAMP = _file_stamp(SHORT_INTEREST_PATH)
+_short_interest_table = None
+_short_interest_lock = threading.Lock()
+
+
+def short_interest():
+    """The current ShortInterestTable, loading finviz_short.csv the first time it is needed"""
+    global _short_interest_table
+    table = _short_interest_table
+    if table is None:
+        with _short_interest_lock:
+            if _short_interest_table is None:
+                _short_interest_table = load_short_interest_table()
+            table = _short_interest_table
+    return table
+
+
+TICKER_SUMMARY_RE = re.compile(
+    r'([A-Z][A-Z0-9.]*):\s*Current Price \$?([\d,.]+),\s*(\d+)\s*ITM puts,\s*Total Premium \$?([\d,.]+)')
+TICKER_HEADER_RE = re.compile(r'([A-Z][A-Z0-9.]*)\s*\(Current Price.*\):')
+TICKER_HEADER_PREFIX_RE = re.compile(r'[A-Z][A-Z0-9.]*\s*\(Current Price')
+PUT_LINE_RE = re.compile(
+    r'Put #(\d+):\s*Strike \$?([\d,.]+),\s*Spot \$?([\d,.]+),\s*ITM by \$?([\d,.]+),\s*Premium \$?([\d,.]+),\s*Exp:\s*(.+)')
+# Any other all-caps "HEADER:" line (ANALYSIS METADATA, DISCLAIMER, ...) closes the current section
+SECTION_HEADER_RE = re.compile(r'[A-Z][A-Z0-9 ]*[A-Z]:$')
+
+# Section header line -> (section, is_earnings)
+REPORT_SECTIONS = {
+    'FINAL QUALIFYING TICKERS WITH CURRENT PRICES:': ('tickers', False),
+    'CALL ACTIVITY ANALYSIS:': ('calls', False),
+    'DETAILED PUT BREAKDOWN BY TICKER:': ('puts', False),
+    'FINAL QUALIFYING TICKERS WITH CURRENT PRICES with upcoming earnings:': ('tickers', True),
+    'CALL ACTIVITY ANALYSIS with upcoming earnings:': ('calls', True),
+    'DETAILED PUT BREAKDOWN BY TICKER with upcoming earnings:': ('puts', True),
+    'ANALYSIS OVERVIEW:': ('overview', False),
+    'FILTERING RESULTS:': ('overview', False),
+    'TOP 10 ITM PUTS BY PREMIUM VALUE:': ('top_puts', False),
+}
+
+
+def _to_float(value):
+    return float(value.replace(',', ''))
+
+
+class ITMReportParser:
+    """Single-pass state machine over the lines of an ITM_Analysis_Summary report.
+
+    Feed lines in order with feed() and collect the six parse_itm_content dicts with result().
+    The header's overview statistics and TOP 10 table end up in .header. Only the per-ticker
+    output is held in memory, so parsing from an open file is bounded by the size of the parsed
+    data rather than the size of the report.
+    """
+
+    def __init__(self):
+        self.generated = None
+        self.header = {'overview': {}, 'top_puts': []}
+        self.tickers_data, self.puts_data, self.calls_data = {}, {}, {}
+        self.earnings_tickers_data, self.earnings_puts_data, self.earnings_calls_data = {}, {}, {}
+        self._section = None
+        self._is_earnings = False
+        self._current_ticker = None
+        self._current_puts = None
+        self._call_parts = None
+
+    def feed(self, line):
+        line = line.strip()
+        if not line or line[0] == '=':
+            return
+
+        section = REPORT_SECTIONS.get(line)
+        if section is not None:
+            self._finish_calls()
+            self._section, self._is_earnings = section
+            self._current_ticker = None
+            if self._section == 'calls':
+                self._call_parts = {}
+            return
+        if SECTION_HEADER_RE.match(line):
+            self._finish_calls()
+            self._section = None
+            return
+
+        if self._section == 'tickers':
+            match = TICKER_SUMMARY_RE.match(line)
             if match:
                 ticker, price, num_puts, prem = match.groups()
+                tickers_data = self.earnings_tickers_data if self._is_earnings else self.tickers_data
                 tickers_data[ticker] = {
-                    'current_price': float(price.replace(',', '')),
+                    'current_price': _to_float(price),
                     'num_puts': int(num_puts),
-                    'total_premium': float(prem.replace(',', ''))
+                    'total_premium': _to_float(prem)
                 }
-
-    puts_section = re.search(
-        r'DETAILED PUT BREAKDOWN BY TICKER:\s*=+\s*(.*?)\s*ANALYSIS METADATA:',
-        content_str, re.DOTALL
-    )
-
-    if puts_section:
-        current_ticker = None
-        for line in puts_section.group(1).splitlines():
-            line = line.strip()
-            ticker_match = re.match(r'([A-Z]+)\s*\(Current Price.*\):', line)
+        elif self._section == 'puts':
+            if line.startswith('Put #'):
+                if self._current_ticker:
+                    put_match = PUT_LINE_RE.match(line)
+                    if put_match:
+                        idx, strike, spot, itm_by, premium, exp = put_match.groups()
+                        self._current_puts.append({
+                            'put_number': int(idx),
+                            'strike': _to_float(strike),
+                            'spot': _to_float(spot),
+                            'itm_by': _to_float(itm_by),
+                            'premium': _to_float(premium),
+                            'expiration': exp.strip()
+                        })
+                return
+            ticker_match = TICKER_HEADER_RE.match(line)
+            if ticker_match:
+                self._current_ticker = ticker_match.group(1)
+                puts_data = self.earnings_puts_data if self._is_earnings else self.puts_data
+                self._current_puts = puts_data[self._current_ticker] = []
+        elif self._section == 'calls':
+            ticker_match = TICKER_HEADER_RE.match(line)
             if ticker_match:
-                current_ticker = ticker_match.group(1)
-                puts_data[current_ticker] = []
-            elif current_ticker and line.startswith('Put #'):
-                put_match = re.match(
-                    r'Put #(\d+):\s*Strike \$?([\d,.]+),\s*Spot \$?([\d,.]+),\s*ITM by \$?([\d,.]+),\s*Premium \$?([\d,.]+),\s*Exp:\s*(.+)',
-                    line)
-                if put_match:
-                    idx, strike, spot, itm_by, premium, exp = put_match.groups()
-                    puts_data[current_ticker].append({
-                        'put_number': int(idx),
-                        'strike': float(strike.replace(',', '')),
-                        'spot': float(spot.replace(',', '')),
-                        'itm_by': float(itm_by.replace(',', '')),
-                        'premium': float(premium.replace(',', '')),
-                        'expiration': exp.strip()
+                self._current_ticker = ticker_match.group(1)
+                self._call_parts[self._current_ticker] = []
+            elif self._current_ticker and not TICKER_HEADER_PREFIX_RE.match(line):
+                self._call_parts[self._current_ticker].append(line)
+        elif self._section == 'overview':
+            if line.startswith('- ') and ':' in line:
+                name, value = line[2:].split(':', 1)
+                self.header['overview'][name.strip()] = value.strip()
+        elif self._section == 'top_puts':
+            fields = line.split()
+            if len(fields) == 6 and fields[0] != 'Symbol':
+                try:
+                    self.header['top_puts'].append({
+                        'ticker': fields[0],
+                        'strike': _to_float(fields[1]),
+                        'spot': _to_float(fields[2]),
+                        'premium': _to_float(fields[3]),
+                        'expiration': fields[4],
+                        'created': fields[5]
                     })
+                except ValueError:
+                    pass
+        elif self.generated is None and line.startswith('Generated:'):
+            self.generated = line[len('Generated:'):].strip()
 
-    calls_section = re.search(
-        r'CALL ACTIVITY ANALYSIS:\s*=+\s*(.*?)\s*DETAILED PUT BREAKDOWN',
-        content_str, re.DOTALL
-    )
+    def _finish_calls(self):
+        if self._call_parts is None:
+            return
+        calls_data = self.earnings_calls_data if self._is_earnings else self.calls_data
+        for ticker, parts in self._call_parts.items():
+            calls_data[ticker] = " ".join(parts)
+        self._call_parts = None
 
-    if calls_section:
-        current_ticker = None
-        for line in calls_section.group(1).splitlines():
-            line = line.strip()
-            ticker_match = re.match(r'([A-Z]+)\s*\(Current Price.*\):', line)
-            if ticker_match:
-                current_ticker = ticker_match.group(1)
-                calls_data[current_ticker] = ""
-            elif current_ticker and line and not re.match(r'[A-Z]+\s*\(Current Price', line):
-                calls_data[current_ticker] += line + " "
-        for tk in calls_data:
-            calls_data[tk] = calls_data[tk].strip()
-
-    # NEW: EARNINGS TICKERS PARSING
-    earnings_tickers_section = re.search(
-        r'FINAL QUALIFYING TICKERS WITH CURRENT PRICES with upcoming earnings:\s*=+\s*(.*?)\s*CALL ACTIVITY ANALYSIS with upcoming earnings:',
-        content_str, re.DOTALL
-    )
+    def result(self):
+        self._finish_calls()
+        return (self.tickers_data, self.puts_data, self.calls_data,
+                self.earnings_tickers_data, self.earnings_puts_data, self.earnings_calls_data)
 
-    if earnings_tickers_section:
-        for line in earnings_tickers_section.group(1).splitlines():
-            match = re.match(
-                r'([A-Z]+):\s*Current Price \$?([\d,.]+),\s*(\d+)\s*ITM puts,\s*Total Premium \$?([\d,.]+)', line)
-            if match:
-                ticker, price, num_puts, prem = match.groups()
-                earnings_tickers_data[ticker] = {
-                    'current_price': float(price.replace(',', '')),
-                    'num_puts': int(num_puts),
-                    'total_premium': float(prem.replace(',', ''))
-                }
 
-    earnings_puts_section = re.search(
-        r'DETAILED PUT BREAKDOWN BY TICKER with upcoming earnings:\s*=+\s*(.*?)\s*$',
-        content_str, re.DOTALL
-    )
+def _feed_report_lines(content):
+    parser = ITMReportParser()
+    with METRICS.stage('parse'):
+        for line in (io.StringIO(content) if isinstance(content, str) else content):
+            parser.feed(line)
+    return parser
 
-    if earnings_puts_section:
-        current_ticker = None
-        for line in earnings_puts_section.group(1).splitlines():
-            line = line.strip()
-            ticker_match = re.match(r'([A-Z]+)\s*\(Current Price.*\):', line)
-            if ticker_match:
-                current_ticker = ticker_match.group(1)
-                earnings_puts_data[current_ticker] = []
-            elif current_ticker and line.startswith('Put #'):
-                put_match = re.match(
-                    r'Put #(\d+):\s*Strike \$?([\d,.]+),\s*Spot \$?([\d,.]+),\s*ITM by \$?([\d,.]+),\s*Premium \$?([\d,.]+),\s*Exp:\s*(.+)',
-                    line)
-                if put_match:
-                    idx, strike, spot, itm_by, premium, exp = put_match.groups()
-                    earnings_puts_data[current_ticker].append({
-                        'put_number': int(idx),
-                        'strike': float(strike.replace(',', '')),
-                        'spot': float(spot.replace(',', '')),
-                        'itm_by': float(itm_by.replace(',', '')),
-                        'premium': float(premium.replace(',', '')),
-                        'expiration': exp.strip()
-                    })
 
-    earnings_calls_section = re.search(
-        r'CALL ACTIVITY ANALYSIS with upcoming earnings:\s*=+\s*(.*?)\s*DETAILED PUT BREAKDOWN BY TICKER with upcoming earnings:',
-        content_str, re.DOTALL
-    )
-
-    if earnings_calls_section:
-        current_ticker = None
-        for line in earnings_calls_section.group(1).splitlines():
-            line = line.strip()
-            ticker_match = re.match(r'([A-Z]+)\s*\(Current Price.*\):', line)
-            if ticker_match:
-                current_ticker = ticker_match.group(1)
-                earnings_calls_data[current_ticker] = ""
-            elif current_ticker and line and not re.match(r'[A-Z]+\s*\(Current Price', line):
-                earnings_calls_data[current_ticker] += line + " "
-        for tk in earnings_calls_data:
-            earnings_calls_data[tk] = earnings_calls_data[tk].strip()
+def parse_itm_content(content):
+    """Parse a report given as a string or any iterable of lines, such as an open text file"""
+    return _feed_report_lines(content).result()
 
-    return tickers_data, puts_data, calls_data, earnings_tickers_data, earnings_puts_data, earnings_calls_data
 
+# Expiry labels appear as both '11/7/2025' and '2025-10-24 00:00:00' in the same report
+EXPIRY_DATE_FORMATS = ('%m/%d/%Y', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d')
 
-def get_all_expiry_dates(puts_data, earnings_puts_data):
-    """Extract all unique expiry dates from both normal and earnings puts data"""
-    expiry_dates = set()
-    for ticker_puts in puts_data.values():
-        for put in ticker_puts:
-            expiry_dates.add(put['expiration'])
 
-    for ticker_puts in earnings_puts_data.values():
-        for put in ticker_puts:
-            expiry_dates.add(put['expiration'])
-
-    return sorted(list(expiry_dates))
-
-
-def filter_by_expiry_dates(puts_data, selected_expiry_dates):
-    """Filter puts data by selected expiry dates"""
-    if not selected_expiry_dates:
-        return puts_data
-
-    filtered_puts = {}
-    for ticker, ticker_puts in puts_data.items():
-        filtered_ticker_puts = [put for put in ticker_puts if put['expiration'] in selected_expiry_dates]
-        if filtered_ticker_puts:
-            filtered_puts[ticker] = filtered_ticker_puts
-    return filtered_puts
-
-
-def recalculate_ticker_data_for_filtered_puts(tickers_data, filtered_puts_data):
-    """Recalculate ticker summaries based on filtered puts"""
-    filtered_tickers_data = {}
-    for ticker in filtered_puts_data.keys():
-        if ticker in tickers_data:
-            ticker_puts = filtered_puts_data[ticker]
-            total_premium = sum(put['premium'] for put in ticker_puts)
-            filtered_tickers_data[ticker] = {
-                'current_price': tickers_data[ticker]['current_price'],
-                'num_puts': len(ticker_puts),
+@functools.lru_cache(maxsize=4096)
+def parse_expiry_date(label):
+    """Parse a put expiration label into a date, or None if it is in no known format"""
+    for fmt in EXPIRY_DATE_FORMATS:
+        try:
+            return datetime.strptime(label, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+@functools.lru_cache(maxsize=4096)
+def expiry_sort_key(label):
+    """Chronological sort key for an expiration label; unparseable labels sort last"""
+    expiry = parse_expiry_date(label)
+    return (expiry is None, expiry or datetime.min.date())
+
+
+def expiry_value(label):
+    """Checklist value for an expiration label: its ISO date, shared by every format of that date.
+    A label that doesn't parse is its own value."""
+    expiry = parse_expiry_date(label)
+    return expiry.isoformat() if expiry else label
+
+
+def sort_puts(ticker_puts, sort_by):
+    """Display order for one ticker's puts: premium and ITM by largest first, expiry soonest first"""
+    if sort_by == 'premium':
+        return sorted(ticker_puts, key=lambda put: put['premium'], reverse=True)
+    if sort_by == 'itm_by':
+        return sorted(ticker_puts, key=lambda put: put['itm_by'], reverse=True)
+    if sort_by == 'expiration':
+        return sorted(ticker_puts, key=lambda put: expiry_sort_key(put['expiration']))
+    return ticker_puts
+
+
+def build_puts_frame(puts_data, earnings_puts_data):
+    """Flatten the normal and earnings put dicts into one typed DataFrame, one row per put in report order"""
+    import numpy as np
+    import pandas as pd
+
+    columns = {name: [] for name in ('ticker', 'is_earnings', 'put_number', 'strike', 'spot', 'itm_by', 'premium',
+                                     'expiration')}
+    for is_earnings, data in ((False, puts_data), (True, earnings_puts_data)):
+        for ticker, ticker_puts in data.items():
+            for put in ticker_puts:
+                columns['ticker'].append(ticker)
+                columns['is_earnings'].append(is_earnings)
+                columns['put_number'].append(put['put_number'])
+                columns['strike'].append(put['strike'])
+                columns['spot'].append(put['spot'])
+                columns['itm_by'].append(put['itm_by'])
+                columns['premium'].append(put['premium'])
+                columns['expiration'].append(put['expiration'])
+
+    # Each distinct label is parsed once and broadcast through the category codes
+    labels = pd.Categorical(columns['expiration'])
+    label_dates = pd.to_datetime([parse_expiry_date(label) for label in labels.categories])
+    return pd.DataFrame({
+        'ticker': pd.Categorical(columns['ticker']),
+        'is_earnings': np.array(columns['is_earnings'], dtype=bool),
+        'put_number': np.array(columns['put_number'], dtype=np.int32),
+        'strike': np.array(columns['strike'], dtype=np.float64),
+        'spot': np.array(columns['spot'], dtype=np.float64),
+        'itm_by': np.array(columns['itm_by'], dtype=np.float64),
+        'premium': np.array(columns['premium'], dtype=np.float64),
+        'expiration': label_dates.take(labels.codes),
+        'expiration_label': labels,
+    })
+
+
+def summarize_puts_frame(puts_frame, tickers_data, earnings_tickers_data):
+    """Per-ticker num_puts and total_premium of a (filtered) puts frame, normal and earnings rows in one groupby"""
+    grouped = puts_frame.groupby(['is_earnings', 'ticker'], observed=True, sort=False)['premium'].agg(['size', 'sum'])
+    filtered_tickers_data, filtered_earnings_tickers_data = {}, {}
+    for (is_earnings, ticker), num_puts, total_premium in zip(grouped.index, grouped['size'].tolist(),
+                                                              grouped['sum'].tolist()):
+        source, target = ((earnings_tickers_data, filtered_earnings_tickers_data) if is_earnings
+                          else (tickers_data, filtered_tickers_data))
+        if ticker in source:
+            target[ticker] = {
+                'current_price': source[ticker]['current_price'],
+                'num_puts': num_puts,
                 'total_premium': total_premium
             }
-    return filtered_tickers_data
+    return filtered_tickers_data, filtered_earnings_tickers_data
+
+
+def puts_frame_by_ticker(puts_frame, is_earnings, tickers):
+    """Rebuild parse_itm_content-style put lists from a puts frame, only for the requested tickers"""
+    rows = puts_frame[puts_frame['is_earnings'] == is_earnings]
+    positions = rows.groupby('ticker', observed=True, sort=False).indices
+    puts_by_ticker = {}
+    for ticker in tickers:
+        if ticker not in positions:
+            continue
+        ticker_rows = rows.iloc[positions[ticker]]
+        puts_by_ticker[ticker] = [
+            {'put_number': put_number, 'strike': strike, 'spot': spot, 'itm_by': itm_by, 'premium': premium,
+             'expiration': expiration}
+            for put_number, strike, spot, itm_by, premium, expiration in zip(
+                ticker_rows['put_number'].tolist(), ticker_rows['strike'].tolist(), ticker_rows['spot'].tolist(),
+                ticker_rows['itm_by'].tolist(), ticker_rows['premium'].tolist(),
+                ticker_rows['expiration_label'].tolist())
+        ]
+    return puts_by_ticker
+
+
+CALL_ACTIVITY_RE = re.compile(r'Calls of strike ([\d.,]+) were bought for date (\d{1,2}/\d{1,2}/\d{4})')
+
+
+def parse_call_activity(call_text):
+    """Split one ticker's call activity text into (expiry date, strike) records"""
+    records = []
+    for strikes, expiry in CALL_ACTIVITY_RE.findall(call_text):
+        expiry_date = datetime.strptime(expiry, '%m/%d/%Y').date()
+        records.extend((expiry_date, float(strike)) for strike in strikes.split(',') if strike)
+    return records
+
+
+def format_strike(strike):
+    """Strike without trailing zeros: 240.0 -> '240', 257.5 -> '257.5'"""
+    return f"{strike:.2f}".rstrip('0').rstrip('.')
+
+
+class CallIndex:
+    """Call activity parsed once into (ticker, expiry, strike) records, indexed by ticker and by expiry date.
+
+    Tickers are keyed as (is_earnings, ticker) since the same symbol can appear in both halves of a report.
+    """
+
+    def __init__(self, calls_data, earnings_calls_data):
+        self.by_ticker = {}
+        self.by_expiry = {}
+        for is_earnings, data in ((False, calls_data), (True, earnings_calls_data)):
+            for ticker, call_text in data.items():
+                expiries = {}
+                for expiry, strike in parse_call_activity(call_text):
+                    expiries.setdefault(expiry, set()).add(strike)
+                key = (is_earnings, ticker)
+                self.by_ticker[key] = {expiry: sorted(strikes) for expiry, strikes in sorted(expiries.items())}
+                for expiry, strikes in self.by_ticker[key].items():
+                    self.by_expiry.setdefault(expiry, {})[key] = strikes
+        self._counts = {expiry: (len(tickers), sum(len(strikes) for strikes in tickers.values()))
+                        for expiry, tickers in sorted(self.by_expiry.items())}
+
+    def records(self):
+        """All calls as (ticker, is_earnings, expiry date, strike) tuples"""
+        return [(ticker, is_earnings, expiry, strike)
+                for (is_earnings, ticker), expiries in self.by_ticker.items()
+                for expiry, strikes in expiries.items()
+                for strike in strikes]
+
+    def calls_on(self, ticker, expiry_dates, is_earnings=False):
+        """{expiry date: strikes} for the calls of one ticker bought for any of expiry_dates"""
+        expiries = self.by_ticker.get((is_earnings, ticker), {})
+        return {expiry: strikes for expiry, strikes in expiries.items() if expiry in expiry_dates}
+
+    def strike_overlap(self, ticker, ticker_puts, is_earnings=False):
+        """(expiry date, strike) pairs where calls were bought at the same strike and expiry as one of the puts"""
+        expiries = self.by_ticker.get((is_earnings, ticker), {})
+        put_strikes = {}
+        for put in ticker_puts:
+            put_strikes.setdefault(parse_expiry_date(put['expiration']), set()).add(put['strike'])
+        return [(expiry, strike)
+                for expiry, strikes in expiries.items() if expiry in put_strikes
+                for strike in strikes if strike in put_strikes[expiry]]
+
+    def tickers_on(self, expiry):
+        """{(is_earnings, ticker): strikes} for every ticker with calls bought for expiry"""
+        return self.by_expiry.get(expiry, {})
+
+    def counts_by_expiry(self):
+        """{expiry date: (tickers, call strikes)} across the whole report"""
+        return self._counts
+
+
+class ExpiryIndex:
+    """Expiry dates in chronological order, each with the puts frame rows that expire on it.
+
+    Dates are keyed by expiry_value, so '10/24/2025' from the normal section and '2025-10-24 00:00:00' from
+    the earnings section are one entry holding both sections' puts. Labels that don't parse as a date come
+    last and are never part of a date range.
+    """
+
+    def __init__(self, puts_frame):
+        import numpy as np
+
+        labels = puts_frame['expiration_label'].cat
+        label_values = [expiry_value(label) for label in labels.categories]
+        value_dates = {value: parse_expiry_date(label) for label, value in zip(labels.categories, label_values)}
+        self.values = sorted(value_dates, key=lambda value: (value_dates[value] is None,
+                                                             value_dates[value] or date.min, value))
+        self.dates = [value_dates[value] for value in self.values if value_dates[value] is not None]
+        self.option_labels = {value: f"{expiry.month}/{expiry.day}/{expiry.year}" if expiry else value
+                              for value, expiry in value_dates.items()}
+        self._labels = {}
+        for label, value in zip(labels.categories, label_values):
+            self._labels.setdefault(value, []).append(label)
+
+        # Position in values of each label code, and row positions grouped by it; a stable sort keeps
+        # each date's rows in report order
+        position = {value: i for i, value in enumerate(self.values)}
+        self.code_positions = np.array([position[value] for value in label_values], dtype=np.intp)
+        row_positions = self.code_positions[labels.codes.to_numpy()]
+        rows_by_value = np.argsort(row_positions, kind='stable')
+        bounds = np.searchsorted(row_positions[rows_by_value], np.arange(len(self.values) + 1))
+        self._rows = {value: rows_by_value[bounds[i]:bounds[i + 1]] for i, value in enumerate(self.values)}
+
+        self.months = OrderedDict()
+        for value, expiry in zip(self.values, self.dates):
+            self.months.setdefault((expiry.year, expiry.month), []).append(value)
+
+    def options(self):
+        """Checklist options for every expiry, in date order"""
+        return [{'label': self.option_labels[value], 'value': value} for value in self.values]
+
+    def labels(self, values):
+        """Expiration labels, in any format, of the puts expiring on any of values"""
+        return [label for value in values for label in self._labels.get(value, [])]
+
+    def between(self, start, end):
+        """Expiry values on or after start and on or before end"""
+        return self.values[bisect.bisect_left(self.dates, start):bisect.bisect_right(self.dates, end)]
+
+    def rows(self, values):
+        """Sorted puts frame positions of the puts expiring on any of values"""
+        import numpy as np
+
+        groups = [self._rows[value] for value in values if value in self._rows]
+        if not groups:
+            return np.array([], dtype=np.intp)
+        return np.sort(np.concatenate(groups))
+
+    def ranges(self, as_of):
+        """(value, label, expiry values) for the next-N-days ranges from as_of and each calendar month"""
+        ranges = []
+        for days in EXPIRY_RANGE_DAYS:
+            values = self.between(as_of, as_of + timedelta(days=days))
+            ranges.append((f"days-{days}", f"Next {days} days ({len(values)})", values))
+        for (year, month), values in self.months.items():
+            ranges.append((f"month-{year}-{month:02d}", f"{date(year, month, 1):%b %Y} ({len(values)})", values))
+        return ranges
+
+
+class ReportAggregates:
+    """Premium, put count and premium-weighted ITM % partial sums per (expiry, ticker), built once.
+
+    Any expiry selection's totals are sums of its expiries' rows, added in date order, so a selection always
+    gets the same totals however the filter got there. ITM % is ITM by as a percentage of the strike.
+    """
+
+    def __init__(self, puts_frame, expiry_index, top_n=SUMMARY_TOP_N):
+        import numpy as np
+
+        self.puts_frame = puts_frame
+        self.values = expiry_index.values
+        self.top_n = top_n
+        self._position = {value: position for position, value in enumerate(self.values)}
+
+        expiry = expiry_index.code_positions[puts_frame['expiration_label'].cat.codes.to_numpy()]
+        names = puts_frame['ticker'].cat.categories
+        ticker_key = (puts_frame['ticker'].cat.codes.to_numpy().astype(np.intp)
+                      + len(names) * puts_frame['is_earnings'].to_numpy())
+        keys, ticker = np.unique(ticker_key, return_inverse=True)
+        self.tickers = [(bool(key // len(names)), names[key % len(names)]) for key in keys]
+
+        premium = puts_frame['premium'].to_numpy()
+        strike = puts_frame['strike'].to_numpy()
+        itm_pct = np.divide(puts_frame['itm_by'].to_numpy() * 100, strike, out=np.zeros(len(strike)),
+                            where=strike > 0)
+        self._itm_pct = itm_pct
+        shape = (len(self.values), len(self.tickers))
+        cell = expiry * len(self.tickers) + ticker
+
+        def partial_sums(weights=None):
+            return np.bincount(cell, weights=weights, minlength=shape[0] * shape[1]).reshape(shape)
+        self._premium = partial_sums(premium)
+        self._weighted_itm = partial_sums(premium * itm_pct)
+        self._puts = partial_sums()
+
+        # Each expiry's top_n puts by premium as frame rows; a selection's top puts are among the union
+        by_expiry = np.lexsort((-premium, expiry))
+        bounds = np.searchsorted(expiry[by_expiry], np.arange(len(self.values) + 1))
+        self._top_rows = [by_expiry[bounds[i]:min(bounds[i + 1], bounds[i] + top_n)] for i in range(len(self.values))]
+
+    def _selection(self, expiry_values):
+        import numpy as np
+
+        selected = np.zeros(len(self.values), dtype=bool)
+        if not expiry_values:
+            selected[:] = True
+        for value in expiry_values or []:
+            if value in self._position:
+                selected[self._position[value]] = True
+        return selected
+
+    def summary(self, expiry_values):
+        """Totals, top tickers, top puts and premium by expiry for an expiry selection (all expiries when empty)"""
+        import numpy as np
+        import pandas as pd
+
+        selected = self._selection(expiry_values)
+        premium, weighted_itm, puts = (sums[selected].sum(axis=0)
+                                       for sums in (self._premium, self._weighted_itm, self._puts))
+
+        present = puts > 0
+        total_premium = float(premium[present].sum())
+        ranked = [i for i in np.argsort(-np.where(present, premium, -1), kind='stable')[:self.top_n] if present[i]]
+        top_tickers = [{
+            'ticker': self.tickers[i][1],
+            'is_earnings': self.tickers[i][0],
+            'premium': float(premium[i]),
+            'share': float(premium[i]) / total_premium if total_premium else 0.0,
+            'num_puts': int(round(puts[i])),
+            'itm_pct': float(weighted_itm[i] / premium[i]) if premium[i] else 0.0,
+        } for i in ranked]
+
+        candidates = np.concatenate([self._top_rows[i] for i in np.flatnonzero(selected)] or [np.array([], np.intp)])
+        candidate_premium = self.puts_frame['premium'].to_numpy()[candidates]
+        top_rows = candidates[np.argsort(-candidate_premium, kind='stable')[:self.top_n]]
+        top = self.puts_frame.iloc[top_rows]
+        top_puts = [{
+            'ticker': ticker, 'is_earnings': bool(is_earnings), 'strike': strike, 'spot': spot,
+            'premium': put_premium, 'itm_pct': float(itm_pct), 'expiration': expiration,
+        } for ticker, is_earnings, strike, spot, put_premium, itm_pct, expiration in zip(
+            top['ticker'].tolist(), top['is_earnings'].tolist(), top['strike'].tolist(), top['spot'].tolist(),
+            top['premium'].tolist(), self._itm_pct[top_rows], top['expiration_label'].tolist())]
+
+        premium_by_expiry = [(self.values[position], float(self._premium[position].sum()))
+                             for position in np.flatnonzero(selected)]
+
+        return {
+            'num_puts': int(round(puts.sum())),
+            'num_tickers': int(present.sum()),
+            'total_premium': total_premium,
+            'itm_pct': float(weighted_itm.sum() / total_premium) if total_premium else 0.0,
+            'top_tickers': top_tickers,
+            'top_share': sum(t['share'] for t in top_tickers),
+            'top_puts': top_puts,
+            'premium_by_expiry': premium_by_expiry,
+            'premium_by_ticker': pd.Series(premium[present], index=[self.tickers[i][1] for i in np.flatnonzero(present)]),
+        }
+
+    def client_payload(self):
+        """The partial sums in the form assets/clientside.js sums them: per expiry, the tickers with puts and
+        their premium, premium-weighted ITM % and put count, plus that expiry's top_n rows"""
+        import numpy as np
+
+        cells = []
+        for position in range(len(self.values)):
+            tickers = np.flatnonzero(self._puts[position])
+            cells.append([tickers.tolist(), self._premium[position, tickers].tolist(),
+                          self._weighted_itm[position, tickers].tolist(),
+                          self._puts[position, tickers].astype(np.int64).tolist()])
+        return {
+            'tickers': [[ticker, int(is_earnings)] for is_earnings, ticker in self.tickers],
+            'cells': cells,
+            'top_rows': [rows.tolist() for rows in self._top_rows],
+            'top_n': self.top_n,
+        }
+
+
+class ParsedReport:
+    """A parsed report as held in REPORT_CACHE: the parse_itm_content dicts plus views built from them once.
+
+    A report read back from a snapshot has only its puts frame; the put dicts are None in parsed
+    and are rebuilt from the frame if anything asks for them.
+    """
+
+    def __init__(self, parsed, generated=None, puts_frame=None, header=None):
+        (self.tickers_data, puts_data, self.calls_data,
+         self.earnings_tickers_data, earnings_puts_data, self.earnings_calls_data) = parsed
+        self.generated = generated
+        self.header = header or {'overview': {}, 'top_puts': []}
+        self.puts_frame = build_puts_frame(puts_data, earnings_puts_data) if puts_frame is None else puts_frame
+        self._puts_data = {False: puts_data, True: earnings_puts_data}
+        self.expiry_index = ExpiryIndex(self.puts_frame)
+        self.expiry_dates = self.expiry_index.values
+        self.call_index = CallIndex(self.calls_data, self.earnings_calls_data)
+        self.aggregates = ReportAggregates(self.puts_frame, self.expiry_index)
+        self._filtered = OrderedDict()
+        self._filtered_lock = threading.Lock()
+
+    def filtered(self, expiry_values):
+        """(puts frame, tickers_data, earnings_tickers_data) restricted to expiry_values, memoized per selection.
+
+        The puts frame is None when no expiry filter applies and the unfiltered dicts should be used.
+        """
+        if not expiry_values:
+            return None, self.tickers_data, self.earnings_tickers_data
+        key = tuple(sorted(expiry_values))
+        with self._filtered_lock:
+            if key in self._filtered:
+                self._filtered.move_to_end(key)
+                METRICS.cache_lookup('filtered_view', hit=True)
+                return self._filtered[key]
+        METRICS.cache_lookup('filtered_view', hit=False)
+        with METRICS.stage('filter'):
+            puts_frame = self.puts_frame.take(self.expiry_index.rows(expiry_values))
+            result = (puts_frame, *summarize_puts_frame(puts_frame, self.tickers_data, self.earnings_tickers_data))
+        with self._filtered_lock:
+            self._filtered[key] = result
+            while len(self._filtered) > FILTERED_VIEWS_PER_REPORT:
+                self._filtered.popitem(last=False)
+        return result
+
+    @property
+    def as_of(self):
+        """The date the report was generated, or today if it has no usable Generated line"""
+        try:
+            return datetime.strptime(self.generated or '', '%Y-%m-%d %H:%M:%S').date()
+        except ValueError:
+            return date.today()
+
+    def expiry_ranges(self):
+        return self.expiry_index.ranges(self.as_of)
+
+    def put_tickers(self, is_earnings):
+        """Tickers with puts in the normal or earnings section, in report order"""
+        puts_data = self._puts_data[is_earnings]
+        if puts_data is not None:
+            return list(puts_data)
+        tickers = self.puts_frame['ticker'][self.puts_frame['is_earnings'] == is_earnings]
+        return list(dict.fromkeys(tickers.tolist()))
+
+    def _all_puts(self, is_earnings):
+        if self._puts_data[is_earnings] is None:
+            self._puts_data[is_earnings] = puts_frame_by_ticker(
+                self.puts_frame, is_earnings, self.put_tickers(is_earnings))
+        return self._puts_data[is_earnings]
+
+    @property
+    def puts_data(self):
+        return self._all_puts(False)
+
+    @property
+    def earnings_puts_data(self):
+        return self._all_puts(True)
+
+    def ticker_puts(self, expiry_values, is_earnings, tickers):
+        """Put lists for the given tickers under an expiry selection"""
+        puts_frame, _, _ = self.filtered(expiry_values)
+        if puts_frame is None:
+            puts_data = self._puts_data[is_earnings]
+            if puts_data is None:
+                return puts_frame_by_ticker(self.puts_frame, is_earnings, tickers)
+            return {tk: puts_data[tk] for tk in tickers if tk in puts_data}
+        return puts_frame_by_ticker(puts_frame, is_earnings, tickers)
+
+
+def parse_report(content):
+    """Parse a report (string or iterable of lines) into a ParsedReport"""
+    return report_from_parser(_feed_report_lines(content))
+
+
+def report_from_parser(parser):
+    """ParsedReport for an ITMReportParser that has been fed a whole report"""
+    with METRICS.stage('index'):
+        report = ParsedReport(parser.result(), parser.generated, header=parser.header)
+    METRICS.observe(METRICS.report_puts, len(report.puts_frame))
+    METRICS.observe(METRICS.report_tickers, len(report.tickers_data) + len(report.earnings_tickers_data))
+    return report
+
+
+class ParsedReportCache:
+    """Bounded LRU of parse_itm_content results keyed by report content hash.
+
+    Also holds anything else built from reports, such as diffs keyed by a pair of hashes, under its own METRICS name.
+    """
+
+    def __init__(self, max_entries, name='report'):
+        self.max_entries = max(1, max_entries)
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, loader):
+        """Return the parsed report for key, calling loader() to produce it on a miss"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                METRICS.cache_lookup(self.name, hit=True)
+                return self._entries[key]
+            self.misses += 1
+        METRICS.cache_lookup(self.name, hit=False)
+        parsed = loader()
+        if parsed is not None:
+            with self._lock:
+                self._entries[key] = parsed
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return parsed
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'max_entries': self.max_entries,
+                    'hits': self.hits, 'misses': self.misses}
+
+
+REPORT_CACHE = ParsedReportCache(REPORT_CACHE_SIZE)
+# Rendered diff panels keyed by (baseline key, report key), so flipping between comparisons doesn't redo the join
+DIFF_CACHE = ParsedReportCache(REPORT_CACHE_SIZE, name='diff')
+
+
+def estimate_fragment_bytes(component):
+    """Rough serialized size of a component tree: its strings plus a fixed allowance per component"""
+    size = 0
+    stack = [component]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            size += len(node)
+        elif isinstance(node, (list, tuple)):
+            stack.extend(node)
+        elif isinstance(node, Component):
+            size += 100
+            children = getattr(node, 'children', None)
+            if children is not None:
+                stack.append(children)
+    return size
+
+
+class FragmentCache:
+    """LRU of rendered ticker blocks, evicted by estimated size rather than entry count"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        METRICS.cache_lookup('fragment', hit=entry is not None)
+        return None if entry is None else entry[0]
+
+    def put(self, key, value, size):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                self.bytes -= self._entries.popitem(last=False)[1][1]
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self.bytes, 'max_bytes': self.max_bytes,
+                    'hits': self.hits, 'misses': self.misses}
+
+
+FRAGMENT_CACHE = FragmentCache(int(FRAGMENT_CACHE_MB * 2 ** 20))
+
+HISTORY = ReportHistory(HISTORY_DB) if HISTORY_DB else None
+
+# ((mtime_ns, size), key, ParsedReport) of the default report; always replaced as a whole so
+# callbacks running during a reload see either the old report or the new one
+_default_report_state = (None, None, None)
+_default_report_lock = threading.Lock()
+
+
+REPORT_KEY_RE = re.compile(r'[0-9a-f]{64}')
+
+
+def report_key(data):
+    """Content hash used as the cache key for a report"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def record_report(report, key, source):
+    """Append a freshly parsed report to the history store, if one is configured"""
+    if HISTORY is not None and report is not None:
+        try:
+            if HISTORY.ingest(report, content_hash=key, source=source):
+                print(f"✓ Added report generated {report.generated} to history")
+        except Exception as e:
+            print(f"⚠️ Error adding report to history: {str(e)}")
+    return report
+
+
+def reload_default_report():
+    """Re-read and re-parse the default report if its mtime or size changed; returns (key, ParsedReport)"""
+    global _default_report_state
+    with _default_report_lock:
+        stamp = _file_stamp(DEFAULT_REPORT_PATH)
+        state = _default_report_state
+        if stamp is None:
+            _default_report_state = (None, None, None)
+            return None, None
+        if stamp == state[0]:
+            return state[1], state[2]
+        with open(DEFAULT_REPORT_PATH, 'rb') as f:
+            raw = f.read()
+        key = report_key(raw)
+        source = os.path.basename(DEFAULT_REPORT_PATH)
+        # Spooled like an upload, so the report can still be loaded by key as a comparison baseline after the
+        # file is replaced or its parse is evicted
+        try:
+            spool_report(key, raw)
+        except OSError as e:
+            print(f"⚠️ Error spooling {source}: {str(e)}")
+        report = REPORT_CACHE.get(key, lambda: load_report(key, lambda: parse_report(raw.decode('utf-8')), source))
+        _default_report_state = (stamp, key, report)
+        return key, report
+
+
+def read_report_snapshot(key):
+    """The ParsedReport published under key by any worker, backed by memory maps, or None"""
+    if not REPORT_KEY_RE.fullmatch(key):
+        return None
+    with METRICS.stage('snapshot_read'):
+        snapshot = read_snapshot(os.path.join(SNAPSHOT_DIR, key))
+    if snapshot is None:
+        return None
+    meta, puts_frame = snapshot
+    parsed = (meta['tickers_data'], None, meta['calls_data'],
+              meta['earnings_tickers_data'], None, meta['earnings_calls_data'])
+    return ParsedReport(parsed, meta['generated'], puts_frame=puts_frame, header=meta.get('header'))
+
+
+def publish_report_snapshot(key, report):
+    """Write the snapshot of a parsed report under SNAPSHOT_DIR; returns False if it couldn't be written"""
+    meta = {'generated': report.generated, 'header': report.header,
+            'tickers_data': report.tickers_data, 'calls_data': report.calls_data,
+            'earnings_tickers_data': report.earnings_tickers_data, 'earnings_calls_data': report.earnings_calls_data}
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        with METRICS.stage('snapshot_write'):
+            write_snapshot(os.path.join(SNAPSHOT_DIR, key), report.puts_frame, meta)
+    except OSError as e:
+        print(f"⚠️ Error writing report snapshot: {str(e)}")
+        return False
+    return True
+
+
+def load_report(key, parse, source):
+    """REPORT_CACHE loader: map the snapshot of key if a worker already published one, otherwise parse and publish it.
+
+    Snapshots can also be published ahead of time with report_batch.py.
+    """
+    if not SNAPSHOT_DIR:
+        return record_report(parse(), key, source)
+    report = read_report_snapshot(key)
+    if report is not None:
+        return report
+    report = record_report(parse(), key, source)
+    if report is None or not publish_report_snapshot(key, report):
+        return report
+    # Serve the shared mapping rather than this worker's private copy of the parse
+    return read_report_snapshot(key) or report
+
+
+def load_default_report():
+    """Return (key, ParsedReport) for the default report; once the reload watcher is running this never touches disk"""
+    RELOAD_WATCHER.ensure_running()
+    state = _default_report_state
+    if RELOAD_WATCHER.running and state[0] is not None:
+        return state[1], state[2]
+    return reload_default_report()
+
+
+def reload_short_interest():
+    """Swap in a freshly loaded short interest table; the old one stays intact for callbacks already using it"""
+    global _short_interest_table
+    with _short_interest_lock:
+        previous = _short_interest_table
+        _short_interest_table = table = load_short_interest_table(previous)
+    if table is previous:
+        return "unchanged"
+    return f"{len(table)} tickers"
+
+
+class ReloadWatcher:
+    """Polls the mtime and size of a few files from a daemon thread and reloads them when they change.
+
+    A change is only acted on once the file has looked the same for two polls in a row, so a file
+    that is still being written isn't loaded half-way through.
+    """
+
+    def __init__(self, interval, max_events=50):
+        self.interval = interval
+        self._files = {}
+        self._lock = threading.Lock()
+        self._pid = None
+        self.events = deque(maxlen=max_events)
+        self.reloads = 0
+        self.errors = 0
+
+    def watch(self, name, path, reload, stamp=None):
+        """Call reload() when path changes; stamp is the state of the file that is already loaded"""
+        self._files[name] = {'path': path, 'reload': reload, 'loaded': stamp, 'pending': None}
+
+    @property
+    def running(self):
+        # Threads don't survive a fork, so a watcher started before gunicorn forked isn't running here
+        return self._pid == os.getpid()
+
+    def ensure_running(self):
+        if self.interval <= 0 or self.running:
+            return
+        with self._lock:
+            if self.running:
+                return
+            self._pid = os.getpid()
+            threading.Thread(target=self._run, name='itm-reload-watcher', daemon=True).start()
+
+    def _run(self):
+        while True:
+            self.check()
+            time.sleep(self.interval)
+
+    def check(self):
+        for name, entry in self._files.items():
+            stamp = _file_stamp(entry['path'])
+            if stamp == entry['loaded']:
+                entry['pending'] = None
+                continue
+            if stamp != entry['pending'] and entry['loaded'] is not None:
+                entry['pending'] = stamp
+                continue
+            started = time.perf_counter()
+            event = {'file': name, 'time': datetime.now().isoformat(timespec='seconds')}
+            try:
+                detail = entry['reload']()
+                self.reloads += 1
+                event.update(status='ok', detail=detail)
+                print(f"✓ {'Reloaded' if entry['loaded'] is not None else 'Loaded'} {name}: {detail}")
+            except Exception as e:
+                self.errors += 1
+                event.update(status='error', detail=str(e))
+                print(f"⚠️ Error reloading {name}: {str(e)}")
+            entry['loaded'], entry['pending'] = stamp, None
+            event['seconds'] = round(time.perf_counter() - started, 4)
+            self.events.append(event)
+
+    def status(self):
+        return {
+            'running': self.running,
+            'interval': self.interval,
+            'reloads': self.reloads,
+            'errors': self.errors,
+            'files': {name: {'path': entry['path'], 'loaded_stamp': entry['loaded']}
+                      for name, entry in self._files.items()},
+            'events': list(self.events),
+        }
+
+
+def _reload_default_report_event():
+    key, report = reload_default_report()
+    if report is None:
+        return "no default report"
+    return f"generated {report.generated} ({key[:12]})"
+
+
+RELOAD_WATCHER = ReloadWatcher(RELOAD_INTERVAL)
+RELOAD_WATCHER.watch('default_report', DEFAULT_REPORT_PATH, _reload_default_report_event)
+RELOAD_WATCHER.watch('short_interest', SHORT_INTEREST_PATH, reload_short_interest,
+                     stamp=_SHORT_INTEREST_STAMP)
+
+
+def _warm_up():
+    """Load the default report (and with it numpy and pandas) and the short interest table off the request path"""
+    try:
+        load_default_report()
+        short_interest()
+    except Exception as e:
+        print(f"⚠️ Error warming up: {str(e)}")
+
+
+if PRELOAD:
+    reload_default_report()
+    short_interest()
+elif WARM_UP:
+    threading.Thread(target=_warm_up, name='itm-warm-up', daemon=True).start()
+
+
+def _upload_path(key):
+    return os.path.join(UPLOAD_DIR, f"{key}.txt")
+
+
+def _parse_report_file(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return parse_report(f)
+    except FileNotFoundError:
+        return None
+
+
+def spool_upload(file_contents):
+    """Decode a dcc.Upload data URL and spool it to UPLOAD_DIR under its key; returns (key, decoded bytes)"""
+    with METRICS.stage('decode'):
+        content_type, content_string = file_contents.split(',')
+        decoded = base64.b64decode(content_string)
+    METRICS.observe(METRICS.upload_bytes, len(decoded))
+    key = report_key(decoded)
+    spool_report(key, decoded)
+    return key, decoded
+
+
+def spool_report(key, data):
+    """Write report bytes to UPLOAD_DIR under their key, unless a worker already has"""
+    path = _upload_path(key)
+    if not os.path.exists(path):
+        os.makedirs(UPLOAD_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+def store_upload(file_contents, filename=None):
+    """Decode a dcc.Upload data URL once, spool it to UPLOAD_DIR and cache its parse; returns the report key"""
+    key, decoded = spool_upload(file_contents)
+    REPORT_CACHE.get(key, lambda: load_report(key, lambda: parse_report(decoded.decode('utf-8')), filename))
+    return key
+
+
+def _lines_with_progress(text, report_progress, steps=20):
+    """Lines of text, calling report_progress(fraction read) about `steps` times along the way"""
+    total = max(len(text), 1)
+    next_report = step = total / steps
+    done = 0
+    for line in io.StringIO(text):
+        done += len(line)
+        if done >= next_report:
+            report_progress(done / total)
+            next_report += step
+        yield line
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+def _stream_lines(stream, spool, digest, max_bytes):
+    """Yield the text lines of a binary stream read in UPLOAD_CHUNK_SIZE chunks, copying the raw bytes to spool"""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    pending = ''
+    size = 0
+    while True:
+        chunk = stream.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_bytes:
+            raise UploadTooLarge()
+        digest.update(chunk)
+        spool.write(chunk)
+        lines = (pending + decoder.decode(chunk)).split('\n')
+        pending = lines.pop()
+        yield from lines
+    pending += decoder.decode(b'', final=True)
+    if pending:
+        yield pending
+
+
+def store_upload_stream(stream, filename=None):
+    """Parse a report while spooling it to UPLOAD_DIR, so it is never held in memory whole; returns (key, report)"""
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    tmp_path = os.path.join(UPLOAD_DIR, f"stream.{os.getpid()}.{threading.get_ident()}.tmp")
+    digest = hashlib.sha256()
+    try:
+        with open(tmp_path, 'wb') as spool:
+            parser = _feed_report_lines(_stream_lines(stream, spool, digest, MAX_UPLOAD_BYTES))
+            size = spool.tell()
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    METRICS.observe(METRICS.upload_bytes, size)
+    key = digest.hexdigest()
+    os.replace(tmp_path, _upload_path(key))
+    return key, REPORT_CACHE.get(key, lambda: load_report(key, lambda: report_from_parser(parser), filename))
+
+
+def load_uploaded_report(key):
+    """Return the ParsedReport for the upload stored under key, or None if it is no longer on disk"""
+    if not isinstance(key, str) or not REPORT_KEY_RE.fullmatch(key):
+        return None
+    return REPORT_CACHE.get(key, lambda: load_report(key, lambda: _parse_report_file(_upload_path(key)), None))
+
+
+def report_diff_panel(baseline_key, baseline, key, report):
+    """The rendered diff of report against baseline, joined and rendered once per pair of report keys"""
+    def build():
+        with METRICS.stage('diff'):
+            diff = ReportDiff(baseline.puts_frame, report.puts_frame, top_n=DIFF_TOP_N)
+        with METRICS.stage('render'):
+            return render_report_diff(diff)
+    return DIFF_CACHE.get((baseline_key, key), build)
+
+
+def format_change(value):
+    """Signed format_currency for premium deltas"""
+    return f"{'-' if value < 0 else '+'}{format_currency(abs(value))}"
 
 
 def format_currency(value):
@@ -234,6 +1245,8 @@ app.layout = dbc.Container([
                 dbc.Button("All Dates", id="select-all-expiry", color="info", size="sm"),
                 dbc.Button("Clear Dates", id="clear-all-expiry", color="secondary", size="sm")
             ], style={'margin-bottom': '5px'}),
+            dcc.Dropdown(id='expiry-range', options=[], placeholder="Select a date range or month",
+                         clearable=True, searchable=False, style={'fontSize': '13px', 'marginBottom': '5px'}),
             html.Div(
                 dcc.Checklist(
                     id='expiry-dates',
@@ -264,6 +1277,8 @@ app.layout = dbc.Container([
                 dbc.Button("Earnings", id="select-earnings", color="success", size="sm"),
                 dbc.Button("Clear", id="clear-all", color="secondary", size="sm")
             ], style={'margin-bottom': '5px'}),
+            dcc.Dropdown(id='ticker-group', options=[], multi=True, placeholder="Filter by sector or market cap",
+                         style={'fontSize': '13px', 'marginBottom': '5px'}),
             html.Div(
                 dcc.Checklist(
                     id='tickers',
@@ -301,11 +1316,35 @@ app.layout = dbc.Container([
                 multiple=False,
                 accept=".txt"
             ),
+            # Large reports: assets/upload.js streams the file to /upload-report and points the URL at the result
+            html.Div([
+                dbc.Button("Stream a large report", id='stream-report', color="link", size="sm",
+                           style={'padding': '0'}),
+                html.Small(id='stream-report-status', style={'color': '#888'}),
+            ], style={'marginBottom': '10px'}),
+            *([html.Div([
+                dbc.Progress(id='upload-progress', value=0, striped=True, animated=True,
+                             style={'flexGrow': '1', 'height': '18px'}),
+                dbc.Button("Cancel", id='cancel-upload', color="link", size="sm"),
+            ], id='upload-progress-row', style={'display': 'none'})] if BACKGROUND_MANAGER is not None else []),
+            dcc.Location(id='url', refresh=False),
             html.Div(id='upload-status'),
+            dcc.Store(id='report-key'),
+            dcc.Store(id='detail-panes-state'),
+            dcc.Store(id='report-data'),
 
         ], width=3, style={"paddingRight": "10px"}),
         dbc.Col([
             html.H4("📉 Detailed Put Breakdown"),
+            dcc.RadioItems(
+                id='put-sort',
+                options=PUT_SORT_OPTIONS,
+                value='report',
+                inline=True,
+                inputStyle={"margin-right": "4px"},
+                labelStyle={"margin-right": "12px"},
+                style={'fontSize': '13px', 'marginBottom': '5px'}
+            ),
             html.Div(id='put-breakdown-div', style={
                 'height': '600px',
                 'overflowY': 'auto',
@@ -314,6 +1353,7 @@ app.layout = dbc.Container([
                 'borderRadius': '5px',
                 'backgroundColor': '#fff5f5'
             }),
+            dbc.Button(id='load-more-tickers', color="link", size="sm", style={'display': 'none'}),
         ], width=4),
         dbc.Col([
             html.H4("📞 Call Activity Analysis"),
@@ -326,201 +1366,1012 @@ app.layout = dbc.Container([
                 'backgroundColor': '#f0fff4'
             }),
         ], width=5)
-    ])
+    ]),
+    dbc.Row([
+        dbc.Col([
+            html.H4("📊 Summary"),
+            html.Div(id='summary-panel', style={
+                'border': '1px solid #ddd',
+                'padding': '10px',
+                'borderRadius': '5px',
+                'backgroundColor': '#fffdf5'
+            }),
+        ], width=12)
+    ], style={'marginTop': '15px'}),
+    dbc.Row([
+        dbc.Col([
+            html.H4("🔀 Compare Reports"),
+            dcc.Dropdown(id='compare-report', options=[], placeholder="Compare with a report viewed earlier",
+                         style={'fontSize': '13px', 'marginBottom': '5px'}),
+            dcc.Store(id='recent-reports', storage_type='local'),
+            html.Div(id='diff-panel', style={
+                'border': '1px solid #ddd',
+                'padding': '10px',
+                'borderRadius': '5px',
+                'backgroundColor': '#f5fbff'
+            }),
+        ], width=12)
+    ], style={'marginTop': '15px'}),
+    *([dbc.Row([
+        dbc.Col([
+            html.H4("📈 Report History"),
+            dcc.Dropdown(id='history-ticker', options=[], placeholder="Select a ticker",
+                         style={'marginBottom': '5px'}),
+            dcc.Graph(id='history-trend', style={'height': '300px'}),
+        ], width=8),
+        dbc.Col([
+            html.H5("🔁 Tickers in consecutive reports"),
+            html.Div([
+                html.Small("Reports in a row: "),
+                dcc.Input(id='history-streak', type='number', min=1, step=1, value=3,
+                          style={'width': '70px'}),
+            ], style={'marginBottom': '5px'}),
+            html.Div(id='history-streak-tickers', style={
+                'height': '300px',
+                'overflowY': 'auto',
+                'border': '1px solid #ddd',
+                'padding': '10px',
+                'borderRadius': '5px',
+                'backgroundColor': '#f5f5ff'
+            }),
+        ], width=4)
+    ], style={'marginTop': '15px'})] if HISTORY is not None else [])
 ], fluid=True)
 
 
-@app.callback(
+def resolve_report(uploaded_report):
+    """Return (report key, ParsedReport, status message) for the report-key store; the report is None on failure"""
+    if uploaded_report:
+        report = load_uploaded_report(uploaded_report['key'])
+        if report is None:
+            return None, None, "Uploaded file is no longer available. Please upload it again."
+        return uploaded_report['key'], report, f"File '{uploaded_report['filename']}' uploaded successfully."
+    key, report = load_default_report()
+    if report is None:
+        return None, None, "No file uploaded and no default file found."
+    return key, report, "Using default ITM_Analysis_Summary.txt file."
+
+
+def ticker_group_options(report):
+    """Sector and market-cap band choices for the report's tickers that are in the short interest screener"""
+    screener = short_interest().join(sorted(set(report.tickers_data) | set(report.earnings_tickers_data)))
+    bands = set(screener['Cap Band'].dropna())
+    return ([{'label': f"Sector: {sector}", 'value': f"sector:{sector}"}
+             for sector in sorted(screener['Sector'].dropna().unique())]
+            + [{'label': f"{band} cap", 'value': f"cap:{band}"} for band in CAP_BANDS if band in bands])
+
+
+def tickers_in_groups(tickers, group_values):
+    """The tickers in any selected sector and any selected market-cap band, with one join against the screener"""
+    import numpy as np
+
+    screener = short_interest().join(tickers)
+    keep = np.ones(len(screener), dtype=bool)
+    sectors = [value[len('sector:'):] for value in group_values if value.startswith('sector:')]
+    bands = [value[len('cap:'):] for value in group_values if value.startswith('cap:')]
+    if sectors:
+        keep &= screener['Sector'].isin(sectors).to_numpy()
+    if bands:
+        keep &= screener['Cap Band'].isin(bands).to_numpy()
+    return set(screener.index[keep])
+
+
+def build_ticker_options(filtered_tickers_data, filtered_earnings_tickers_data):
+    """Checklist options for the normal and earnings tickers, with the short interest indicator"""
+    short_interest_table = short_interest()
+    normal_ticker_options = []
+    for tk in sorted(filtered_tickers_data.keys()):
+        # Add ⚠️ symbol if ticker is in short interest list
+        short_indicator = "⚠️ " if tk in short_interest_table else ""
+        label_text = f"{short_indicator}🔹 {tk} ({filtered_tickers_data[tk]['num_puts']} | {format_currency(filtered_tickers_data[tk]['total_premium'])})"
+        normal_ticker_options.append({'label': label_text, 'value': tk})
+
+    earnings_ticker_options = []
+    for tk in sorted(filtered_earnings_tickers_data.keys()):
+        # Add ⚠️ symbol if ticker is in short interest list
+        short_indicator = "⚠️ " if tk in short_interest_table else ""
+        label_text = f"{short_indicator}🏢 {tk} ({filtered_earnings_tickers_data[tk]['num_puts']} | {format_currency(filtered_earnings_tickers_data[tk]['total_premium'])})"
+        earnings_ticker_options.append({'label': label_text, 'value': f"earnings_{tk}"})
+
+    return normal_ticker_options, earnings_ticker_options
+
+
+def short_interest_badge(ticker):
+    if ticker not in short_interest():
+        return ""
+    return html.Span(" ⚠️ HIGH SHORT", style={'color': '#ff6b6b', 'fontSize': '12px', 'fontWeight': 'bold'})
+
+
+def render_put_rows(ticker_puts, is_earnings):
+    row_style = ({'backgroundColor': '#f1f8e9', 'padding': '8px', 'marginBottom': '6px'} if is_earnings
+                 else {'backgroundColor': '#ffebee', 'padding': '8px', 'marginBottom': '6px'})
+    return [
+        html.Div([
+            html.Strong(f"Put #{put['put_number']} | "),
+            f"Strike: ${put['strike']:,.2f} | ",
+            f"ITM by: ${put['itm_by']:,.2f} | ",
+            f"Premium: {format_currency(put['premium'])} | ",
+            f"Expires: {put['expiration']}"
+        ], style=row_style)
+        for put in ticker_puts
+    ]
+
+
+def load_more_label(remaining):
+    return f"Load {min(remaining, PUT_PAGE_SIZE)} more puts ({remaining} not shown)"
+
+
+def render_put_block(ticker_value, ticker, ticker_summary, ticker_puts, is_earnings, sort_by):
+    """One ticker's put breakdown: the summary header, the first page of puts and a "Load more" button"""
+    current_price = ticker_summary['current_price']
+    if is_earnings:
+        title = f"🏢 {ticker} - Put Options Breakdown (Earnings)"
+        header_style = {'backgroundColor': '#e8f5e9', 'padding': '10px', 'marginBottom': '10px',
+                        'border': '2px solid #4caf50'}
+    else:
+        title = f"🔹 {ticker} - Put Options Breakdown"
+        header_style = {'backgroundColor': '#e3f2fd', 'padding': '10px', 'marginBottom': '10px'}
+
+    put_header = html.Div([
+        html.H5([title, short_interest_badge(ticker)]),
+        html.P([
+            html.Strong("Current Price: "),
+            f"${current_price:,.2f} | ",
+            html.Strong("Total Puts: "),
+            f"{len(ticker_puts)} | ",
+            html.Strong("Total Premium: "),
+            format_currency(ticker_summary['total_premium'])
+        ])
+    ], style=header_style)
+
+    first_page = sort_puts(ticker_puts, sort_by)[:PUT_PAGE_SIZE]
+    children = [put_header,
+                html.Div(render_put_rows(first_page, is_earnings), id={'type': 'put-rows', 'index': ticker_value})]
+    remaining = len(ticker_puts) - len(first_page)
+    if remaining > 0:
+        children.append(dbc.Button(load_more_label(remaining), id={'type': 'load-more-puts', 'index': ticker_value},
+                                   color="link", size="sm", style={'marginBottom': '10px'}))
+    return html.Div(children)
+
+
+def render_call_block(ticker, ticker_summary, call_text, is_earnings, call_index, ticker_puts):
+    """One ticker's call activity: the calls bought for the shown puts' expiries, then the full text"""
+    if is_earnings:
+        title = f"🏢 {ticker} - Call Activity Analysis (Earnings)"
+        style = {'backgroundColor': '#e8f5e9', 'padding': '10px', 'marginBottom': '10px',
+                 'border': '2px solid #4caf50'}
+    else:
+        title = f"🔹 {ticker} - Call Activity Analysis"
+        style = {'backgroundColor': '#e8f5e9', 'padding': '10px', 'marginBottom': '10px'}
+    children = [
+        html.H5([title, short_interest_badge(ticker)]),
+        html.P([
+            html.Strong("Current Price: "),
+            f"${ticker_summary['current_price']:,.2f}"
+        ])
+    ]
+
+    put_expiries = {parse_expiry_date(put['expiration']) for put in ticker_puts}
+    same_expiry = call_index.calls_on(ticker, put_expiries, is_earnings)
+    if same_expiry:
+        children.append(html.P([
+            html.Strong("Calls on put expiries: "),
+            "; ".join(f"{expiry:%m/%d/%Y}: {', '.join(format_strike(strike) for strike in strikes)}"
+                      for expiry, strikes in same_expiry.items())
+        ]))
+    overlap = call_index.strike_overlap(ticker, ticker_puts, is_earnings)
+    if overlap:
+        children.append(html.P([
+            html.Strong("Call strikes matching a put: "),
+            ", ".join(f"${format_strike(strike)} {expiry:%m/%d/%Y}" for expiry, strike in overlap)
+        ]))
+    children.append(html.P(call_text))
+    return html.Div(children, style=style)
+
+
+def summary_table(columns, rows):
+    return html.Table([
+        html.Thead(html.Tr([html.Th(column, style={'paddingRight': '12px'}) for column in columns])),
+        html.Tbody([html.Tr([html.Td(cell, style={'paddingRight': '12px'}) for cell in row]) for row in rows]),
+    ], style={'fontSize': '13px', 'width': '100%'})
+
+
+def render_summary(report, expiry_values):
+    """Summary panel for the expiry selection: key figures, premium by expiry, top tickers and top puts, premium by
+    group and the calls bought for the selected expiries"""
+    with METRICS.stage('summary'):
+        summary = report.aggregates.summary(expiry_values)
+    if not summary['num_puts']:
+        return html.P("No puts for the selected expiry dates.", style={'color': 'gray'})
+
+    figures = html.P([
+        html.Strong("Puts: "), f"{summary['num_puts']:,} | ",
+        html.Strong("Tickers: "), f"{summary['num_tickers']:,} | ",
+        html.Strong("Total Premium: "), f"{format_currency(summary['total_premium'])} | ",
+        html.Strong("Premium-weighted ITM: "), f"{summary['itm_pct']:.1f}% of strike | ",
+        html.Strong(f"Top {len(summary['top_tickers'])} tickers' share: "), f"{summary['top_share']:.1%}",
+    ])
+    by_expiry = dcc.Graph(figure={
+        'data': [{'x': [expiry for expiry, _ in summary['premium_by_expiry']],
+                  'y': [premium for _, premium in summary['premium_by_expiry']],
+                  'type': 'bar', 'name': 'Premium'}],
+        'layout': {'title': 'Put premium by expiry', 'yaxis': {'tickprefix': '$'},
+                   'margin': {'l': 60, 'r': 20, 't': 40, 'b': 60}},
+    }, style={'height': '300px'})
+    top_tickers = summary_table(['Ticker', 'Puts', 'Premium', 'Share', 'ITM %'], [
+        [f"{t['ticker']} (E)" if t['is_earnings'] else t['ticker'], t['num_puts'], format_currency(t['premium']),
+         f"{t['share']:.1%}", f"{t['itm_pct']:.1f}%"]
+        for t in summary['top_tickers']])
+    top_puts = summary_table(['Ticker', 'Strike', 'Premium', 'ITM %', 'Expires'], [
+        [f"{put['ticker']} (E)" if put['is_earnings'] else put['ticker'], f"${put['strike']:,.2f}",
+         format_currency(put['premium']), f"{put['itm_pct']:.1f}%", put['expiration']]
+        for put in summary['top_puts']])
+
+    premium_by_ticker = summary['premium_by_ticker']
+    by_group = [
+        dbc.Col([html.H6(f"Premium by {title}"), summary_table([title.capitalize(), 'Premium', 'Share'], [
+            [group, format_currency(premium), f"{premium / summary['total_premium']:.1%}"]
+            for group, premium in short_interest().group_totals(premium_by_ticker, column).items()])], width=4)
+        for title, column in (('sector', 'Sector'), ('market cap', 'Cap Band'))
+    ]
+    call_counts = {expiry.isoformat(): counts for expiry, counts in report.call_index.counts_by_expiry().items()}
+    calls_by_expiry = summary_table(['Expires', 'Tickers', 'Call strikes'], [
+        [expiry, *call_counts[expiry]] for expiry, _ in summary['premium_by_expiry'] if expiry in call_counts])
+
+    return [
+        figures,
+        dbc.Row([
+            dbc.Col(by_expiry, width=6),
+            dbc.Col([html.H6("Top tickers by premium"), top_tickers], width=3),
+            dbc.Col([html.H6("Top puts by premium"), top_puts], width=3),
+        ]),
+        dbc.Row([*by_group, dbc.Col([html.H6("Calls by expiry"), calls_by_expiry], width=4)],
+                style={'marginTop': '10px'}),
+        *render_report_header(report.header),
+    ]
+
+
+def render_report_header(header):
+    """The report's own overview and top puts, collapsed under the summary; empty if the report has neither"""
+    if not (header['overview'] or header['top_puts']):
+        return []
+    return [html.Details([
+        html.Summary("Report header"),
+        html.Ul([html.Li([html.Strong(f"{name}: "), value]) for name, value in header['overview'].items()]),
+        summary_table(['Ticker', 'Strike', 'Spot', 'Premium', 'Expires', 'Created'], [
+            [put['ticker'], f"${put['strike']:,.2f}", f"${put['spot']:,.2f}", format_currency(put['premium']),
+             put['expiration'], put['created']]
+            for put in header['top_puts']]),
+    ], style={'marginTop': '10px'})]
+
+
+def ticker_list(tickers, limit=100):
+    """Comma-separated tickers, cut off after limit of them"""
+    if not tickers:
+        return "none"
+    more = f" and {len(tickers) - limit:,} more" if len(tickers) > limit else ""
+    return ", ".join(tickers[:limit]) + more
+
+
+def render_report_diff(diff):
+    """Diff panel: puts added, removed and repriced since the baseline report, and the tickers behind them"""
+    import pandas as pd
+
+    counts, changes = diff.counts, diff.premium_changes
+    old_total, new_total = diff.total_premium
+    figures = html.P([
+        html.Strong("Added: "), f"{counts['added']:,} puts ({format_change(changes['added'])}) | ",
+        html.Strong("Removed: "), f"{counts['removed']:,} puts ({format_change(changes['removed'])}) | ",
+        html.Strong("Changed: "), f"{counts['changed']:,} puts ({format_change(changes['changed'])}) | ",
+        html.Strong("Unchanged: "), f"{counts['unchanged']:,} | ",
+        html.Strong("Total Premium: "),
+        f"{format_currency(old_total)} → {format_currency(new_total)} ({format_change(new_total - old_total)})",
+    ])
+    tickers = html.P([
+        html.Strong("New tickers: "), ticker_list(diff.added_tickers), html.Br(),
+        html.Strong("Dropped tickers: "), ticker_list(diff.removed_tickers),
+    ])
+
+    def label(row):
+        return f"{row['ticker']} (E)" if row['is_earnings'] else row['ticker']
+
+    def expires(row):
+        # Unparseable expiries (TBD) have no date; show them as the report listed them
+        return row['expiration_label'] if pd.isna(row['expiration']) else f"{row['expiration']:%Y-%m-%d}"
+
+    by_ticker = summary_table(['Ticker', 'Before', 'After', 'Change'], [
+        [row['ticker'], format_currency(row['premium_old']), format_currency(row['premium_new']),
+         format_change(row['premium_delta'])]
+        for row in diff.ticker_changes])
+    added = summary_table(['Ticker', 'Strike', 'Expires', 'Premium', 'ITM by'], [
+        [label(row), f"${row['strike']:,.2f}", expires(row), format_currency(row['premium_new']),
+         f"${row['itm_by_new']:,.2f}"]
+        for row in diff.top_rows['added']])
+    removed = summary_table(['Ticker', 'Strike', 'Expires', 'Premium', 'ITM by'], [
+        [label(row), f"${row['strike']:,.2f}", expires(row), format_currency(row['premium_old']),
+         f"${row['itm_by_old']:,.2f}"]
+        for row in diff.top_rows['removed']])
+    changed = summary_table(['Ticker', 'Strike', 'Expires', 'Before', 'After', 'Change'], [
+        [label(row), f"${row['strike']:,.2f}", expires(row), format_currency(row['premium_old']),
+         format_currency(row['premium_new']), format_change(row['premium_delta'])]
+        for row in diff.top_rows['changed']])
+
+    return [
+        figures,
+        tickers,
+        dbc.Row([
+            dbc.Col([html.H6("Premium change by ticker"), by_ticker], width=3),
+            dbc.Col([html.H6("Changed puts"), changed], width=3),
+            dbc.Col([html.H6("Added puts"), added], width=3),
+            dbc.Col([html.H6("Removed puts"), removed], width=3),
+        ]),
+    ]
+
+
+def render_detail_blocks(report, expiry_values, ticker_values, sort_by, report_key=None):
+    """Render the put and call blocks for ticker_values, each returned as a list of (ticker value, block).
+
+    With a report_key, each ticker's (put block, call block) pair is kept in FRAGMENT_CACHE per expiry
+    selection and sort, so only tickers not rendered before under the same filter are built.
+    """
+    cache_key = None
+    fragments = {}
+    if report_key is not None:
+        expiry_hash = hashlib.sha1("\n".join(sorted(expiry_values or [])).encode('utf-8')).hexdigest()
+        # The short interest digest invalidates blocks carrying a stale ⚠️ badge after a CSV reload
+        cache_key = (report_key, expiry_hash, sort_by, short_interest().digest)
+        for ticker_value in ticker_values:
+            cached = FRAGMENT_CACHE.get((*cache_key, ticker_value))
+            if cached is not None:
+                fragments[ticker_value] = cached
+    missing = [tk for tk in ticker_values if tk not in fragments]
+
+    if missing:
+        _, filtered_tickers_data, filtered_earnings_tickers_data = report.filtered(expiry_values)
+        normal = [tk for tk in missing if not tk.startswith('earnings_')]
+        earnings = [tk.replace('earnings_', '') for tk in missing if tk.startswith('earnings_')]
+        puts_by_ticker = {
+            False: report.ticker_puts(expiry_values, False, normal),
+            True: report.ticker_puts(expiry_values, True, earnings),
+        }
+
+    rendered = rendered_calls = put_rows = 0
+    with METRICS.stage('render'):
+        for ticker_value in missing:
+            is_earnings = ticker_value.startswith('earnings_')
+            ticker = ticker_value.replace('earnings_', '') if is_earnings else ticker_value
+            ticker_puts = puts_by_ticker[is_earnings]
+            if ticker not in ticker_puts:
+                continue
+            summary = (filtered_earnings_tickers_data if is_earnings else filtered_tickers_data)[ticker]
+            put_block = render_put_block(ticker_value, ticker, summary, ticker_puts[ticker], is_earnings, sort_by)
+            rendered += 1
+            put_rows += min(len(ticker_puts[ticker]), PUT_PAGE_SIZE)
+            call_block = None
+            calls_data = report.earnings_calls_data if is_earnings else report.calls_data
+            if ticker in calls_data:
+                call_block = render_call_block(ticker, summary, calls_data[ticker], is_earnings,
+                                               report.call_index, ticker_puts[ticker])
+                rendered_calls += 1
+            fragments[ticker_value] = (put_block, call_block)
+            if cache_key is not None:
+                FRAGMENT_CACHE.put((*cache_key, ticker_value), fragments[ticker_value],
+                                   estimate_fragment_bytes([put_block, call_block]))
+    METRICS.observe(METRICS.rendered_tickers, rendered, 'puts')
+    METRICS.observe(METRICS.rendered_tickers, rendered_calls, 'calls')
+    METRICS.observe(METRICS.rendered_puts, put_rows)
+
+    put_blocks, call_blocks = [], []
+    for ticker_value in ticker_values:
+        if ticker_value in fragments:
+            put_block, call_block = fragments[ticker_value]
+            put_blocks.append((ticker_value, put_block))
+            if call_block is not None:
+                call_blocks.append((ticker_value, call_block))
+    return put_blocks, call_blocks
+
+
+def server_callback(*args, **kwargs):
+    """app.callback for the filtering stages, which run in the browser instead when CLIENTSIDE_FILTERING is on"""
+    if CLIENTSIDE_FILTERING:
+        return lambda func: func
+    return app.callback(*args, **kwargs)
+
+
+def linked_report(search):
+    """report-key data for a ?report=<key>&filename=<name> URL; raises PreventUpdate if there is no report in it"""
+    query = parse_qs((search or '').lstrip('?'))
+    key = query.get('report', [None])[0]
+    if key is None:
+        raise PreventUpdate
+    return {'key': key, 'filename': query.get('filename', ['report'])[0]}
+
+
+if BACKGROUND_MANAGER is None:
+    @app.callback(
+        [Output('report-key', 'data'),
+         Output('upload-data', 'contents')],
+        [Input('upload-data', 'contents'),
+         Input('url', 'search')],
+        State('upload-data', 'filename')
+    )
+    def store_uploaded_report(file_contents, search, filename):
+        """Parse a new upload once and keep only its key client-side so the file isn't re-sent on every click.
+
+        Reports streamed to /upload-report arrive as ?report=<key>&filename=<name> in the URL instead, which
+        also makes them reachable by link.
+        """
+        if dash.callback_context.triggered_id != 'upload-data':
+            return linked_report(search), dash.no_update
+        if file_contents is None:
+            raise PreventUpdate
+        return {'key': store_upload(file_contents, filename), 'filename': filename}, None
+else:
+    @app.callback(
+        Output('report-key', 'data', allow_duplicate=True),
+        Input('url', 'search'),
+        prevent_initial_call='initial_duplicate'
+    )
+    def store_linked_report(search):
+        """Reports streamed to /upload-report, or shared by link, are already parsed: just point report-key at them"""
+        return linked_report(search)
+
+    @app.callback(
+        Output('report-key', 'data', allow_duplicate=True),
+        Input('upload-data', 'contents'),
+        State('upload-data', 'filename'),
+        background=True,
+        manager=BACKGROUND_MANAGER,
+        progress=[Output('upload-progress', 'value'), Output('upload-progress', 'label')],
+        running=[(Output('upload-progress-row', 'style'), {'display': 'flex', 'alignItems': 'center'},
+                  {'display': 'none'}),
+                 (Output('upload-data', 'disabled'), True, False)],
+        cancel=[Input('cancel-upload', 'n_clicks')],
+        prevent_initial_call=True
+    )
+    def parse_upload_in_background(set_progress, file_contents, filename):
+        """Decode, parse, publish and record a new upload in a background process.
+
+        The web worker only hands the file over and polls for progress; once the snapshot is published its
+        filter callbacks map it like any other. The contents stay in dcc.Upload rather than being cleared,
+        which would start a second job just to find nothing to do.
+        """
+        if file_contents is None:
+            raise PreventUpdate
+        set_progress((0, "Decoding"))
+        key, decoded = spool_upload(file_contents)
+
+        def parse():
+            text = decoded.decode('utf-8')
+            parser = _feed_report_lines(_lines_with_progress(
+                text, lambda fraction: set_progress((70 * fraction, f"Parsing {fraction:.0%}"))))
+            set_progress((70, "Indexing"))
+            report = report_from_parser(parser)
+            set_progress((90, "Saving"))
+            return report
+        # Not through REPORT_CACHE: this process exits with the job, and its locks may have been copied mid-use
+        load_report(key, parse, filename)
+        return {'key': key, 'filename': filename}
+
+
+@server_callback(
     [Output('upload-status', 'children'),
      Output('expiry-dates', 'options'),
      Output('expiry-dates', 'value'),
-     Output('tickers', 'options'),
-     Output('tickers', 'value'),
-     Output('put-breakdown-div', 'children'),
-     Output('call-activity-div', 'children')],
-    [Input('upload-data', 'contents'),
+     Output('expiry-range', 'options'),
+     Output('expiry-range', 'value')],
+    [Input('report-key', 'data'),
      Input('select-all-expiry', 'n_clicks'),
      Input('clear-all-expiry', 'n_clicks'),
+     Input('expiry-range', 'value')],
+    State('expiry-dates', 'value')
+)
+def update_expiry_options(uploaded_report, select_all_expiry, clear_all_expiry, expiry_range, selected_expiry_dates):
+    """Expiry checklist stage: options only change with the report; the buttons and range picker only touch the value"""
+    triggered_id = dash.callback_context.triggered_id
+    _, report, status_msg = resolve_report(uploaded_report)
+    if report is None:
+        return status_msg, [], [], [], None
+
+    if triggered_id == "select-all-expiry":
+        return dash.no_update, dash.no_update, report.expiry_dates, dash.no_update, None
+    if triggered_id == "clear-all-expiry":
+        return dash.no_update, dash.no_update, [], dash.no_update, None
+    if triggered_id == "expiry-range":
+        if not expiry_range:
+            raise PreventUpdate
+        range_values = {value: expiries for value, _, expiries in report.expiry_ranges()}
+        return dash.no_update, dash.no_update, range_values.get(expiry_range, []), dash.no_update, dash.no_update
+
+    available = set(report.expiry_dates)
+    expiry_values = [exp_date for exp_date in selected_expiry_dates or [] if exp_date in available]
+    range_options = [{'label': label, 'value': value} for value, label, _ in report.expiry_ranges()]
+    return status_msg, report.expiry_index.options(), expiry_values, range_options, None
+
+
+@server_callback(
+    [Output('tickers', 'options'),
+     Output('tickers', 'value')],
+    [Input('report-key', 'data'),
+     Input('expiry-dates', 'value'),
      Input('select-normal', 'n_clicks'),
      Input('select-earnings', 'n_clicks'),
      Input('clear-all', 'n_clicks'),
-     Input('expiry-dates', 'value'),
-     Input('tickers', 'value')],
-    [State('upload-data', 'filename'),
-     State('expiry-dates', 'options'),
-     State('tickers', 'options')]
+     Input('ticker-group', 'value')],
+    State('tickers', 'value')
 )
-def update_dashboard(file_contents, select_all_expiry, clear_all_expiry, select_normal, select_earnings, clear_all,
-                     selected_expiry_dates, selected_tickers, filename, expiry_options, ticker_options):
-    ctx = dash.callback_context
-    triggered_id = ctx.triggered[0]['prop_id'].split('.')[0] if ctx.triggered else None
+def update_ticker_options(uploaded_report, expiry_values, select_normal, select_earnings, clear_all, group_values,
+                          selected_tickers):
+    """Ticker checklist stage: labels follow the expiry and sector/market-cap filters, the buttons only replace the value"""
+    triggered_id = dash.callback_context.triggered_id
+    _, report, _ = resolve_report(uploaded_report)
+    if report is None:
+        return [], []
+
+    _, filtered_tickers_data, filtered_earnings_tickers_data = report.filtered(expiry_values)
+    if group_values:
+        keep = tickers_in_groups(sorted(set(filtered_tickers_data) | set(filtered_earnings_tickers_data)), group_values)
+        filtered_tickers_data = {tk: d for tk, d in filtered_tickers_data.items() if tk in keep}
+        filtered_earnings_tickers_data = {tk: d for tk, d in filtered_earnings_tickers_data.items() if tk in keep}
+    normal_ticker_options, earnings_ticker_options = build_ticker_options(
+        filtered_tickers_data, filtered_earnings_tickers_data)
 
-    data_str = None
-    if file_contents is not None:
-        content_type, content_string = file_contents.split(',')
-        decoded = base64.b64decode(content_string)
-        data_str = decoded.decode('utf-8')
-        status_msg = f"File '{filename}' uploaded successfully."
-    else:
-        try:
-            with open("ITM_Analysis_Summary.txt", 'r', encoding='utf-8') as f:
-                data_str = f.read()
-            status_msg = "Using default ITM_Analysis_Summary.txt file."
-        except FileNotFoundError:
-            return "No file uploaded and no default file found.", [], [], [], [], "", ""
-
-    tickers_data, puts_data, calls_data, earnings_tickers_data, earnings_puts_data, earnings_calls_data = parse_itm_content(
-        data_str)
-
-    all_expiry_dates = get_all_expiry_dates(puts_data, earnings_puts_data)
-    expiry_label_options = [{'label': exp_date, 'value': exp_date} for exp_date in all_expiry_dates]
+    if triggered_id == "select-normal":
+        return dash.no_update, [opt['value'] for opt in normal_ticker_options]
+    if triggered_id == "select-earnings":
+        return dash.no_update, [opt['value'] for opt in earnings_ticker_options]
+    if triggered_id == "clear-all":
+        return dash.no_update, []
 
-    expiry_values = selected_expiry_dates or []
-    if triggered_id == "select-all-expiry":
-        expiry_values = all_expiry_dates
-    elif triggered_id == "clear-all-expiry":
-        expiry_values = []
+    all_ticker_options = normal_ticker_options + earnings_ticker_options
+    available_values = {opt['value'] for opt in all_ticker_options}
+    ticker_values = [tk for tk in selected_tickers or [] if tk in available_values]
+    if ticker_values == (selected_tickers or []):
+        ticker_values = dash.no_update
+    return all_ticker_options, ticker_values
+
+
+def _patch_pane(pane_patch, rendered, desired, blocks):
+    """Delete blocks no longer wanted and append the new ones; returns False if the order can't be kept"""
+    kept = [tk for tk in rendered if tk in desired]
+    if kept != desired[:len(kept)]:
+        return False
+    for idx in reversed(range(len(rendered))):
+        if rendered[idx] not in desired:
+            del pane_patch[idx]
+    for tk in desired[len(kept):]:
+        pane_patch.append(blocks[tk])
+    return True
+
+
+def ticker_window(ticker_values, load_more_clicks):
+    """The ticker values whose blocks are rendered, plus the "show more tickers" button text and style"""
+    limit = TICKER_PAGE_SIZE * (1 + (load_more_clicks or 0))
+    hidden = len(ticker_values) - limit
+    if hidden <= 0:
+        return ticker_values, "", {'display': 'none'}
+    return ticker_values[:limit], f"Show {min(hidden, TICKER_PAGE_SIZE)} more of {hidden} hidden tickers", {}
+
+
+@server_callback(
+    [Output('put-breakdown-div', 'children'),
+     Output('call-activity-div', 'children'),
+     Output('detail-panes-state', 'data'),
+     Output('load-more-tickers', 'children'),
+     Output('load-more-tickers', 'style')],
+    [Input('tickers', 'value'),
+     Input('expiry-dates', 'value'),
+     Input('report-key', 'data'),
+     Input('put-sort', 'value'),
+     Input('load-more-tickers', 'n_clicks')],
+    State('detail-panes-state', 'data')
+)
+def update_detail_panes(ticker_values, expiry_values, uploaded_report, sort_by, load_more_clicks, rendered):
+    """Detail stage: when only the ticker selection moved, patch in/out the blocks of the tickers that changed"""
+    key, report, _ = resolve_report(uploaded_report)
+    if report is None:
+        return "", "", None, "", {'display': 'none'}
+
+    ticker_values, more_label, more_style = ticker_window(ticker_values or [], load_more_clicks)
+    expiry_values = sorted(expiry_values or [])
+    if (rendered and rendered['report'] == key and rendered['expiry'] == expiry_values
+            and rendered['sort'] == sort_by):
+        # Same report, filter and sort: only blocks for newly shown tickers need rendering
+        new_values = [tk for tk in ticker_values if tk not in rendered['puts'] and tk not in rendered['calls']]
+        put_blocks, call_blocks = render_detail_blocks(report, expiry_values, new_values, sort_by, key)
+        wanted = set(ticker_values)
+        desired_puts = [tk for tk in rendered['puts'] if tk in wanted] + [tk for tk, _ in put_blocks]
+        desired_calls = [tk for tk in rendered['calls'] if tk in wanted] + [tk for tk, _ in call_blocks]
+        order = {tk: idx for idx, tk in enumerate(ticker_values)}
+        desired_puts.sort(key=order.get)
+        desired_calls.sort(key=order.get)
+        put_patch, call_patch = Patch(), Patch()
+        if (_patch_pane(put_patch, rendered['puts'], desired_puts, dict(put_blocks))
+                and _patch_pane(call_patch, rendered['calls'], desired_calls, dict(call_blocks))):
+            state = {'report': key, 'expiry': expiry_values, 'sort': sort_by,
+                     'puts': desired_puts, 'calls': desired_calls}
+            return put_patch, call_patch, state, more_label, more_style
+
+    put_blocks, call_blocks = render_detail_blocks(report, expiry_values, ticker_values, sort_by, key)
+    state = {'report': key, 'expiry': expiry_values, 'sort': sort_by,
+             'puts': [tk for tk, _ in put_blocks], 'calls': [tk for tk, _ in call_blocks]}
+    return ([block for _, block in put_blocks], [block for _, block in call_blocks], state,
+            more_label, more_style)
+
+
+@server_callback(
+    [Output({'type': 'put-rows', 'index': MATCH}, 'children'),
+     Output({'type': 'load-more-puts', 'index': MATCH}, 'children'),
+     Output({'type': 'load-more-puts', 'index': MATCH}, 'style')],
+    Input({'type': 'load-more-puts', 'index': MATCH}, 'n_clicks'),
+    [State('report-key', 'data'),
+     State('expiry-dates', 'value'),
+     State('put-sort', 'value')],
+    prevent_initial_call=True
+)
+def load_more_puts(n_clicks, uploaded_report, expiry_values, sort_by):
+    """Append the next page of one ticker's puts to its block"""
+    ticker_value = dash.callback_context.triggered_id['index']
+    _, report, _ = resolve_report(uploaded_report)
+    if report is None or not n_clicks:
+        raise PreventUpdate
+    is_earnings = ticker_value.startswith('earnings_')
+    ticker = ticker_value.replace('earnings_', '') if is_earnings else ticker_value
+    ticker_puts = report.ticker_puts(expiry_values, is_earnings, [ticker]).get(ticker, [])
+
+    start = n_clicks * PUT_PAGE_SIZE
+    rows = Patch()
+    rows.extend(render_put_rows(sort_puts(ticker_puts, sort_by)[start:start + PUT_PAGE_SIZE], is_earnings))
+    remaining = len(ticker_puts) - start - PUT_PAGE_SIZE
+    if remaining > 0:
+        return rows, load_more_label(remaining), dash.no_update
+    return rows, "", {'display': 'none'}
 
-    if expiry_values:
-        filtered_puts_data = filter_by_expiry_dates(puts_data, expiry_values)
-        filtered_tickers_data = recalculate_ticker_data_for_filtered_puts(tickers_data, filtered_puts_data)
 
-        filtered_earnings_puts_data = filter_by_expiry_dates(earnings_puts_data, expiry_values)
-        filtered_earnings_tickers_data = recalculate_ticker_data_for_filtered_puts(earnings_tickers_data,
-                                                                                   filtered_earnings_puts_data)
-    else:
-        filtered_puts_data = puts_data
-        filtered_tickers_data = tickers_data
-        filtered_earnings_puts_data = earnings_puts_data
-        filtered_earnings_tickers_data = earnings_tickers_data
+@app.callback(
+    [Output('ticker-group', 'options'),
+     Output('ticker-group', 'value')],
+    Input('report-key', 'data')
+)
+def update_ticker_group_options(uploaded_report):
+    """Sector and market-cap choices follow the report; runs on the server in both filtering modes"""
+    _, report, _ = resolve_report(uploaded_report)
+    if report is None:
+        return [], []
+    return ticker_group_options(report), []
+
+
+@server_callback(
+    Output('summary-panel', 'children'),
+    [Input('report-key', 'data'),
+     Input('expiry-dates', 'value')]
+)
+def update_summary(uploaded_report, expiry_values):
+    """Summary panel from the precomputed aggregates"""
+    _, report, _ = resolve_report(uploaded_report)
+    if report is None:
+        return html.P("Upload a report to see its summary.", style={'color': 'gray'})
+    return render_summary(report, expiry_values)
 
-    # NEW: Create ticker options with short interest indicator
-    normal_ticker_options = []
-    for tk in sorted(filtered_tickers_data.keys()):
-        # Add ⚠️ symbol if ticker is in short interest list
-        short_indicator = "⚠️ " if tk in SHORT_INTEREST_TICKERS else ""
-        label_text = f"{short_indicator}🔹 {tk} ({filtered_tickers_data[tk]['num_puts']} | {format_currency(filtered_tickers_data[tk]['total_premium'])})"
-        normal_ticker_options.append({'label': label_text, 'value': tk})
 
-    earnings_ticker_options = []
-    for tk in sorted(filtered_earnings_tickers_data.keys()):
-        # Add ⚠️ symbol if ticker is in short interest list
-        short_indicator = "⚠️ " if tk in SHORT_INTEREST_TICKERS else ""
-        label_text = f"{short_indicator}🏢 {tk} ({filtered_earnings_tickers_data[tk]['num_puts']} | {format_currency(filtered_earnings_tickers_data[tk]['total_premium'])})"
-        earnings_ticker_options.append({'label': label_text, 'value': f"earnings_{tk}"})
+@app.callback(
+    [Output('recent-reports', 'data'),
+     Output('compare-report', 'options'),
+     Output('compare-report', 'value')],
+    Input('report-key', 'data'),
+    State('recent-reports', 'data')
+)
+def update_recent_reports(uploaded_report, recent):
+    """Remember the reports viewed in this browser and offer the others as comparison baselines.
 
-    all_ticker_options = normal_ticker_options + earnings_ticker_options
+    The baseline starts as the report viewed just before this one: yesterday's, when today's was just uploaded.
+    """
+    key, report, _ = resolve_report(uploaded_report)
+    recent = [entry for entry in recent or [] if entry['key'] != key]
+    options = [{'label': entry['label'], 'value': entry['key']} for entry in recent]
+    if report is not None:
+        name = uploaded_report['filename'] if uploaded_report else os.path.basename(DEFAULT_REPORT_PATH)
+        recent.insert(0, {'key': key, 'label': f"{name}, generated {report.generated or 'unknown'}"})
+    return recent[:RECENT_REPORTS], options, options[0]['value'] if options else None
 
-    ticker_values = selected_tickers or []
-    if triggered_id == "select-normal":
-        ticker_values = [opt['value'] for opt in normal_ticker_options]
-    elif triggered_id == "select-earnings":
-        ticker_values = [opt['value'] for opt in earnings_ticker_options]
-    elif triggered_id == "clear-all":
-        ticker_values = []
 
-    available_values = [opt['value'] for opt in all_ticker_options]
-    ticker_values = [tk for tk in ticker_values if tk in available_values]
+@app.callback(
+    Output('diff-panel', 'children'),
+    [Input('report-key', 'data'),
+     Input('compare-report', 'value')],
+    State('compare-report', 'options')
+)
+def update_diff(uploaded_report, baseline_key, options):
+    """Diff of the current report against the chosen baseline, from DIFF_CACHE after the first time"""
+    if not baseline_key:
+        return html.P("Open another report to compare it with the one viewed before.", style={'color': 'gray'})
+    key, report, _ = resolve_report(uploaded_report)
+    baseline = load_uploaded_report(baseline_key)
+    if report is None or baseline is None:
+        return html.P("That report is no longer available. Please upload it again.", style={'color': 'gray'})
+    baseline_label = next((option['label'] for option in options or [] if option['value'] == baseline_key),
+                          "the earlier report")
+    return [html.Small(f"Changes since {baseline_label}", style={'color': '#888'}),
+            *report_diff_panel(baseline_key, baseline, key, report)]
+
+
+def report_client_payload(key, report, status_msg):
+    """Compact JSON form of a ParsedReport for the clientside callbacks; puts are sent column-wise"""
+    import numpy as np
+
+    if report is None:
+        return {'key': None, 'status': status_msg}
+    puts_frame = report.puts_frame
+    all_tickers = set(report.tickers_data) | set(report.earnings_tickers_data)
+    short_interest_table = short_interest()
+    return {
+        'key': key,
+        'status': status_msg,
+        'expiry_dates': report.expiry_dates,
+        'expiry_options': report.expiry_index.options(),
+        'expiry_ranges': [{'value': value, 'label': label, 'dates': expiries}
+                          for value, label, expiries in report.expiry_ranges()],
+        'short_interest': sorted(tk for tk in all_tickers if tk in short_interest_table),
+        # ticker -> [sector, market-cap band] for the ticker-group filter
+        'ticker_groups': {tk: list(group) for tk, group in short_interest_table.groups().items() if tk in all_tickers},
+        # [normal, earnings] pairs throughout
+        'tickers': [
+            {tk: [d['current_price'], d['num_puts'], d['total_premium']] for tk, d in tickers_data.items()}
+            for tickers_data in (report.tickers_data, report.earnings_tickers_data)
+        ],
+        'put_tickers': [report.put_tickers(False), report.put_tickers(True)],
+        'calls': [report.calls_data, report.earnings_calls_data],
+        'puts': {
+            'ticker_names': list(puts_frame['ticker'].cat.categories),
+            'ticker': puts_frame['ticker'].cat.codes.tolist(),
+            'is_earnings': puts_frame['is_earnings'].astype(np.int8).tolist(),
+            'put_number': puts_frame['put_number'].tolist(),
+            'strike': puts_frame['strike'].tolist(),
+            'itm_by': puts_frame['itm_by'].tolist(),
+            'premium': puts_frame['premium'].tolist(),
+            'expiry_labels': list(puts_frame['expiration_label'].cat.categories),
+            'expiry': puts_frame['expiration_label'].cat.codes.tolist(),
+        },
+        # Call index as [[ISO expiry, strikes], ...] per ticker, plus the ISO date of each put expiry label
+        'call_index': [
+            {ticker: [[expiry.isoformat(), strikes] for expiry, strikes in expiries.items()]
+             for (is_earnings, ticker), expiries in report.call_index.by_ticker.items() if is_earnings == kind}
+            for kind in (False, True)
+        ],
+        'expiry_iso': [expiry.isoformat() if expiry else None
+                       for expiry in map(parse_expiry_date, puts_frame['expiration_label'].cat.categories)],
+        # Dense chronological rank of each expiry label, for the "Expiry" sort
+        'expiry_rank': _dense_ranks([expiry_sort_key(label) for label in puts_frame['expiration_label'].cat.categories]),
+        'put_page_size': PUT_PAGE_SIZE,
+        'ticker_page_size': TICKER_PAGE_SIZE,
+        'summary': report.aggregates.client_payload(),
+        # ISO expiry -> [tickers, call strikes] bought for it, across the whole report
+        'call_counts': {expiry.isoformat(): list(counts)
+                        for expiry, counts in report.call_index.counts_by_expiry().items()},
+        'summary_header': render_report_header(report.header),
+        'unlisted': UNLISTED,
+    }
+
+
+def _dense_ranks(keys):
+    ranks = {key: rank for rank, key in enumerate(sorted(set(keys)))}
+    return [ranks[key] for key in keys]
+
+
+if CLIENTSIDE_FILTERING:
+    @app.callback(
+        Output('report-data', 'data'),
+        Input('report-key', 'data')
+    )
+    def publish_report_data(uploaded_report):
+        """Clientside mode: send the parsed report to the browser once per upload; filter clicks stay in the browser"""
+        return report_client_payload(*resolve_report(uploaded_report))
+
+    app.clientside_callback(
+        ClientsideFunction(namespace='itm', function_name='updateExpiryOptions'),
+        [Output('upload-status', 'children'),
+         Output('expiry-dates', 'options'),
+         Output('expiry-dates', 'value'),
+         Output('expiry-range', 'options'),
+         Output('expiry-range', 'value')],
+        [Input('report-data', 'data'),
+         Input('select-all-expiry', 'n_clicks'),
+         Input('clear-all-expiry', 'n_clicks'),
+         Input('expiry-range', 'value')],
+        State('expiry-dates', 'value')
+    )
+    app.clientside_callback(
+        ClientsideFunction(namespace='itm', function_name='updateTickerOptions'),
+        [Output('tickers', 'options'),
+         Output('tickers', 'value')],
+        [Input('report-data', 'data'),
+         Input('expiry-dates', 'value'),
+         Input('select-normal', 'n_clicks'),
+         Input('select-earnings', 'n_clicks'),
+         Input('clear-all', 'n_clicks'),
+         Input('ticker-group', 'value')],
+        State('tickers', 'value')
+    )
+    app.clientside_callback(
+        ClientsideFunction(namespace='itm', function_name='updateDetailPanes'),
+        [Output('put-breakdown-div', 'children'),
+         Output('call-activity-div', 'children'),
+         Output('load-more-tickers', 'children'),
+         Output('load-more-tickers', 'style')],
+        [Input('tickers', 'value'),
+         Input('expiry-dates', 'value'),
+         Input('report-data', 'data'),
+         Input('put-sort', 'value'),
+         Input('load-more-tickers', 'n_clicks')]
+    )
+    app.clientside_callback(
+        ClientsideFunction(namespace='itm', function_name='updateSummary'),
+        Output('summary-panel', 'children'),
+        [Input('report-data', 'data'),
+         Input('expiry-dates', 'value')]
+    )
+    app.clientside_callback(
+        ClientsideFunction(namespace='itm', function_name='loadMorePuts'),
+        [Output({'type': 'put-rows', 'index': MATCH}, 'children'),
+         Output({'type': 'load-more-puts', 'index': MATCH}, 'children'),
+         Output({'type': 'load-more-puts', 'index': MATCH}, 'style')],
+        Input({'type': 'load-more-puts', 'index': MATCH}, 'n_clicks'),
+        [State('report-data', 'data'),
+         State('expiry-dates', 'value'),
+         State('put-sort', 'value')],
+        prevent_initial_call=True
+    )
 
-    put_children = []
-    call_children = []
 
-    for ticker_value in ticker_values:
-        if ticker_value.startswith('earnings_'):
-            actual_ticker = ticker_value.replace('earnings_', '')
-            if actual_ticker in filtered_earnings_puts_data:
-                current_price = filtered_earnings_tickers_data[actual_ticker]['current_price']
-                total_prem = format_currency(filtered_earnings_tickers_data[actual_ticker]['total_premium'])
-
-                # NEW: Add short interest indicator to header
-                short_badge = html.Span(" ⚠️ HIGH SHORT", style={'color': '#ff6b6b', 'fontSize': '12px',
-                                                                 'fontWeight': 'bold'}) if actual_ticker in SHORT_INTEREST_TICKERS else ""
-
-                put_header = html.Div([
-                    html.H5([f"🏢 {actual_ticker} - Put Options Breakdown (Earnings)", short_badge]),
-                    html.P([
-                        html.Strong("Current Price: "),
-                        f"${current_price:,.2f} | ",
-                        html.Strong("Total Puts: "),
-                        f"{len(filtered_earnings_puts_data[actual_ticker])} | ",
-                        html.Strong("Total Premium: "),
-                        total_prem
-                    ])
-                ], style={'backgroundColor': '#e8f5e9', 'padding': '10px', 'marginBottom': '10px',
-                          'border': '2px solid #4caf50'})
-                put_children.append(put_header)
-
-                for put in filtered_earnings_puts_data[actual_ticker]:
-                    put_children.append(
-                        html.Div([
-                            html.Strong(f"Put #{put['put_number']} | "),
-                            f"Strike: ${put['strike']:,.2f} | ",
-                            f"ITM by: ${put['itm_by']:,.2f} | ",
-                            f"Premium: {format_currency(put['premium'])} | ",
-                            f"Expires: {put['expiration']}"
-                        ], style={'backgroundColor': '#f1f8e9', 'padding': '8px', 'marginBottom': '6px'})
-                    )
-
-                if actual_ticker in earnings_calls_data:
-                    call_text = earnings_calls_data[actual_ticker]
-                    call_children.append(
-                        html.Div([
-                            html.H5([f"🏢 {actual_ticker} - Call Activity Analysis (Earnings)", short_badge]),
-                            html.P([
-                                html.Strong("Current Price: "),
-                                f"${current_price:,.2f}"
-                            ]),
-                            html.P(call_text)
-                        ], style={'backgroundColor': '#e8f5e9', 'padding': '10px', 'marginBottom': '10px',
-                                  'border': '2px solid #4caf50'})
-                    )
-        else:
-            if ticker_value in filtered_puts_data:
-                current_price = filtered_tickers_data[ticker_value]['current_price']
-                total_prem = format_currency(filtered_tickers_data[ticker_value]['total_premium'])
-
-                # NEW: Add short interest indicator to header
-                short_badge = html.Span(" ⚠️ HIGH SHORT", style={'color': '#ff6b6b', 'fontSize': '12px',
-                                                                 'fontWeight': 'bold'}) if ticker_value in SHORT_INTEREST_TICKERS else ""
-
-                put_header = html.Div([
-                    html.H5([f"🔹 {ticker_value} - Put Options Breakdown", short_badge]),
-                    html.P([
-                        html.Strong("Current Price: "),
-                        f"${current_price:,.2f} | ",
-                        html.Strong("Total Puts: "),
-                        f"{len(filtered_puts_data[ticker_value])} | ",
-                        html.Strong("Total Premium: "),
-                        total_prem
-                    ])
-                ], style={'backgroundColor': '#e3f2fd', 'padding': '10px', 'marginBottom': '10px'})
-                put_children.append(put_header)
-
-                for put in filtered_puts_data[ticker_value]:
-                    put_children.append(
-                        html.Div([
-                            html.Strong(f"Put #{put['put_number']} | "),
-                            f"Strike: ${put['strike']:,.2f} | ",
-                            f"ITM by: ${put['itm_by']:,.2f} | ",
-                            f"Premium: {format_currency(put['premium'])} | ",
-                            f"Expires: {put['expiration']}"
-                        ], style={'backgroundColor': '#ffebee', 'padding': '8px', 'marginBottom': '6px'})
-                    )
-
-                if ticker_value in calls_data:
-                    call_text = calls_data[ticker_value]
-                    call_children.append(
-                        html.Div([
-                            html.H5([f"🔹 {ticker_value} - Call Activity Analysis", short_badge]),
-                            html.P([
-                                html.Strong("Current Price: "),
-                                f"${current_price:,.2f}"
-                            ]),
-                            html.P(call_text)
-                        ], style={'backgroundColor': '#e8f5e9', 'padding': '10px', 'marginBottom': '10px'})
-                    )
-
-    return status_msg, expiry_label_options, expiry_values, all_ticker_options, ticker_values, put_children, call_children
+if HISTORY is not None:
+    @app.callback(
+        Output('history-ticker', 'options'),
+        Input('report-key', 'data')
+    )
+    def update_history_tickers(uploaded_report):
+        """Resolving the report ingests it on first parse, so the ticker list includes it"""
+        resolve_report(uploaded_report)
+        return HISTORY.tickers()
+
+    @app.callback(
+        Output('history-trend', 'figure'),
+        Input('history-ticker', 'value')
+    )
+    def update_history_trend(ticker):
+        """Total put premium for one ticker across the latest reports"""
+        if not ticker:
+            return {'data': [], 'layout': {'title': 'Select a ticker to see its premium trend'}}
+        trend = HISTORY.premium_trend(ticker, last_n=HISTORY_TREND_REPORTS)
+        generated = [row[0] for row in trend]
+        return {
+            'data': [
+                {'x': generated, 'y': [row[2] for row in trend], 'type': 'scatter', 'mode': 'lines+markers',
+                 'name': 'Total premium', 'text': [f"{row[1]} puts" for row in trend]},
+            ],
+            'layout': {
+                'title': f"{ticker} put premium, last {len(trend)} reports",
+                'yaxis': {'tickprefix': '$'},
+                'margin': {'l': 60, 'r': 20, 't': 40, 'b': 60},
+            },
+        }
+
+    @app.callback(
+        Output('history-streak-tickers', 'children'),
+        [Input('history-streak', 'value'),
+         Input('history-ticker', 'options')]
+    )
+    def update_history_streaks(n, _):
+        """Tickers that appear in each of the latest n reports"""
+        if not n or n < 1:
+            raise PreventUpdate
+        n = int(n)
+        num_reports = len(HISTORY.reports(last_n=n))
+        if num_reports < n:
+            return html.P(f"Only {num_reports} report(s) in history.", style={'color': 'gray'})
+        tickers = HISTORY.tickers_in_a_row(n)
+        if not tickers:
+            return html.P(f"No ticker appears in each of the last {n} reports.", style={'color': 'gray'})
+        return [html.P(f"{len(tickers)} ticker(s) in each of the last {n} reports:", style={'fontWeight': 'bold'}),
+                html.P(", ".join(tickers))]
+
+
+@server.route('/status')
+def status():
+    """Reload watcher events and cache state for this worker, as JSON"""
+    RELOAD_WATCHER.ensure_running()
+    _, key, report = _default_report_state
+    return {
+        'pid': os.getpid(),
+        'default_report': {'key': key, 'generated': report.generated if report is not None else None},
+        'short_interest': short_interest().stats(),
+        'report_cache': REPORT_CACHE.stats(),
+        'diff_cache': DIFF_CACHE.stats(),
+        'fragment_cache': FRAGMENT_CACHE.stats(),
+        'reload_watcher': RELOAD_WATCHER.status(),
+    }
+
+
+@server.route('/upload-report', methods=['POST'])
+def upload_report():
+    """Stream a raw report body (not base64, not multipart) into the parser; returns the key report-key refers to"""
+    filename = os.path.basename(flask.request.args.get('filename', '')) or 'report.txt'
+    if (flask.request.content_length or 0) > MAX_UPLOAD_BYTES:
+        return {'error': f"Report is larger than {MAX_UPLOAD_BYTES // 2 ** 20} MB."}, 413
+    try:
+        key, report = store_upload_stream(flask.request.stream, filename)
+    except UploadTooLarge:
+        return {'error': f"Report is larger than {MAX_UPLOAD_BYTES // 2 ** 20} MB."}, 413
+    except UnicodeDecodeError:
+        return {'error': "Report is not UTF-8 text."}, 400
+    return {'key': key, 'filename': filename, 'generated': report.generated, 'puts': len(report.puts_frame),
+            'tickers': len(report.tickers_data) + len(report.earnings_tickers_data)}
+
+
+def _callback_name(output):
+    callback = app.callback_map.get(output, {}).get('callback')
+    return getattr(callback, '__name__', output)
+
+
+def _collect_cache_gauges():
+    """Sizes and cumulative hits/misses that the caches and the reload watcher already keep"""
+    stats = REPORT_CACHE.stats()
+    lines = [
+        "# HELP itm_report_cache_entries Parsed reports held in this worker's cache",
+        "# TYPE itm_report_cache_entries gauge",
+        f"itm_report_cache_entries {stats['entries']}",
+        "# HELP itm_fragment_cache_bytes Estimated size of the rendered ticker blocks held in this worker's cache",
+        "# TYPE itm_fragment_cache_bytes gauge",
+        f"itm_fragment_cache_bytes {FRAGMENT_CACHE.stats()['bytes']}",
+        "# HELP itm_reloads_total Files reloaded by the watcher",
+        "# TYPE itm_reloads_total counter",
+        f'itm_reloads_total{{result="ok"}} {RELOAD_WATCHER.reloads}',
+        f'itm_reloads_total{{result="error"}} {RELOAD_WATCHER.errors}',
+    ]
+    # Only once loaded: a scrape shouldn't be what loads the short interest table or builds its frame
+    table = _short_interest_table
+    if table is not None:
+        lines += [
+            "# HELP itm_short_interest_load_seconds Time the current short interest table took to parse",
+            "# TYPE itm_short_interest_load_seconds gauge",
+            f"itm_short_interest_load_seconds {table.load_seconds}",
+        ]
+        if table.memory_bytes is not None:
+            lines += [
+                "# HELP itm_short_interest_bytes Memory held by the short interest table",
+                "# TYPE itm_short_interest_bytes gauge",
+                f"itm_short_interest_bytes {table.memory_bytes}",
+            ]
+    return lines
+
+
+if METRICS.enabled:
+    METRICS.add_collector(_collect_cache_gauges)
+
+    @server.before_request
+    def start_callback_timer():
+        if flask.request.path.endswith('/_dash-update-component'):
+            METRICS.start_request()
+
+    @server.after_request
+    def record_callback_metrics(response):
+        if flask.request.path.endswith('/_dash-update-component'):
+            body = flask.request.get_json(silent=True) or {}
+            callback = _callback_name(body.get('output', ''))
+            slow = METRICS.finish_request(callback, flask.request.content_length or 0,
+                                          response.calculate_content_length() or 0)
+            if slow:
+                seconds, stages = slow
+                # Whatever no stage accounts for is Dash dispatch and JSON serialization of the response
+                stages['dash'] = max(seconds - sum(stages.values()), 0.0)
+                breakdown = ", ".join(f"{stage} {stage_seconds * 1000:.1f} ms"
+                                      for stage, stage_seconds in sorted(stages.items(), key=lambda s: -s[1]))
+                print(f"⚠️ Slow callback {callback}: {seconds * 1000:.1f} ms ({breakdown})")
+        return response
+
+    @server.route('/metrics')
+    def metrics():
+        """Prometheus text exposition of this worker's metrics"""
+        return flask.Response(METRICS.render(), mimetype='text/plain; version=0.0.4')
 
 
 if __name__ == '__main__':
@@ -0,0 +1,701 @@
+// Browser-side versions of the expiry, ticker and detail-pane callbacks in app.py, used when
+// ITM_CLIENTSIDE_FILTERING is on. They work from the report-data store and must render exactly
+// what the server-side callbacks render.
+(function () {
+    var NORMAL = 0;
+    var EARNINGS = 1;
+
+    // Derived views of the report currently in the store, rebuilt when its key changes
+    var cache = {key: null, rowsByTicker: null, filtered: {}};
+
+    function noUpdate() {
+        return window.dash_clientside.no_update;
+    }
+
+    function triggeredId() {
+        var triggered = window.dash_clientside.callback_context.triggered || [];
+        return triggered.length ? triggered[0].prop_id.split('.')[0] : null;
+    }
+
+    // Python's "{:.2f}": toFixed rounds exact halves up where Python rounds them to even.
+    // Only multiples of 1/8 with an odd numerator can be exact ties at two decimals.
+    function toFixed2(value) {
+        var eighths = value * 8;
+        if (Number.isInteger(eighths) && Math.abs(eighths) % 2 === 1) {
+            var lower = Math.floor(value * 100);
+            return ((lower % 2 === 0 ? lower : lower + 1) / 100).toFixed(2);
+        }
+        return value.toFixed(2);
+    }
+
+    // Python's "{:.1f}"; the exact ties at one decimal are the odd multiples of 1/4
+    function toFixed1(value) {
+        var quarters = value * 4;
+        if (Number.isInteger(quarters) && Math.abs(quarters) % 2 === 1) {
+            var lower = Math.floor(value * 10);
+            return ((lower % 2 === 0 ? lower : lower + 1) / 10).toFixed(1);
+        }
+        return value.toFixed(1);
+    }
+
+    // Python's "{:.1%}", which multiplies by 100 in floating point before formatting
+    function percent1(value) {
+        return toFixed1(value * 100) + '%';
+    }
+
+    function groupThousands(digits) {
+        return digits.replace(/\B(?=(\d{3})+(?!\d))/g, ',');
+    }
+
+    // Python's "{:,.2f}"
+    function withCommas2(value) {
+        var parts = toFixed2(value).split('.');
+        return groupThousands(parts[0]) + '.' + parts[1];
+    }
+
+    function formatCurrency(value) {
+        if (value >= 1e9) {
+            return '$' + toFixed2(value / 1e9) + 'B';
+        } else if (value >= 1e6) {
+            return '$' + toFixed2(value / 1e6) + 'M';
+        } else if (value >= 1e3) {
+            return '$' + toFixed2(value / 1e3) + 'K';
+        }
+        return '$' + toFixed2(value);
+    }
+
+    // expiry_value in app.py: the ISO date of a label code, or the label itself if it isn't a date
+    function expiryValue(report, code) {
+        return report.expiry_iso[code] || report.puts.expiry_labels[code];
+    }
+
+    function component(type, props) {
+        return {namespace: 'dash_html_components', type: type, props: props};
+    }
+
+    function prepare(report) {
+        if (cache.key === report.key) {
+            return;
+        }
+        var puts = report.puts;
+        var rowsByTicker = [{}, {}];
+        for (var i = 0; i < puts.ticker.length; i++) {
+            var ticker = puts.ticker_names[puts.ticker[i]];
+            var rows = rowsByTicker[puts.is_earnings[i]];
+            (rows[ticker] = rows[ticker] || []).push(i);
+        }
+        cache = {key: report.key, rowsByTicker: rowsByTicker, filtered: {}};
+    }
+
+    // Client equivalent of ParsedReport.filtered: ticker summaries and per-ticker put rows
+    function filtered(report, expiryValues) {
+        prepare(report);
+        if (!expiryValues || !expiryValues.length) {
+            var putRows = [{}, {}];
+            [NORMAL, EARNINGS].forEach(function (kind) {
+                report.put_tickers[kind].forEach(function (ticker) {
+                    putRows[kind][ticker] = cache.rowsByTicker[kind][ticker] || [];
+                });
+            });
+            return {tickers: report.tickers, rows: putRows};
+        }
+        var cacheKey = expiryValues.slice().sort().join('\n');
+        if (cache.filtered[cacheKey]) {
+            return cache.filtered[cacheKey];
+        }
+        var puts = report.puts;
+        var selected = new Set(expiryValues);
+        var selectedCodes = new Set();
+        puts.expiry_labels.forEach(function (label, code) {
+            if (selected.has(expiryValue(report, code))) {
+                selectedCodes.add(code);
+            }
+        });
+        var view = {tickers: [{}, {}], rows: [{}, {}]};
+        for (var i = 0; i < puts.ticker.length; i++) {
+            if (!selectedCodes.has(puts.expiry[i])) {
+                continue;
+            }
+            var kind = puts.is_earnings[i];
+            var ticker = puts.ticker_names[puts.ticker[i]];
+            (view.rows[kind][ticker] = view.rows[kind][ticker] || []).push(i);
+        }
+        [NORMAL, EARNINGS].forEach(function (kind) {
+            Object.keys(view.rows[kind]).forEach(function (ticker) {
+                var source = report.tickers[kind][ticker];
+                if (!source) {
+                    return;
+                }
+                var total = 0;
+                view.rows[kind][ticker].forEach(function (i) {
+                    total += puts.premium[i];
+                });
+                view.tickers[kind][ticker] = [source[0], view.rows[kind][ticker].length, total];
+            });
+        });
+        cache.filtered[cacheKey] = view;
+        return view;
+    }
+
+    function tickerOptions(report, summaries) {
+        var shortInterest = new Set(report.short_interest);
+        return [NORMAL, EARNINGS].map(function (kind) {
+            return Object.keys(summaries[kind]).sort().map(function (ticker) {
+                var summary = summaries[kind][ticker];
+                var shortIndicator = shortInterest.has(ticker) ? '⚠️ ' : '';
+                var icon = kind === EARNINGS ? '🏢 ' : '🔹 ';
+                return {
+                    label: shortIndicator + icon + ticker + ' (' + summary[1] + ' | ' + formatCurrency(summary[2]) + ')',
+                    value: kind === EARNINGS ? 'earnings_' + ticker : ticker
+                };
+            });
+        });
+    }
+
+    // Same filter as tickers_in_groups in app.py: any selected sector, and any selected market-cap band
+    function inGroups(report, summaries, groupValues) {
+        var prefixed = function (prefix) {
+            return groupValues.filter(function (value) {
+                return value.indexOf(prefix) === 0;
+            }).map(function (value) {
+                return value.slice(prefix.length);
+            });
+        };
+        var sectors = prefixed('sector:');
+        var bands = prefixed('cap:');
+        return summaries.map(function (tickers) {
+            var kept = {};
+            Object.keys(tickers).forEach(function (ticker) {
+                var group = report.ticker_groups[ticker];
+                if (group && (!sectors.length || sectors.indexOf(group[0]) !== -1)
+                        && (!bands.length || bands.indexOf(group[1]) !== -1)) {
+                    kept[ticker] = tickers[ticker];
+                }
+            });
+            return kept;
+        });
+    }
+
+    function shortBadge(report, ticker) {
+        if (report.short_interest.indexOf(ticker) === -1) {
+            return '';
+        }
+        return component('Span', {
+            children: ' ⚠️ HIGH SHORT',
+            style: {color: '#ff6b6b', fontSize: '12px', fontWeight: 'bold'}
+        });
+    }
+
+    function putRows(report, rows, kind) {
+        var puts = report.puts;
+        var rowStyle = kind === EARNINGS
+            ? {backgroundColor: '#f1f8e9', padding: '8px', marginBottom: '6px'}
+            : {backgroundColor: '#ffebee', padding: '8px', marginBottom: '6px'};
+        return rows.map(function (i) {
+            return component('Div', {
+                children: [
+                    component('Strong', {children: 'Put #' + puts.put_number[i] + ' | '}),
+                    'Strike: $' + withCommas2(puts.strike[i]) + ' | ',
+                    'ITM by: $' + withCommas2(puts.itm_by[i]) + ' | ',
+                    'Premium: ' + formatCurrency(puts.premium[i]) + ' | ',
+                    'Expires: ' + puts.expiry_labels[puts.expiry[i]]
+                ],
+                style: rowStyle
+            });
+        });
+    }
+
+    // Same order as sort_puts in app.py; Array.prototype.sort is stable like Python's sorted
+    function sortRows(report, rows, sortBy) {
+        var puts = report.puts;
+        var sorted = rows.slice();
+        if (sortBy === 'premium') {
+            sorted.sort(function (a, b) {
+                return puts.premium[b] - puts.premium[a];
+            });
+        } else if (sortBy === 'itm_by') {
+            sorted.sort(function (a, b) {
+                return puts.itm_by[b] - puts.itm_by[a];
+            });
+        } else if (sortBy === 'expiration') {
+            sorted.sort(function (a, b) {
+                return report.expiry_rank[puts.expiry[a]] - report.expiry_rank[puts.expiry[b]];
+            });
+        }
+        return sorted;
+    }
+
+    function loadMoreLabel(report, remaining) {
+        return 'Load ' + Math.min(remaining, report.put_page_size) + ' more puts (' + remaining + ' not shown)';
+    }
+
+    function putBlock(report, tickerValue, ticker, summary, rows, kind, sortBy) {
+        var title, headerStyle;
+        if (kind === EARNINGS) {
+            title = '🏢 ' + ticker + ' - Put Options Breakdown (Earnings)';
+            headerStyle = {backgroundColor: '#e8f5e9', padding: '10px', marginBottom: '10px',
+                border: '2px solid #4caf50'};
+        } else {
+            title = '🔹 ' + ticker + ' - Put Options Breakdown';
+            headerStyle = {backgroundColor: '#e3f2fd', padding: '10px', marginBottom: '10px'};
+        }
+        var firstPage = sortRows(report, rows, sortBy).slice(0, report.put_page_size);
+        var children = [
+            component('Div', {
+                children: [
+                    component('H5', {children: [title, shortBadge(report, ticker)]}),
+                    component('P', {
+                        children: [
+                            component('Strong', {children: 'Current Price: '}),
+                            '$' + withCommas2(summary[0]) + ' | ',
+                            component('Strong', {children: 'Total Puts: '}),
+                            rows.length + ' | ',
+                            component('Strong', {children: 'Total Premium: '}),
+                            formatCurrency(summary[2])
+                        ]
+                    })
+                ],
+                style: headerStyle
+            }),
+            component('Div', {children: putRows(report, firstPage, kind), id: {type: 'put-rows', index: tickerValue}})
+        ];
+        var remaining = rows.length - firstPage.length;
+        if (remaining > 0) {
+            children.push({
+                namespace: 'dash_bootstrap_components',
+                type: 'Button',
+                props: {
+                    children: loadMoreLabel(report, remaining),
+                    id: {type: 'load-more-puts', index: tickerValue},
+                    color: 'link',
+                    size: 'sm',
+                    style: {marginBottom: '10px'}
+                }
+            });
+        }
+        return component('Div', {children: children});
+    }
+
+    // format_strike in app.py
+    function formatStrike(strike) {
+        return toFixed2(strike).replace(/\.?0+$/, '');
+    }
+
+    function isoToUs(iso) {
+        var parts = iso.split('-');
+        return parts[1] + '/' + parts[2] + '/' + parts[0];
+    }
+
+    function callBlock(report, ticker, summary, callText, kind, rows) {
+        var title, style;
+        if (kind === EARNINGS) {
+            title = '🏢 ' + ticker + ' - Call Activity Analysis (Earnings)';
+            style = {backgroundColor: '#e8f5e9', padding: '10px', marginBottom: '10px', border: '2px solid #4caf50'};
+        } else {
+            title = '🔹 ' + ticker + ' - Call Activity Analysis';
+            style = {backgroundColor: '#e8f5e9', padding: '10px', marginBottom: '10px'};
+        }
+        var children = [
+            component('H5', {children: [title, shortBadge(report, ticker)]}),
+            component('P', {
+                children: [component('Strong', {children: 'Current Price: '}), '$' + withCommas2(summary[0])]
+            })
+        ];
+
+        // Same queries as CallIndex.calls_on / strike_overlap, over the shown puts' expiries
+        var putStrikes = {};
+        rows.forEach(function (i) {
+            var iso = report.expiry_iso[report.puts.expiry[i]];
+            (putStrikes[iso] = putStrikes[iso] || new Set()).add(report.puts.strike[i]);
+        });
+        var sameExpiry = [];
+        var overlap = [];
+        (report.call_index[kind][ticker] || []).forEach(function (entry) {
+            var iso = entry[0];
+            var strikes = entry[1];
+            if (!putStrikes[iso]) {
+                return;
+            }
+            sameExpiry.push(isoToUs(iso) + ': ' + strikes.map(formatStrike).join(', '));
+            strikes.forEach(function (strike) {
+                if (putStrikes[iso].has(strike)) {
+                    overlap.push('$' + formatStrike(strike) + ' ' + isoToUs(iso));
+                }
+            });
+        });
+        if (sameExpiry.length) {
+            children.push(component('P', {
+                children: [component('Strong', {children: 'Calls on put expiries: '}), sameExpiry.join('; ')]
+            }));
+        }
+        if (overlap.length) {
+            children.push(component('P', {
+                children: [component('Strong', {children: 'Call strikes matching a put: '}), overlap.join(', ')]
+            }));
+        }
+        children.push(component('P', {children: callText}));
+        return component('Div', {children: children, style: style});
+    }
+
+    // ReportAggregates.summary in app.py, summed from the per-expiry cells in report.summary
+    function summarize(report, expiryValues) {
+        var aggregates = report.summary;
+        var positions = [];
+        if (!expiryValues || !expiryValues.length) {
+            positions = report.expiry_dates.map(function (value, position) {
+                return position;
+            });
+        } else {
+            var selected = new Set(expiryValues);
+            report.expiry_dates.forEach(function (value, position) {
+                if (selected.has(value)) {
+                    positions.push(position);
+                }
+            });
+        }
+        var n = aggregates.tickers.length;
+        var premium = new Float64Array(n);
+        var weightedItm = new Float64Array(n);
+        var puts = new Float64Array(n);
+        var premiumByExpiry = [];
+        var candidates = [];
+        positions.forEach(function (position) {
+            var cells = aggregates.cells[position];
+            var expiryPremium = 0;
+            cells[0].forEach(function (ticker, j) {
+                premium[ticker] += cells[1][j];
+                weightedItm[ticker] += cells[2][j];
+                puts[ticker] += cells[3][j];
+                expiryPremium += cells[1][j];
+            });
+            premiumByExpiry.push([report.expiry_dates[position], expiryPremium]);
+            candidates = candidates.concat(aggregates.top_rows[position]);
+        });
+
+        var present = [];
+        var totalPremium = 0;
+        var totalWeightedItm = 0;
+        var numPuts = 0;
+        for (var i = 0; i < n; i++) {
+            if (puts[i] > 0) {
+                present.push(i);
+                totalPremium += premium[i];
+                totalWeightedItm += weightedItm[i];
+                numPuts += puts[i];
+            }
+        }
+        var topTickers = present.slice().sort(function (a, b) {
+            return premium[b] - premium[a] || a - b;
+        }).slice(0, aggregates.top_n).map(function (i) {
+            return {
+                ticker: aggregates.tickers[i][0],
+                isEarnings: aggregates.tickers[i][1] === EARNINGS,
+                premium: premium[i],
+                share: totalPremium ? premium[i] / totalPremium : 0,
+                numPuts: puts[i],
+                itmPct: premium[i] ? weightedItm[i] / premium[i] : 0
+            };
+        });
+        var topRows = candidates.sort(function (a, b) {
+            return report.puts.premium[b] - report.puts.premium[a];
+        }).slice(0, aggregates.top_n);
+        return {
+            numPuts: numPuts,
+            numTickers: present.length,
+            totalPremium: totalPremium,
+            itmPct: totalPremium ? totalWeightedItm / totalPremium : 0,
+            topTickers: topTickers,
+            topRows: topRows,
+            premiumByExpiry: premiumByExpiry,
+            premiumByTicker: present.map(function (i) {
+                return [aggregates.tickers[i][0], premium[i]];
+            })
+        };
+    }
+
+    // summary_table in app.py
+    function summaryTable(columns, rows) {
+        return component('Table', {
+            children: [
+                component('Thead', {
+                    children: component('Tr', {
+                        children: columns.map(function (column) {
+                            return component('Th', {children: column, style: {paddingRight: '12px'}});
+                        })
+                    })
+                }),
+                component('Tbody', {
+                    children: rows.map(function (row) {
+                        return component('Tr', {
+                            children: row.map(function (cell) {
+                                return component('Td', {children: cell, style: {paddingRight: '12px'}});
+                            })
+                        });
+                    })
+                })
+            ],
+            style: {fontSize: '13px', width: '100%'}
+        });
+    }
+
+    function bootstrap(type, props) {
+        return {namespace: 'dash_bootstrap_components', type: type, props: props};
+    }
+
+    // ShortInterestTable.group_totals in short_interest.py, over the report's ticker -> group map
+    function groupTotals(report, premiumByTicker, column) {
+        var totals = {};
+        var order = [];
+        premiumByTicker.forEach(function (entry) {
+            var group = (report.ticker_groups[entry[0]] || [])[column] || report.unlisted;
+            if (!Object.prototype.hasOwnProperty.call(totals, group)) {
+                totals[group] = 0;
+                order.push(group);
+            }
+            totals[group] += entry[1];
+        });
+        return order.sort(function (a, b) {
+            return totals[b] - totals[a];
+        }).map(function (group) {
+            return [group, totals[group]];
+        });
+    }
+
+    // render_summary in app.py
+    function summaryPanel(report, expiryValues) {
+        var summary = summarize(report, expiryValues);
+        if (!summary.numPuts) {
+            return component('P', {children: 'No puts for the selected expiry dates.', style: {color: 'gray'}});
+        }
+        var topShare = 0;
+        summary.topTickers.forEach(function (t) {
+            topShare += t.share;
+        });
+        var figures = component('P', {
+            children: [
+                component('Strong', {children: 'Puts: '}), groupThousands(String(summary.numPuts)) + ' | ',
+                component('Strong', {children: 'Tickers: '}), groupThousands(String(summary.numTickers)) + ' | ',
+                component('Strong', {children: 'Total Premium: '}), formatCurrency(summary.totalPremium) + ' | ',
+                component('Strong', {children: 'Premium-weighted ITM: '}), toFixed1(summary.itmPct) + '% of strike | ',
+                component('Strong', {children: 'Top ' + summary.topTickers.length + " tickers' share: "}),
+                percent1(topShare)
+            ]
+        });
+        var byExpiry = {
+            namespace: 'dash_core_components',
+            type: 'Graph',
+            props: {
+                figure: {
+                    data: [{
+                        x: summary.premiumByExpiry.map(function (entry) {
+                            return entry[0];
+                        }),
+                        y: summary.premiumByExpiry.map(function (entry) {
+                            return entry[1];
+                        }),
+                        type: 'bar',
+                        name: 'Premium'
+                    }],
+                    layout: {title: 'Put premium by expiry', yaxis: {tickprefix: '$'},
+                        margin: {l: 60, r: 20, t: 40, b: 60}}
+                },
+                style: {height: '300px'}
+            }
+        };
+        var puts = report.puts;
+        var label = function (ticker, isEarnings) {
+            return isEarnings ? ticker + ' (E)' : ticker;
+        };
+        var topTickers = summaryTable(['Ticker', 'Puts', 'Premium', 'Share', 'ITM %'],
+            summary.topTickers.map(function (t) {
+                return [label(t.ticker, t.isEarnings), t.numPuts, formatCurrency(t.premium), percent1(t.share),
+                    toFixed1(t.itmPct) + '%'];
+            }));
+        var topPuts = summaryTable(['Ticker', 'Strike', 'Premium', 'ITM %', 'Expires'],
+            summary.topRows.map(function (i) {
+                var itmPct = puts.strike[i] > 0 ? puts.itm_by[i] * 100 / puts.strike[i] : 0;
+                return [label(puts.ticker_names[puts.ticker[i]], puts.is_earnings[i] === EARNINGS),
+                    '$' + withCommas2(puts.strike[i]), formatCurrency(puts.premium[i]), toFixed1(itmPct) + '%',
+                    puts.expiry_labels[puts.expiry[i]]];
+            }));
+        var byGroup = [['sector', 0], ['market cap', 1]].map(function (group) {
+            var title = group[0];
+            return bootstrap('Col', {
+                children: [
+                    component('H6', {children: 'Premium by ' + title}),
+                    summaryTable([title.charAt(0).toUpperCase() + title.slice(1), 'Premium', 'Share'],
+                        groupTotals(report, summary.premiumByTicker, group[1]).map(function (entry) {
+                            return [entry[0], formatCurrency(entry[1]), percent1(entry[1] / summary.totalPremium)];
+                        }))
+                ],
+                width: 4
+            });
+        });
+        // Calls bought for the selected expiries, counted across every ticker of the report
+        var callsByExpiry = summaryTable(['Expires', 'Tickers', 'Call strikes'],
+            summary.premiumByExpiry.filter(function (entry) {
+                return report.call_counts.hasOwnProperty(entry[0]);
+            }).map(function (entry) {
+                return [entry[0]].concat(report.call_counts[entry[0]]);
+            }));
+        byGroup.push(bootstrap('Col', {
+            children: [component('H6', {children: 'Calls by expiry'}), callsByExpiry],
+            width: 4
+        }));
+        return [
+            figures,
+            bootstrap('Row', {
+                children: [
+                    bootstrap('Col', {children: byExpiry, width: 6}),
+                    bootstrap('Col', {children: [component('H6', {children: 'Top tickers by premium'}), topTickers],
+                        width: 3}),
+                    bootstrap('Col', {children: [component('H6', {children: 'Top puts by premium'}), topPuts],
+                        width: 3})
+                ]
+            }),
+            bootstrap('Row', {children: byGroup, style: {marginTop: '10px'}})
+        ].concat(report.summary_header);
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        itm: {
+            updateExpiryOptions: function (report, selectAllExpiry, clearAllExpiry, expiryRange,
+                                           selectedExpiryDates) {
+                if (!report) {
+                    return [noUpdate(), noUpdate(), noUpdate(), noUpdate(), noUpdate()];
+                }
+                if (!report.key) {
+                    return [report.status, [], [], [], null];
+                }
+                var triggered = triggeredId();
+                if (triggered === 'select-all-expiry') {
+                    return [noUpdate(), noUpdate(), report.expiry_dates, noUpdate(), null];
+                }
+                if (triggered === 'clear-all-expiry') {
+                    return [noUpdate(), noUpdate(), [], noUpdate(), null];
+                }
+                if (triggered === 'expiry-range') {
+                    if (!expiryRange) {
+                        return [noUpdate(), noUpdate(), noUpdate(), noUpdate(), noUpdate()];
+                    }
+                    var range = report.expiry_ranges.filter(function (r) {
+                        return r.value === expiryRange;
+                    })[0];
+                    return [noUpdate(), noUpdate(), range ? range.dates : [], noUpdate(), noUpdate()];
+                }
+                var available = new Set(report.expiry_dates);
+                var expiryValues = (selectedExpiryDates || []).filter(function (expDate) {
+                    return available.has(expDate);
+                });
+                var rangeOptions = report.expiry_ranges.map(function (r) {
+                    return {label: r.label, value: r.value};
+                });
+                return [report.status, report.expiry_options, expiryValues, rangeOptions, null];
+            },
+
+            updateTickerOptions: function (report, expiryValues, selectNormal, selectEarnings, clearAll,
+                                           groupValues, selectedTickers) {
+                if (!report) {
+                    return [noUpdate(), noUpdate()];
+                }
+                if (!report.key) {
+                    return [[], []];
+                }
+                var summaries = filtered(report, expiryValues).tickers;
+                if (groupValues && groupValues.length) {
+                    summaries = inGroups(report, summaries, groupValues);
+                }
+                var options = tickerOptions(report, summaries);
+                var triggered = triggeredId();
+                var values = function (opts) {
+                    return opts.map(function (opt) {
+                        return opt.value;
+                    });
+                };
+                if (triggered === 'select-normal') {
+                    return [noUpdate(), values(options[NORMAL])];
+                }
+                if (triggered === 'select-earnings') {
+                    return [noUpdate(), values(options[EARNINGS])];
+                }
+                if (triggered === 'clear-all') {
+                    return [noUpdate(), []];
+                }
+                var allOptions = options[NORMAL].concat(options[EARNINGS]);
+                var available = new Set(values(allOptions));
+                var current = selectedTickers || [];
+                var tickerValues = current.filter(function (tk) {
+                    return available.has(tk);
+                });
+                return [allOptions, tickerValues.length === current.length ? noUpdate() : tickerValues];
+            },
+
+            updateDetailPanes: function (tickerValues, expiryValues, report, sortBy, loadMoreClicks) {
+                if (!report) {
+                    return [noUpdate(), noUpdate(), noUpdate(), noUpdate()];
+                }
+                if (!report.key) {
+                    return ['', '', '', {display: 'none'}];
+                }
+                // Same window as ticker_window in app.py
+                var values = tickerValues || [];
+                var limit = report.ticker_page_size * (1 + (loadMoreClicks || 0));
+                var hidden = values.length - limit;
+                var moreLabel = '';
+                var moreStyle = {display: 'none'};
+                if (hidden > 0) {
+                    values = values.slice(0, limit);
+                    moreLabel = 'Show ' + Math.min(hidden, report.ticker_page_size) + ' more of ' + hidden +
+                        ' hidden tickers';
+                    moreStyle = {};
+                }
+
+                var view = filtered(report, expiryValues);
+                var putChildren = [];
+                var callChildren = [];
+                values.forEach(function (tickerValue) {
+                    var kind = tickerValue.indexOf('earnings_') === 0 ? EARNINGS : NORMAL;
+                    var ticker = kind === EARNINGS ? tickerValue.replace('earnings_', '') : tickerValue;
+                    var rows = view.rows[kind][ticker];
+                    if (!rows) {
+                        return;
+                    }
+                    var summary = view.tickers[kind][ticker];
+                    putChildren.push(putBlock(report, tickerValue, ticker, summary, rows, kind, sortBy));
+                    if (Object.prototype.hasOwnProperty.call(report.calls[kind], ticker)) {
+                        callChildren.push(callBlock(report, ticker, summary, report.calls[kind][ticker], kind, rows));
+                    }
+                });
+                return [putChildren, callChildren, moreLabel, moreStyle];
+            },
+
+            updateSummary: function (report, expiryValues) {
+                if (!report) {
+                    return noUpdate();
+                }
+                if (!report.key) {
+                    return component('P', {children: 'Upload a report to see its summary.', style: {color: 'gray'}});
+                }
+                return summaryPanel(report, expiryValues);
+            },
+
+            loadMorePuts: function (nClicks, report, expiryValues, sortBy) {
+                if (!report || !report.key || !nClicks) {
+                    return [noUpdate(), noUpdate(), noUpdate()];
+                }
+                var tickerValue = window.dash_clientside.callback_context.inputs_list[0].id.index;
+                var kind = tickerValue.indexOf('earnings_') === 0 ? EARNINGS : NORMAL;
+                var ticker = kind === EARNINGS ? tickerValue.replace('earnings_', '') : tickerValue;
+                var rows = sortRows(report, filtered(report, expiryValues).rows[kind][ticker] || [], sortBy);
+                // No Patch on the client: re-render every page shown so far
+                var shown = (nClicks + 1) * report.put_page_size;
+                var remaining = rows.length - shown;
+                return [
+                    putRows(report, rows.slice(0, shown), kind),
+                    remaining > 0 ? loadMoreLabel(report, remaining) : '',
+                    remaining > 0 ? noUpdate() : {display: 'none'}
+                ];
+            }
+        }
+    });
+})();
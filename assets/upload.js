@@ -0,0 +1,50 @@
+// The "Stream a large report" button opens a file picker and sends the chosen file to /upload-report
+// as the raw request body, so large files skip dcc.Upload's base64 data URL. The returned key is put
+// in the URL, which store_uploaded_report turns into the report-key store.
+(function () {
+    function showStatus(text) {
+        var status = document.getElementById('stream-report-status');
+        if (status) {
+            status.textContent = text;
+        }
+    }
+
+    function streamReport(file) {
+        showStatus(' Uploading ' + file.name + '...');
+        fetch('upload-report?filename=' + encodeURIComponent(file.name), {
+            method: 'POST',
+            headers: {'Content-Type': 'application/octet-stream'},
+            body: file
+        }).then(function (response) {
+            return response.json().then(function (body) {
+                if (!response.ok) {
+                    throw new Error(body.error || response.statusText);
+                }
+                return body;
+            });
+        }).then(function (body) {
+            showStatus('');
+            // The same event dcc.Link sends, so dcc.Location picks up the new search string
+            window.history.pushState({}, '', '?report=' + body.key + '&filename=' + encodeURIComponent(body.filename));
+            window.dispatchEvent(new CustomEvent('_dashprivate_pushstate'));
+        }).catch(function (error) {
+            showStatus(' ' + error.message);
+        });
+    }
+
+    // Delegated, since Dash renders the button after this script runs
+    document.addEventListener('click', function (event) {
+        if (!event.target.closest || !event.target.closest('#stream-report')) {
+            return;
+        }
+        var picker = document.createElement('input');
+        picker.type = 'file';
+        picker.accept = '.txt';
+        picker.addEventListener('change', function () {
+            if (picker.files.length) {
+                streamReport(picker.files[0]);
+            }
+        });
+        picker.click();
+    });
+})();
@@ -0,0 +1,165 @@
+"""Latency of filter clicks on gunicorn sync workers while other users upload large reports.
+
+A clicker toggles the expiry selection (the ticker-options callback) as fast as it is answered, first on an
+idle server and then while uploader threads keep sending fresh reports through dcc.Upload. In 'request' mode
+the upload callback parses in the worker that received it; in 'background' mode (ITM_BACKGROUND_DIR) it hands
+the file to a background job and the uploader polls for the result like the browser does.
+Needs dash[diskcache]. Run from the repository root:
+    python benchmarks/bench_click_latency.py [--workers 2] [--uploaders 2] [--seconds 20]
+"""
+import argparse
+import base64
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+from dash_requests import callback_request, expiry_request
+from synthetic_report import generate_report
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PORT = 8766
+
+MODES = {
+    'request': {},
+    'background': {'ITM_BACKGROUND_DIR': 'background'},
+}
+
+
+def click_request(dependencies, expiry_values):
+    return callback_request(dependencies, 'tickers.options', {'expiry-dates.value': expiry_values, 'tickers.value': []},
+                            ['expiry-dates.value'])
+
+
+def upload_request(output, contents):
+    """dcc.Upload's request to whichever callback takes it: store_uploaded_report or the background job"""
+    inputs = [{'id': 'upload-data', 'property': 'contents', 'value': contents}]
+    if output.startswith('..'):
+        outputs = [{'id': 'report-key', 'property': 'data'}, {'id': 'upload-data', 'property': 'contents'}]
+        inputs.append({'id': 'url', 'property': 'search', 'value': ''})
+    else:
+        outputs = {'id': 'report-key', 'property': 'data'}
+    return {
+        'output': output,
+        'outputs': outputs,
+        'inputs': inputs,
+        'state': [{'id': 'upload-data', 'property': 'filename', 'value': 'report.txt'}],
+        'changedPropIds': ['upload-data.contents'],
+    }
+
+
+def post(path, body):
+    request = urllib.request.Request(f"http://127.0.0.1:{PORT}{path}", data=json.dumps(body).encode(),
+                                     headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=300) as response:
+        return json.loads(response.read() or b'null')
+
+
+def upload(output, contents):
+    """One upload as the browser sends it; background jobs are polled until they answer"""
+    body = upload_request(output, contents)
+    response = post('/_dash-update-component', body)
+    if 'cacheKey' not in response:
+        return
+    poll = f"/_dash-update-component?cacheKey={response['cacheKey']}&job={response['job']}"
+    while 'response' not in response:
+        time.sleep(0.5)
+        response = post(poll, body)
+
+
+def clicks(dependencies, expiry_values, seconds):
+    """Latencies of ticker-option callbacks sent back to back for seconds, alternating two expiry selections"""
+    requests = [click_request(dependencies, expiry_values),
+                click_request(dependencies, expiry_values[:len(expiry_values) // 2])]
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        post('/_dash-update-component', requests[len(latencies) % 2])
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def percentiles(latencies):
+    ordered = sorted(latencies)
+    return {'clicks': len(ordered), 'p50_ms': statistics.median(ordered) * 1000,
+            'p99_ms': ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000, 'max_ms': ordered[-1] * 1000}
+
+
+def measure(mode, args, work_dir, report_text):
+    env = dict(os.environ, PYTHONPATH=REPO_DIR, ITM_RELOAD_INTERVAL='0', ITM_WARM_UP='0',
+               ITM_UPLOAD_DIR=os.path.join(work_dir, f"uploads-{mode}"))
+    env.update({name: os.path.join(work_dir, f"{value}-{mode}") for name, value in MODES[mode].items()})
+    env.pop('ITM_PRELOAD', None)
+    command = [sys.executable, '-m', 'gunicorn', '-w', str(args.workers), '-b', f"127.0.0.1:{PORT}",
+               '--chdir', work_dir, '--timeout', '300', 'app:server']
+    # Started from work_dir so gunicorn doesn't pick up the repository's gunicorn.conf.py by default
+    proc = subprocess.Popen(command, env=env, cwd=work_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        for _ in range(600):
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{PORT}/status", timeout=1)
+                break
+            except OSError:
+                time.sleep(0.2)
+        with urllib.request.urlopen(f"http://127.0.0.1:{PORT}/_dash-dependencies") as response:
+            dependencies = json.loads(response.read())
+        output = next(d['output'] for d in dependencies
+                      if any(i['id'] == 'upload-data' and i['property'] == 'contents' for i in d['inputs']))
+        expiry = post('/_dash-update-component', expiry_request(dependencies))['response']
+        expiry_values = [option['value'] for option in expiry['expiry-dates']['options']]
+        clicks(dependencies, expiry_values, 2)
+        idle = clicks(dependencies, expiry_values, args.seconds)
+
+        stop = threading.Event()
+        uploaded = []
+
+        def keep_uploading(uploader):
+            # A trailing line makes every upload a report the server hasn't parsed yet
+            while not stop.is_set():
+                text = f"{report_text}\n{mode} {uploader} {len(uploaded)} {time.time()}\n"
+                upload(output, 'data:text/plain;base64,' + base64.b64encode(text.encode()).decode())
+                uploaded.append(uploader)
+        threads = [threading.Thread(target=keep_uploading, args=(i,)) for i in range(args.uploaders)]
+        for thread in threads:
+            thread.start()
+        busy = clicks(dependencies, expiry_values, args.seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        return percentiles(idle), percentiles(busy), len(uploaded)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=2, help="gunicorn sync workers")
+    parser.add_argument('--uploaders', type=int, default=2, help="concurrent upload loops during the busy phase")
+    parser.add_argument('--seconds', type=float, default=20, help="length of the idle and busy phases")
+    parser.add_argument('--scale', type=int, default=500, help="tickers in each uploaded report")
+    args = parser.parse_args()
+
+    report_text = generate_report(n_tickers=args.scale, puts_per_ticker=50, n_expiries=40)
+    with tempfile.TemporaryDirectory() as work_dir:
+        with open(os.path.join(work_dir, 'ITM_Analysis_Summary.txt'), 'w') as f:
+            f.write(generate_report(n_tickers=300, puts_per_ticker=20, n_expiries=40))
+        shutil.copy(os.path.join(REPO_DIR, 'finviz_short.csv'), work_dir)
+        print(f"{len(report_text) / 2 ** 20:.1f} MB uploads, {args.workers} worker(s), {args.uploaders} uploader(s)")
+        print(f"{'mode':<11} {'phase':<6} {'clicks':>6} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'uploads':>7}")
+        for mode in MODES:
+            idle, busy, uploads = measure(mode, args, work_dir, report_text)
+            for phase, m, count in (('idle', idle, ''), ('busy', busy, uploads)):
+                print(f"{mode:<11} {phase:<6} {m['clicks']:>6} {m['p50_ms']:>8.1f} {m['p99_ms']:>8.1f} "
+                      f"{m['max_ms']:>8.1f} {count:>7}")
+
+
+if __name__ == '__main__':
+    main()
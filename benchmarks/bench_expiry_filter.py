@@ -0,0 +1,54 @@
+"""Compare the dashboard's expiry filter (ParsedReport.filtered) with the dict reference on a synthetic 100k-put report.
+
+Run from the repository root:  python benchmarks/bench_expiry_filter.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+from dict_filters import filter_by_expiry_dates, recalculate_ticker_data_for_filtered_puts  # noqa: E402
+from synthetic_report import generate_report  # noqa: E402
+
+
+def best_of(func, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def dict_path(report, labels):
+    puts = filter_by_expiry_dates(report.puts_data, labels)
+    earnings_puts = filter_by_expiry_dates(report.earnings_puts_data, labels)
+    return (recalculate_ticker_data_for_filtered_puts(report.tickers_data, puts),
+            recalculate_ticker_data_for_filtered_puts(report.earnings_tickers_data, earnings_puts))
+
+
+def frame_path(report, values):
+    _, tickers_data, earnings_tickers_data = report.filtered(values)
+    return tickers_data, earnings_tickers_data
+
+
+def main():
+    # No memoized views, so every call filters and re-aggregates like a new selection does
+    app.FILTERED_VIEWS_PER_REPORT = 0
+    report = app.parse_report(generate_report(n_tickers=1000, puts_per_ticker=100, n_expiries=60))
+    print(f"{len(report.puts_frame):,} puts, {len(report.expiry_dates)} expiry dates")
+
+    for n_selected in (1, 10, 30, 60):
+        values = report.expiry_dates[:n_selected]
+        labels = report.expiry_index.labels(values)
+        dict_time, dict_result = best_of(lambda: dict_path(report, labels))
+        frame_time, frame_result = best_of(lambda: frame_path(report, values))
+        assert dict_result == frame_result, "columnar results differ from the dict implementation"
+        print(f"{n_selected:>3} dates selected: dicts {dict_time * 1000:8.1f} ms | "
+              f"columnar {frame_time * 1000:7.1f} ms | {dict_time / frame_time:5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""Timings and peak memory of each dashboard stage at 1x, 10x and 100x the sample report (pytest-benchmark).
+
+    pip install -r benchmarks/requirements.txt
+    pytest benchmarks/bench_pipeline.py --benchmark-storage=benchmarks/.benchmarks \
+        --benchmark-compare=0001 --benchmark-compare-fail=median:25%
+
+See README.md for saving a new baseline.
+"""
+from datetime import timedelta
+
+import app
+
+
+# Parsing
+
+def test_parse_itm_content(benchmark, record_peak_memory, report_text):
+    record_peak_memory(app.parse_itm_content, report_text)
+    benchmark(app.parse_itm_content, report_text)
+
+
+def test_parse_report(benchmark, record_peak_memory, report_text):
+    """parse_itm_content plus the puts frame and call index the callbacks use"""
+    record_peak_memory(app.parse_report, report_text)
+    benchmark(app.parse_report, report_text)
+
+
+# Expiry filtering
+
+def test_expiry_rows(benchmark, record_peak_memory, report, half_expiries):
+    """Puts frame positions of every other expiry, from the expiry index"""
+    record_peak_memory(report.expiry_index.rows, half_expiries)
+    benchmark(report.expiry_index.rows, half_expiries)
+
+
+def test_filtered_view(benchmark, record_peak_memory, monkeypatch, report, half_expiries):
+    """ParsedReport.filtered on a selection it hasn't memoized: gather the rows and re-aggregate the tickers"""
+    monkeypatch.setattr(app, 'FILTERED_VIEWS_PER_REPORT', 0)
+    record_peak_memory(report.filtered, half_expiries)
+    benchmark(report.filtered, half_expiries)
+
+
+def test_expiry_range_rows(benchmark, record_peak_memory, report):
+    """Next-30-days selection: bisect the expiry index, then gather its rows"""
+    def select_range():
+        return report.expiry_index.rows(report.expiry_index.between(report.as_of, report.as_of + timedelta(days=30)))
+    record_peak_memory(select_range)
+    benchmark(select_range)
+
+
+def test_summary_aggregates(benchmark, record_peak_memory, report, half_expiries):
+    """Summary panel figures for every other expiry, summed from the per-expiry partial sums"""
+    record_peak_memory(report.aggregates.summary, half_expiries)
+    benchmark(report.aggregates.summary, half_expiries)
+
+
+# Report comparison
+
+def test_report_diff(benchmark, record_peak_memory, report, next_report):
+    """Join of two reports on (ticker, strike, expiration) with the counts and tables of the diff panel"""
+    record_peak_memory(app.ReportDiff, report.puts_frame, next_report.puts_frame)
+    benchmark(app.ReportDiff, report.puts_frame, next_report.puts_frame)
+
+
+# Component building
+
+def test_build_ticker_options(benchmark, record_peak_memory, report):
+    record_peak_memory(app.build_ticker_options, report.tickers_data, report.earnings_tickers_data)
+    benchmark(app.build_ticker_options, report.tickers_data, report.earnings_tickers_data)
+
+
+def test_tickers_in_groups(benchmark, record_peak_memory, report):
+    """Sector and market-cap filter: one reindex of the short interest table over every ticker in the report"""
+    tickers = sorted(set(report.tickers_data) | set(report.earnings_tickers_data))
+    group_values = ['sector:Technology', 'sector:Healthcare', 'cap:Small', 'cap:Mid']
+    record_peak_memory(app.tickers_in_groups, tickers, group_values)
+    benchmark(app.tickers_in_groups, tickers, group_values)
+
+
+def test_render_detail_blocks(benchmark, record_peak_memory, report, half_expiries):
+    """Put and call blocks for every ticker, as on the first page with select-all"""
+    ticker_values = list(report.tickers_data) + [f"earnings_{tk}" for tk in report.earnings_tickers_data]
+    record_peak_memory(app.render_detail_blocks, report, half_expiries, ticker_values, 'premium')
+    benchmark(app.render_detail_blocks, report, half_expiries, ticker_values, 'premium')
+
+
+def test_render_detail_blocks_cached(benchmark, record_peak_memory, report, half_expiries):
+    """Same selection again with a report key: every block comes from the fragment cache"""
+    ticker_values = list(report.tickers_data) + [f"earnings_{tk}" for tk in report.earnings_tickers_data]
+    args = (report, half_expiries, ticker_values, 'premium', 'bench')
+    app.render_detail_blocks(*args)
+    record_peak_memory(app.render_detail_blocks, *args)
+    benchmark(app.render_detail_blocks, *args)
+
+
+# Full callbacks through Flask
+
+def test_callbacks_end_to_end(benchmark, record_peak_memory, dash_client, report_text):
+    """Upload is parsed once (cached); then the expiry, ticker and detail-pane callbacks as the browser chains them"""
+    report_key = dash_client.upload(report_text)
+
+    def select_everything():
+        expiry = dash_client.call(
+            'upload-status',
+            [('report-key', 'data', report_key), ('select-all-expiry', 'n_clicks', 1),
+             ('clear-all-expiry', 'n_clicks', None), ('expiry-range', 'value', None)],
+            [('expiry-dates', 'value', [])], ['select-all-expiry.n_clicks'])
+        expiry_values = expiry['expiry-dates']['value']
+        tickers = dash_client.call(
+            'tickers',
+            [('report-key', 'data', report_key), ('expiry-dates', 'value', expiry_values),
+             ('select-normal', 'n_clicks', 1), ('select-earnings', 'n_clicks', None), ('clear-all', 'n_clicks', None),
+             ('ticker-group', 'value', None)],
+            [('tickers', 'value', [])], ['select-normal.n_clicks'])
+        return dash_client.call(
+            'put-breakdown-div',
+            [('tickers', 'value', tickers['tickers']['value']), ('expiry-dates', 'value', expiry_values),
+             ('report-key', 'data', report_key), ('put-sort', 'value', 'report'),
+             ('load-more-tickers', 'n_clicks', None)],
+            [('detail-panes-state', 'data', None)], ['tickers.value'])
+
+    record_peak_memory(select_everything)
+    benchmark(select_everything)
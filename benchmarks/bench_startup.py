@@ -0,0 +1,99 @@
+"""Cold start of a fresh interpreter: time to import app, then to serve the first page and the first callback.
+
+Each run is a new Python process started in a scratch directory holding a synthetic default report, so nothing
+is cached in memory. 'snapshot' publishes the report with report_batch.py first, as a deployment would.
+Run from the repository root:
+    python benchmarks/bench_startup.py [--runs N] [--save FILE] [--compare FILE]
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from synthetic_report import generate_report
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+
+# Runs in the child: prints the timings of one cold start as JSON. The first callback is sent right after the
+# first page, sooner than a browser would, so it also waits for whatever the warm-up thread hasn't loaded yet
+CHILD = """
+import json, sys, time
+from dash_requests import expiry_request
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+client = app.server.test_client()
+for path in ('/', '/_dash-layout', '/_dash-dependencies'):
+    response = client.get(path)
+    assert response.status_code == 200
+page = time.perf_counter()
+response = client.post('/_dash-update-component', json=expiry_request(response.get_json()))
+assert response.status_code == 200, response.data[:500]
+callback = time.perf_counter()
+sys.stdout.write('RESULT ' + json.dumps({'import_s': imported - started, 'first_page_s': page - imported,
+                                         'first_callback_s': callback - page, 'total_s': callback - started}) + '\\n')
+"""
+
+TIMINGS = ('import_s', 'first_page_s', 'first_callback_s', 'total_s')
+
+
+def cold_start(work_dir, env):
+    output = subprocess.run([sys.executable, '-c', CHILD], cwd=work_dir, env=env,
+                            check=True, capture_output=True, text=True).stdout
+    # The app's own log lines, some from the warm-up thread, share stdout
+    line = next(line for line in output.splitlines() if 'RESULT ' in line)
+    return json.loads(line[line.index('RESULT ') + len('RESULT '):])
+
+
+def measure(mode, runs, work_dir):
+    snapshot_dir = os.path.join(work_dir, f"snapshots-{mode}")
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([REPO_DIR, BENCH_DIR]), ITM_RELOAD_INTERVAL='0',
+               ITM_UPLOAD_DIR=os.path.join(work_dir, 'uploads'),
+               ITM_SNAPSHOT_DIR=snapshot_dir if mode == 'snapshot' else '')
+    env.pop('ITM_PRELOAD', None)
+    if mode == 'snapshot':
+        subprocess.run([sys.executable, os.path.join(REPO_DIR, 'report_batch.py'), '--snapshot-dir', snapshot_dir,
+                        os.path.join(work_dir, 'ITM_Analysis_Summary.txt')], env=env, check=True,
+                       stdout=subprocess.DEVNULL)
+    results = [cold_start(work_dir, env) for _ in range(runs)]
+    return {name: statistics.median(result[name] for result in results) for name in TIMINGS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help="cold starts per mode; medians are reported")
+    parser.add_argument('--save', help="write the results as JSON")
+    parser.add_argument('--compare', help="JSON from an earlier --save to show the change against")
+    args = parser.parse_args()
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        with open(os.path.join(work_dir, 'ITM_Analysis_Summary.txt'), 'w') as f:
+            f.write(generate_report(n_tickers=300, puts_per_ticker=50, n_expiries=30))
+        shutil.copy(os.path.join(REPO_DIR, 'finviz_short.csv'), work_dir)
+        print(f"{'mode':<10} {'import s':>9} {'page s':>9} {'callback s':>10} {'total s':>9}  (median of {args.runs})")
+        for mode in ('plain', 'snapshot'):
+            results[mode] = m = measure(mode, args.runs, work_dir)
+            print(f"{mode:<10} {m['import_s']:>9.3f} {m['first_page_s']:>9.3f} {m['first_callback_s']:>10.3f} "
+                  f"{m['total_s']:>9.3f}")
+            if baseline and mode in baseline:
+                print(f"{'  change':<10} " + " ".join(
+                    f"{(m[name] - baseline[mode][name]) / baseline[mode][name]:>+{width}.0%}"
+                    for name, width in zip(TIMINGS, (9, 9, 10, 9))))
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Per-worker memory of gunicorn workers serving a large synthetic report, with and without preload/snapshots.
+
+Linux only (reads /proc/<pid>/smaps_rollup). Run from the repository root:
+    python benchmarks/bench_worker_memory.py [workers ...]
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from dash_requests import expiry_request
+from synthetic_report import generate_report
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PORT = 8765
+
+MODES = {
+    'plain': (['app:server'], {'ITM_SNAPSHOT_DIR': ''}),
+    'snapshot': (['app:server'], {}),
+    'preload+snapshot': (['-c', os.path.join(REPO_DIR, 'gunicorn.conf.py'), 'app:server'], {}),
+}
+
+
+def smaps_kb(pid):
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                values[parts[0].rstrip(':')] = int(parts[1])
+    return values
+
+
+def worker_pids(master_pid):
+    with open(f"/proc/{master_pid}/task/{master_pid}/children") as f:
+        return [int(pid) for pid in f.read().split()]
+
+
+def post(path, body):
+    request = urllib.request.Request(f"http://127.0.0.1:{PORT}{path}", data=json.dumps(body).encode(),
+                                     headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=120) as response:
+        return response.read()
+
+
+def measure(mode, workers, work_dir):
+    args, env = MODES[mode]
+    env = dict(os.environ, PYTHONPATH=REPO_DIR, ITM_RELOAD_INTERVAL='0',
+               ITM_UPLOAD_DIR=os.path.join(work_dir, f"uploads-{mode}-{workers}"), **env)
+    command = [sys.executable, '-m', 'gunicorn', '-w', str(workers), '-b', f"127.0.0.1:{PORT}",
+               '--chdir', work_dir, '--timeout', '300', *args]
+    # Started from work_dir so gunicorn doesn't pick up the repository's gunicorn.conf.py by default
+    proc = subprocess.Popen(command, env=env, cwd=work_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        for _ in range(600):
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{PORT}/status", timeout=1)
+                break
+            except OSError:
+                time.sleep(0.2)
+        with urllib.request.urlopen(f"http://127.0.0.1:{PORT}/_dash-dependencies") as response:
+            request = expiry_request(json.loads(response.read()))
+        # Enough concurrent requests that every worker loads the report
+        with ThreadPoolExecutor(workers * 4) as pool:
+            list(pool.map(lambda _: post('/_dash-update-component', request), range(workers * 12)))
+        pids = worker_pids(proc.pid)
+        stats = [smaps_kb(pid) for pid in pids]
+        return {
+            'rss_mb': sum(s['Rss'] for s in stats) / len(stats) / 1024,
+            'pss_mb': sum(s['Pss'] for s in stats) / len(stats) / 1024,
+            'private_mb': sum(s['Private_Clean'] + s['Private_Dirty'] for s in stats) / len(stats) / 1024,
+        }
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    worker_counts = [int(n) for n in sys.argv[1:]] or [1, 2, 4]
+    with tempfile.TemporaryDirectory() as work_dir:
+        with open(os.path.join(work_dir, 'ITM_Analysis_Summary.txt'), 'w') as f:
+            f.write(generate_report(n_tickers=1000, puts_per_ticker=100, n_expiries=60))
+        shutil.copy(os.path.join(REPO_DIR, 'finviz_short.csv'), work_dir)
+        print(f"{'mode':<18} {'workers':>7} {'RSS MB':>8} {'PSS MB':>8} {'private MB':>10}  (per worker)")
+        for mode in MODES:
+            for workers in worker_counts:
+                m = measure(mode, workers, work_dir)
+                print(f"{mode:<18} {workers:>7} {m['rss_mb']:>8.1f} {m['pss_mb']:>8.1f} {m['private_mb']:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
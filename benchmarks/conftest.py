@@ -0,0 +1,106 @@
+"""Fixtures for the pytest-benchmark suite in bench_pipeline.py"""
+import base64
+import os
+import sys
+import tempfile
+import tracemalloc
+
+import pytest
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+
+# Keep app.py off shared state: no reload or warm-up thread, no snapshots, uploads in a scratch directory
+os.environ['ITM_RELOAD_INTERVAL'] = '0'
+os.environ['ITM_WARM_UP'] = '0'
+os.environ['ITM_SNAPSHOT_DIR'] = ''
+os.environ['ITM_UPLOAD_DIR'] = os.path.join(tempfile.gettempdir(), 'itm-dashboard-bench-uploads')
+os.environ.pop('ITM_HISTORY_DB', None)
+os.environ.pop('ITM_CLIENTSIDE_FILTERING', None)
+
+import app  # noqa: E402
+from synthetic_report import next_day_report, scaled_report  # noqa: E402
+
+# Multiples of the sample report's size
+SCALES = (1, 10, 100)
+
+_reports = {}
+
+
+@pytest.fixture(params=SCALES, ids=lambda scale: f"{scale}x", scope='session')
+def scale(request):
+    return request.param
+
+
+@pytest.fixture(scope='session')
+def report_text(scale):
+    if scale not in _reports:
+        _reports[scale] = scaled_report(scale)
+    return _reports[scale]
+
+
+@pytest.fixture(scope='session')
+def parsed(report_text):
+    return app.parse_itm_content(report_text)
+
+
+@pytest.fixture(scope='session')
+def report(report_text):
+    return app.parse_report(report_text)
+
+
+@pytest.fixture(scope='session')
+def next_report(report_text):
+    """The same report a day later, with some puts gone and some repriced"""
+    return app.parse_report(next_day_report(report_text))
+
+
+@pytest.fixture(scope='session')
+def half_expiries(report):
+    """Every other expiry date, the kind of selection a user filters down to"""
+    return report.expiry_dates[::2]
+
+
+@pytest.fixture
+def record_peak_memory(benchmark):
+    """Run func once under tracemalloc and attach its peak allocation (MB) to the benchmark's extra_info"""
+    def record(func, *args):
+        tracemalloc.start()
+        try:
+            func(*args)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        benchmark.extra_info['peak_mb'] = round(peak / 2 ** 20, 3)
+    return record
+
+
+class DashClient:
+    """Posts callback requests to /_dash-update-component the way the browser does"""
+
+    def __init__(self):
+        self.client = app.server.test_client()
+        self.dependencies = self.client.get('/_dash-dependencies').get_json()
+
+    def upload(self, text):
+        data = "data:text/plain;base64," + base64.b64encode(text.encode('utf-8')).decode('ascii')
+        return {'key': app.store_upload(data, 'bench.txt'), 'filename': 'bench.txt'}
+
+    def call(self, output, inputs, state=(), changed=()):
+        dependency = next(d for d in self.dependencies if d['output'].startswith(f"..{output}."))
+        outputs = [dict(zip(('id', 'property'), out.split('.')))
+                   for out in dependency['output'].strip('.').split('...')]
+        response = self.client.post('/_dash-update-component', json={
+            'output': dependency['output'], 'outputs': outputs,
+            'inputs': [{'id': i, 'property': p, 'value': v} for i, p, v in inputs],
+            'state': [{'id': i, 'property': p, 'value': v} for i, p, v in state],
+            'changedPropIds': list(changed),
+        })
+        assert response.status_code == 200, response.data[:500]
+        return response.get_json()['response']
+
+
+@pytest.fixture(scope='session')
+def dash_client():
+    return DashClient()
@@ -0,0 +1,35 @@
+"""Callback requests for /_dash-update-component, built from the app's /_dash-dependencies like the browser does.
+
+Inputs and state are read from the dependency, so a request stays valid when a callback gains an input.
+"""
+
+
+def callback_request(dependencies, output, values=None, changed=()):
+    """Request for the callback whose first output is output ('upload-status.children').
+
+    values maps 'id.property' to the value sent for that input or state; the rest are sent as None.
+    """
+    values = values or {}
+    dependency = next(d for d in dependencies if d['output'].lstrip('.').startswith(output))
+    if dependency['output'].startswith('..'):
+        outputs = [dict(zip(('id', 'property'), out.split('.')))
+                   for out in dependency['output'].strip('.').split('...')]
+    else:
+        outputs = dict(zip(('id', 'property'), dependency['output'].split('.')))
+
+    def props(items):
+        return [{'id': item['id'], 'property': item['property'],
+                 'value': values.get(f"{item['id']}.{item['property']}")} for item in items]
+    return {
+        'output': dependency['output'],
+        'outputs': outputs,
+        'inputs': props(dependency['inputs']),
+        'state': props(dependency['state']),
+        'changedPropIds': list(changed),
+    }
+
+
+def expiry_request(dependencies, report_key=None):
+    """The expiry-options callback as the page sends it on load, for report_key (the default report when None)"""
+    return callback_request(dependencies, 'upload-status.children',
+                            {'report-key.data': report_key, 'expiry-dates.value': []}, ['report-key.data'])
@@ -0,0 +1,32 @@
+"""The dict-based expiry filter the dashboard ran before the puts frame: bench_expiry_filter.py's reference.
+
+ParsedReport.filtered must give the same tickers_data and earnings_tickers_data as these for the same puts.
+"""
+
+
+def filter_by_expiry_dates(puts_data, selected_expiry_dates):
+    """Filter puts data by selected expiry dates"""
+    if not selected_expiry_dates:
+        return puts_data
+
+    filtered_puts = {}
+    for ticker, ticker_puts in puts_data.items():
+        filtered_ticker_puts = [put for put in ticker_puts if put['expiration'] in selected_expiry_dates]
+        if filtered_ticker_puts:
+            filtered_puts[ticker] = filtered_ticker_puts
+    return filtered_puts
+
+
+def recalculate_ticker_data_for_filtered_puts(tickers_data, filtered_puts_data):
+    """Recalculate ticker summaries based on filtered puts"""
+    filtered_tickers_data = {}
+    for ticker in filtered_puts_data.keys():
+        if ticker in tickers_data:
+            ticker_puts = filtered_puts_data[ticker]
+            total_premium = sum(put['premium'] for put in ticker_puts)
+            filtered_tickers_data[ticker] = {
+                'current_price': tickers_data[ticker]['current_price'],
+                'num_puts': len(ticker_puts),
+                'total_premium': total_premium
+            }
+    return filtered_tickers_data
@@ -0,0 +1,147 @@
+"""Generate ITM_Analysis_Summary-format reports of arbitrary size for benchmarking.
+
+    python benchmarks/synthetic_report.py --scale 10 -o /tmp/ITM_Analysis_Summary.txt
+"""
+import argparse
+import random
+import re
+import string
+from datetime import date, timedelta
+
+
+def _tickers(count, rng):
+    seen = set()
+    while len(seen) < count:
+        seen.add(''.join(rng.choice(string.ascii_uppercase) for _ in range(rng.randint(2, 5))))
+    return sorted(seen)
+
+
+def _expiries(count, rng):
+    """(date, put label) pairs for weekly expiries; the real reports mix both label formats"""
+    start = date(2025, 10, 24)
+    expiries = []
+    for week in range(count):
+        expiry = start + timedelta(weeks=week)
+        if rng.random() < 0.3:
+            expiries.append((expiry, f"{expiry:%Y-%m-%d} 00:00:00"))
+        else:
+            expiries.append((expiry, f"{expiry.month}/{expiry.day}/{expiry.year}"))
+    return expiries
+
+
+def _section(lines, title):
+    lines.append(title)
+    lines.append("=" * len(title))
+
+
+def _write_block(lines, tickers, puts_per_ticker, expiries, rng, max_call_dates, earnings=False):
+    suffix = " with upcoming earnings" if earnings else ""
+    prices = {tk: round(rng.uniform(2, 900), 4) for tk in tickers}
+    puts = {}
+    for tk in tickers:
+        puts[tk] = []
+        for idx in range(1, puts_per_ticker + 1):
+            spot = round(prices[tk] * rng.uniform(0.9, 1.0), 2)
+            strike = float(int(spot) + rng.randint(1, 50))
+            puts[tk].append((idx, strike, spot, strike - spot, rng.randint(200_000, 40_000_000), rng.choice(expiries)[1]))
+
+    _section(lines, f"FINAL QUALIFYING TICKERS WITH CURRENT PRICES{suffix}:")
+    for tk in tickers:
+        total = sum(put[4] for put in puts[tk])
+        lines.append(f"{tk}: Current Price ${prices[tk]}, {len(puts[tk])} ITM puts, Total Premium ${total:,}")
+    lines.append("")
+
+    _section(lines, f"CALL ACTIVITY ANALYSIS{suffix}:")
+    lines.append("")
+    for tk in tickers:
+        lines.append(f"{tk} (Current Price: ${prices[tk]}):")
+        sentences = []
+        for expiry, _ in sorted(rng.sample(expiries, min(len(expiries), rng.randint(1, max_call_dates)))):
+            strikes = sorted({round(prices[tk] * rng.uniform(0.8, 1.4) * 2) / 2 for _ in range(rng.randint(1, 6))})
+            sentences.append(f"Calls of strike {','.join(f'{s:g}' for s in strikes)} were bought for date "
+                             f"{expiry:%m/%d/%Y}")
+        lines.append("  " + ". ".join(sentences))
+        lines.append("")
+
+    _section(lines, f"DETAILED PUT BREAKDOWN BY TICKER{suffix}:")
+    lines.append("")
+    for tk in tickers:
+        lines.append(f"{tk} (Current Price: ${prices[tk]}):")
+        for idx, strike, spot, itm_by, premium, expiry in puts[tk]:
+            lines.append(f"  Put #{idx}: Strike ${strike:.0f}, Spot ${spot:.2f}, ITM by ${itm_by:.2f}, "
+                         f"Premium ${premium:,}, Exp: {expiry}")
+        lines.append("")
+
+
+# Roughly the shape of the bundled ITM_Analysis_Summary.txt (76 tickers, 287 puts); scale multiplies the tickers
+SAMPLE_SHAPE = {'n_tickers': 76, 'puts_per_ticker': 4, 'earnings_share': 0.25, 'n_expiries': 40}
+
+
+def generate_report(n_tickers=58, puts_per_ticker=5, earnings_share=0.25, n_expiries=40, max_call_dates=8, seed=0,
+                    generated="2025-10-22 21:38:40"):
+    """Return report text with n_tickers tickers of puts_per_ticker puts each.
+
+    earnings_share of the tickers go into the "with upcoming earnings" sections, and each ticker's
+    call activity covers between 1 and max_call_dates expiry dates.
+    """
+    rng = random.Random(seed)
+    tickers = _tickers(n_tickers, rng)
+    rng.shuffle(tickers)
+    n_earnings = int(n_tickers * earnings_share)
+    earnings_tickers, normal_tickers = sorted(tickers[:n_earnings]), sorted(tickers[n_earnings:])
+    expiries = _expiries(n_expiries, rng)
+
+    lines = ["ITM PUT ANALYSIS SUMMARY REPORT", f"Generated: {generated}", "=" * 80, ""]
+    _write_block(lines, normal_tickers, puts_per_ticker, expiries, rng, max_call_dates)
+    _write_block(lines, earnings_tickers, puts_per_ticker, expiries, rng, max_call_dates, earnings=True)
+    _section(lines, "ANALYSIS METADATA:")
+    lines.append("- Analysis completed: 2025-10-22 21:38:41")
+    return "\n".join(lines) + "\n"
+
+
+def scaled_report(scale, seed=0, **overrides):
+    """A report scale times the size of the sample report"""
+    shape = dict(SAMPLE_SHAPE, **overrides)
+    shape['n_tickers'] = int(shape['n_tickers'] * scale)
+    return generate_report(seed=seed, **shape)
+
+
+def next_day_report(text, drop_every=7, reprice_every=11):
+    """text as the next day's run might report it: every drop_every-th put gone and every reprice_every-th put's
+    premium 10% higher, for comparing two reports"""
+    lines = []
+    puts = 0
+    for line in text.split('\n'):
+        if line.startswith('  Put #'):
+            puts += 1
+            if puts % drop_every == 0:
+                continue
+            if puts % reprice_every == 0:
+                line = re.sub(r'Premium \$([\d,]*\d)',
+                              lambda m: f"Premium ${int(m.group(1).replace(',', '')) * 11 // 10:,}", line)
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=float, default=1, help="multiple of the sample report's ticker count")
+    parser.add_argument('--puts-per-ticker', type=int, default=SAMPLE_SHAPE['puts_per_ticker'])
+    parser.add_argument('--earnings-share', type=float, default=SAMPLE_SHAPE['earnings_share'])
+    parser.add_argument('--expiries', type=int, default=SAMPLE_SHAPE['n_expiries'])
+    parser.add_argument('--max-call-dates', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', default='-', help="file to write (default: stdout)")
+    args = parser.parse_args()
+    text = scaled_report(args.scale, seed=args.seed, puts_per_ticker=args.puts_per_ticker,
+                         earnings_share=args.earnings_share, n_expiries=args.expiries,
+                         max_call_dates=args.max_call_dates)
+    if args.output == '-':
+        print(text, end='')
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+
+if __name__ == '__main__':
+    main()
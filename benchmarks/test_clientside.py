@@ -0,0 +1,130 @@
+"""assets/clientside.js against the server callbacks on a report full of rounding ties: pytest benchmarks
+
+JavaScript's toFixed rounds exact halves up where Python's format rounds them to even, so the strikes, prices,
+premiums and percentages below sit on ties. Needs node on the PATH.
+"""
+import json
+import os
+import shutil
+import subprocess
+from datetime import date
+
+import plotly.utils
+import pytest
+
+import app
+from dash_requests import callback_request
+
+CLIENTSIDE_JS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'assets', 'clientside.js')
+
+TIES_REPORT = """ITM PUT ANALYSIS SUMMARY REPORT
+Generated: 2025-10-22 21:38:40
+
+ANALYSIS OVERVIEW:
+==================
+- ITM puts meeting all criteria: 6
+- Total premium value of ITM puts: $21,596,928
+
+FINAL QUALIFYING TICKERS WITH CURRENT PRICES:
+==============================================
+AAA: Current Price $0.125, 2 ITM puts, Total Premium $7,750,000
+BBB: Current Price $10.125, 1 ITM puts, Total Premium $1,125
+CCC: Current Price $1,000.5, 1 ITM puts, Total Premium $12,345,678
+
+CALL ACTIVITY ANALYSIS:
+=======================
+
+AAA (Current Price: $0.125):
+  Calls of strike 0.625,1.375 were bought for date 10/24/2025
+BBB (Current Price: $10.125): No calls found
+CCC (Current Price: $1,000.5):
+  Calls of strike 1002.5 were bought for date 12/19/2025
+
+DETAILED PUT BREAKDOWN BY TICKER:
+==================================
+
+AAA (Current Price: $0.125):
+  Put #1: Strike $0.625, Spot $0.125, ITM by $0.5, Premium $2,625,000, Exp: 10/24/2025
+  Put #2: Strike $0.375, Spot $0.125, ITM by $0.25, Premium $5,125,000, Exp: 11/21/2025
+
+BBB (Current Price: $10.125):
+  Put #1: Strike $100, Spot $99.75, ITM by $0.25, Premium $1,125, Exp: 10/24/2025
+
+CCC (Current Price: $1,000.5):
+  Put #1: Strike $1,002.5, Spot $1,000.5, ITM by $2, Premium $12,345,678, Exp: 12/19/2025
+
+FINAL QUALIFYING TICKERS WITH CURRENT PRICES with upcoming earnings:
+=====================================================================
+AAA: Current Price $0.125, 1 ITM puts, Total Premium $375,125
+DDD: Current Price $20.875, 1 ITM puts, Total Premium $1,375,000
+
+CALL ACTIVITY ANALYSIS with upcoming earnings:
+==============================================
+
+AAA (Current Price: $0.125): No calls found
+DDD (Current Price: $20.875):
+  Calls of strike 22.5 were bought for date 11/21/2025
+
+DETAILED PUT BREAKDOWN BY TICKER with upcoming earnings:
+========================================================
+
+AAA (Current Price: $0.125):
+  Put #1: Strike $0.875, Spot $0.125, ITM by $0.75, Premium $375,125, Exp: 2025-11-21 00:00:00
+
+DDD (Current Price: $20.875):
+  Put #1: Strike $21.125, Spot $20.875, ITM by $0.25, Premium $1,375,000, Exp: 2025-11-21 00:00:00
+"""
+
+# Loads clientside.js under a stub window and runs each case's callback on the payload read from stdin
+NODE_SCRIPT = """
+global.window = {dash_clientside: {no_update: '__no_update__', callback_context: {triggered: []}}};
+require(process.argv[1]);
+var itm = window.dash_clientside.itm;
+var data = JSON.parse(require('fs').readFileSync(0, 'utf-8'));
+process.stdout.write(JSON.stringify(data.cases.map(function (c) {
+    if (c.kind === 'tickers') return itm.updateTickerOptions(data.payload, c.expiry, null, null, null, null, [])[0];
+    if (c.kind === 'summary') return itm.updateSummary(data.payload, c.expiry);
+    return itm.updateDetailPanes(c.tickers, c.expiry, data.payload, c.sort, null).slice(0, 2);
+})));
+"""
+
+SELECTIONS = ([], ['2025-10-24'], ['2025-10-24', '2025-11-21'])
+
+
+def test_clientside_matches_server(dash_client):
+    if shutil.which('node') is None:
+        pytest.skip("node is not installed")
+    report_key = dash_client.upload(TIES_REPORT)
+
+    def respond(output, values, changed):
+        request = callback_request(dash_client.dependencies, output, dict(values, **{'report-key.data': report_key}),
+                                   changed)
+        response = dash_client.client.post('/_dash-update-component', json=request)
+        assert response.status_code == 200, response.data[:500]
+        return response.get_json()['response']
+
+    cases = []
+    for expiry in SELECTIONS:
+        options = respond('tickers.options', {'expiry-dates.value': expiry, 'tickers.value': []},
+                          ['expiry-dates.value'])['tickers']['options']
+        cases.append({'kind': 'tickers', 'expiry': expiry, 'server': options})
+        tickers = [option['value'] for option in options]
+        for sort in ('report', 'premium'):
+            panes = respond('put-breakdown-div.children',
+                            {'tickers.value': tickers, 'expiry-dates.value': expiry, 'put-sort.value': sort},
+                            ['tickers.value'])
+            cases.append({'kind': 'panes', 'tickers': tickers, 'expiry': expiry, 'sort': sort,
+                          'server': [panes['put-breakdown-div']['children'], panes['call-activity-div']['children']]})
+        summary = respond('summary-panel.children', {'expiry-dates.value': expiry}, ['expiry-dates.value'])
+        cases.append({'kind': 'summary', 'expiry': expiry, 'server': summary['summary-panel']['children']})
+
+    key, report, status_msg = app.resolve_report(report_key)
+    # Call strikes are a comma-separated list, so the report writes them without thousands separators
+    assert report.call_index.by_ticker[(False, 'CCC')] == {date(2025, 12, 19): [1002.5]}
+    payload = app.report_client_payload(key, report, status_msg)
+    data = json.dumps({'payload': payload, 'cases': cases}, cls=plotly.utils.PlotlyJSONEncoder)
+    result = subprocess.run(['node', '-e', NODE_SCRIPT, CLIENTSIDE_JS], input=data, capture_output=True, text=True,
+                            check=True)
+
+    for case, clientside in zip(cases, json.loads(result.stdout)):
+        assert clientside == case['server'], (case['kind'], case['expiry'], case.get('sort'))
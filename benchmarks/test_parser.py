@@ -0,0 +1,67 @@
+"""The single-pass parser's output on the bundled sample report, pinned: pytest benchmarks"""
+import os
+from datetime import date
+
+import pytest
+
+import app
+
+SAMPLE_REPORT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ITM_Analysis_Summary.txt')
+
+
+@pytest.fixture(scope='module')
+def sample():
+    with open(SAMPLE_REPORT, encoding='utf-8') as f:
+        return f.read()
+
+
+def test_sections(sample):
+    tickers_data, puts_data, calls_data, earnings_tickers_data, earnings_puts_data, earnings_calls_data = (
+        app.parse_itm_content(sample))
+
+    assert (len(tickers_data), len(puts_data), len(calls_data)) == (58, 58, 58)
+    assert (len(earnings_tickers_data), len(earnings_puts_data), len(earnings_calls_data)) == (19, 19, 19)
+    assert sum(len(puts) for puts in puts_data.values()) == 197
+    assert sum(len(puts) for puts in earnings_puts_data.values()) == 90
+    assert sum(put['premium'] for puts in puts_data.values() for put in puts) == 224_368_230
+    assert sum(put['premium'] for puts in earnings_puts_data.values() for put in puts) == 56_535_134
+
+
+def test_earnings_puts_stay_in_their_section(sample):
+    """Tickers in both halves keep their own puts; the earnings section's puts carry its date format"""
+    tickers_data, puts_data, _, earnings_tickers_data, earnings_puts_data, _ = app.parse_itm_content(sample)
+
+    assert (len(puts_data['TSLA']), len(earnings_puts_data['TSLA'])) == (40, 53)
+    assert {put['expiration'][-9:] for puts in earnings_puts_data.values() for put in puts} == {' 00:00:00'}
+    assert not any(put['expiration'].endswith(' 00:00:00') for puts in puts_data.values() for put in puts)
+    for summaries, section in ((tickers_data, puts_data), (earnings_tickers_data, earnings_puts_data)):
+        for ticker, summary in summaries.items():
+            assert summary['num_puts'] == len(section[ticker]), ticker
+            assert summary['total_premium'] == sum(put['premium'] for put in section[ticker]), ticker
+
+
+def test_put_and_call_fields(sample):
+    _, puts_data, calls_data, _, earnings_puts_data, _ = app.parse_itm_content(sample)
+
+    assert puts_data['AAPL'][0] == {'put_number': 1, 'strike': 260.0, 'spot': 257.97, 'itm_by': 2.03,
+                                    'premium': 393756.0, 'expiration': '11/7/2025'}
+    # A ticker with a digit in it is a section of its own, not more puts and calls of the ticker before it
+    assert (len(puts_data['VRT']), len(puts_data['WOLF1']), calls_data['WOLF1']) == (2, 2, '')
+    assert 'WOLF1' not in calls_data['VRT']
+    assert earnings_puts_data['BX'] == [{'put_number': 1, 'strike': 162.0, 'spot': 161.71, 'itm_by': 0.79,
+                                         'premium': 210375.0, 'expiration': '2025-11-21 00:00:00'}]
+    assert calls_data['AAPL'].startswith("Calls of strike 240,250,255,257.5,260,262.5,265,267.5,270 were bought "
+                                         "for date 10/24/2025.")
+
+
+def test_parsed_report(sample):
+    report = app.parse_report(sample)
+
+    assert report.generated == '2025-10-22 21:38:40'
+    assert report.header['overview']['ITM puts meeting all criteria'] == '325'
+    assert len(report.puts_frame) == 287 and int(report.puts_frame['is_earnings'].sum()) == 90
+    assert report.expiry_dates[:3] == ['2025-10-24', '2025-10-31', '2025-11-07']
+    # Calls bought for an expiry, counted across the tickers of both sections
+    counts = report.call_index.counts_by_expiry()
+    assert counts[date(2025, 10, 24)] == (58, 395)
+    assert sum(strikes for _, strikes in counts.values()) == len(report.call_index.records())
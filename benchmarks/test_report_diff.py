@@ -0,0 +1,78 @@
+"""ReportDiff on small hand-built reports and the comparison panel's baselines: pytest benchmarks"""
+import pandas as pd
+
+import app
+from report_diff import ReportDiff
+from synthetic_report import next_day_report
+
+
+def puts(*rows):
+    """Put dicts for build_puts_frame from (ticker, strike, expiration, premium) rows"""
+    data = {}
+    for number, (ticker, strike, expiration, premium) in enumerate(rows, 1):
+        data.setdefault(ticker, []).append({'put_number': number, 'strike': strike, 'spot': strike - 1.0,
+                                            'itm_by': 1.0, 'premium': premium, 'expiration': expiration})
+    return data
+
+
+def test_unparseable_expiration_keeps_its_own_key():
+    """A TBD row's NaT expiration must not collide with the previous strike's last expiration"""
+    rows = (('AAA', 10.0, '10/24/2025', 100.0), ('AAA', 10.0, '11/21/2025', 200.0), ('AAA', 20.0, 'TBD', 50.0))
+    old = app.build_puts_frame(puts(*rows), {})
+    new = app.build_puts_frame(puts(*rows[:2], ('AAA', 20.0, 'TBD', 80.0)), {})
+
+    diff = ReportDiff(old, new)
+
+    assert len(diff.frame) == 3
+    assert diff.counts == {'added': 0, 'removed': 0, 'changed': 1, 'unchanged': 2}
+    changed = diff.frame[diff.frame['status'] == 'changed'].iloc[0]
+    assert changed['strike'] == 20.0
+    assert pd.isna(changed['expiration'])
+    assert (changed['premium_old'], changed['premium_new']) == (50.0, 80.0)
+    assert diff.frame['expiration'].dropna().dt.strftime('%m/%d/%Y').tolist() == ['10/24/2025', '11/21/2025']
+
+
+def test_unparseable_expiration_renders_as_listed():
+    """The diff panel shows a NaT expiration as its label instead of failing on strftime"""
+    rows = (('AAA', 10.0, '10/24/2025', 100.0), ('AAA', 20.0, 'TBD', 50.0))
+    old = app.build_puts_frame(puts(*rows), {})
+    new = app.build_puts_frame(puts(rows[0], ('AAA', 20.0, 'TBD', 80.0), ('BBB', 5.0, 'TBD', 30.0)), {})
+
+    panel = app.render_report_diff(ReportDiff(old, new))
+
+    tables = {column.children[0].children: column.children[1] for column in panel[2].children}
+    changed, added = tables["Changed puts"], tables["Added puts"]
+    assert [cell.children for cell in changed.children[1].children[0].children][:3] == ['AAA', '$20.00', 'TBD']
+    assert [cell.children for cell in added.children[1].children[0].children][:3] == ['BBB', '$5.00', 'TBD']
+
+
+def test_added_removed_and_changed():
+    old = app.build_puts_frame(puts(('AAA', 10.0, '10/24/2025', 100.0), ('BBB', 5.0, '10/24/2025', 30.0)), {})
+    new = app.build_puts_frame(puts(('AAA', 10.0, '10/24/2025', 120.0)),
+                               puts(('CCC', 7.0, '2025-10-24 00:00:00', 40.0)))
+
+    diff = ReportDiff(old, new)
+
+    assert diff.counts == {'added': 1, 'removed': 1, 'changed': 1, 'unchanged': 0}
+    assert diff.added_tickers == ['CCC'] and diff.removed_tickers == ['BBB']
+    assert diff.total_premium == (130.0, 160.0)
+    assert diff.premium_changes['changed'] == 20.0
+
+
+def test_default_report_baseline_outlives_the_file(tmp_path, monkeypatch):
+    """A baseline that was the default report still loads after the file is replaced and its parse evicted"""
+    text = open(app.DEFAULT_REPORT_PATH, encoding='utf-8').read()
+    path = tmp_path / 'ITM_Analysis_Summary.txt'
+    path.write_text(text, encoding='utf-8')
+    monkeypatch.setattr(app, 'DEFAULT_REPORT_PATH', str(path))
+    monkeypatch.setattr(app, 'UPLOAD_DIR', str(tmp_path / 'uploads'))
+    monkeypatch.setattr(app, '_default_report_state', (None, None, None))
+    monkeypatch.setattr(app, 'REPORT_CACHE', app.ParsedReportCache(1))
+    old_key, _ = app.reload_default_report()
+
+    path.write_text(next_day_report(text), encoding='utf-8')
+    new_key, _ = app.reload_default_report()
+
+    assert new_key != old_key
+    panel = app.update_diff(None, old_key, [])
+    assert isinstance(panel, list) and panel[0].children == "Changes since the earlier report"
@@ -0,0 +1,26 @@
+"""Summary aggregates on the bundled sample report: pytest benchmarks"""
+import pytest
+
+import app
+
+
+@pytest.fixture(scope='module')
+def report():
+    with open(app.DEFAULT_REPORT_PATH, encoding='utf-8') as f:
+        return app.parse_report(f.read())
+
+
+def test_totals_do_not_depend_on_earlier_selections(report):
+    """The same selection gets the same totals whatever was selected before it, and they match the puts"""
+    values = report.expiry_dates
+    selection = values[1::3]
+    first = report.aggregates.summary(selection)
+    for earlier in (values[::2], values[:1], [], values[:-1], values[1::3] + values[:2]):
+        report.aggregates.summary(earlier)
+        again = report.aggregates.summary(selection)
+        assert again['total_premium'] == first['total_premium']
+        assert again['top_tickers'] == first['top_tickers']
+
+    rows = report.puts_frame.iloc[report.expiry_index.rows(selection)]
+    assert first['num_puts'] == len(rows)
+    assert first['total_premium'] == pytest.approx(rows['premium'].sum(), rel=1e-12)
@@ -0,0 +1,19 @@
+"""gunicorn settings for the dashboard: gunicorn -c gunicorn.conf.py app:server"""
+import gc
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8050)}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 4))
+
+# Import app.py once in the master (pandas, finviz_short.csv and the parsed default report) and fork the
+# workers from it, so they share those pages copy-on-write instead of each paying for its own cold start
+preload_app = True
+os.environ.setdefault('ITM_PRELOAD', '1')
+# A thread started in the master doesn't survive the fork and could leave a lock held in the workers
+os.environ['ITM_WARM_UP'] = '0'
+
+
+def pre_fork(server, worker):
+    # Move everything loaded so far out of the collector's reach; otherwise the first collection in each
+    # worker writes to every object's header and un-shares the pages
+    gc.freeze()
@@ -0,0 +1,174 @@
+"""Opt-in per-stage timings, histograms and counters for the dashboard, rendered in the Prometheus text format"""
+import contextlib
+import threading
+import time
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+BYTES_BUCKETS = (1e3, 1e4, 1e5, 2.5e5, 5e5, 1e6, 2.5e6, 5e6, 1e7, 2.5e7, 5e7)
+COUNT_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 50000, 100000)
+
+_DISABLED_STAGE = contextlib.nullcontext()
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Histogram:
+    """Cumulative-bucket histogram with a fixed set of label names"""
+
+    def __init__(self, name, documentation, buckets, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.labels = tuple(labels)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            counts = series[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: (list(s[0]), s[1], s[2]) for labels, s in self._series.items()}
+        for label_values, (counts, total, count) in sorted(series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = _format_labels(self.labels, label_values, [('le', _format_value(bound))])
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            le = _format_labels(self.labels, label_values, [('le', '+Inf')])
+            lines.append(f"{self.name}_bucket{le} {count}")
+            labels = _format_labels(self.labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Counter:
+    """Monotonic counter with a fixed set of label names"""
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = dict(self._values)
+        for label_values, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {_format_value(value)}")
+        return lines
+
+
+class Metrics:
+    """Registry of the dashboard's metrics.
+
+    When disabled, stage() hands back a shared no-op context manager and every other method returns
+    straight away, so the instrumented code paths cost one attribute check.
+    """
+
+    def __init__(self, enabled=False, slow_callback_seconds=None):
+        self.enabled = enabled
+        self.slow_callback_seconds = slow_callback_seconds
+        self._request = threading.local()
+        self.stage_seconds = Histogram(
+            'itm_stage_seconds', "Time spent in each stage of parsing and rendering", LATENCY_BUCKETS, ['stage'])
+        self.callback_seconds = Histogram(
+            'itm_callback_seconds', "Dash callback request latency, including response serialization",
+            LATENCY_BUCKETS, ['callback'])
+        self.request_bytes = Histogram(
+            'itm_callback_request_bytes', "Dash callback request body size", BYTES_BUCKETS, ['callback'])
+        self.response_bytes = Histogram(
+            'itm_callback_response_bytes', "Dash callback response body size", BYTES_BUCKETS, ['callback'])
+        self.upload_bytes = Histogram('itm_upload_bytes', "Decoded size of uploaded reports", BYTES_BUCKETS)
+        self.report_puts = Histogram('itm_report_puts', "Puts in each parsed report", COUNT_BUCKETS)
+        self.report_tickers = Histogram('itm_report_tickers', "Tickers in each parsed report", COUNT_BUCKETS)
+        self.rendered_tickers = Histogram(
+            'itm_rendered_tickers', "Ticker blocks built per render", COUNT_BUCKETS, ['pane'])
+        self.rendered_puts = Histogram('itm_rendered_puts', "Put rows built per render", COUNT_BUCKETS)
+        self.cache_requests = Counter(
+            'itm_cache_requests_total', "Cache lookups by cache and result", ['cache', 'result'])
+        self.slow_callbacks = Counter(
+            'itm_slow_callbacks_total', "Callbacks slower than ITM_SLOW_CALLBACK_MS", ['callback'])
+        self._collectors = []
+
+    def add_collector(self, collect):
+        """collect() returns extra exposition lines (gauges read at scrape time)"""
+        self._collectors.append(collect)
+
+    @contextlib.contextmanager
+    def _timed_stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.stage_seconds.observe(elapsed, name)
+            stages = getattr(self._request, 'stages', None)
+            if stages is not None:
+                stages[name] = stages.get(name, 0.0) + elapsed
+
+    def stage(self, name):
+        if not self.enabled:
+            return _DISABLED_STAGE
+        return self._timed_stage(name)
+
+    def observe(self, histogram, value, *label_values):
+        if self.enabled:
+            histogram.observe(value, *label_values)
+
+    def cache_lookup(self, cache, hit):
+        if self.enabled:
+            self.cache_requests.inc(cache, 'hit' if hit else 'miss')
+
+    def start_request(self):
+        self._request.started = time.perf_counter()
+        self._request.stages = {}
+
+    def finish_request(self, callback, request_bytes, response_bytes):
+        """Record one callback request; returns (seconds, stage timings) if it was slow, else None"""
+        elapsed = time.perf_counter() - self._request.started
+        stages, self._request.stages = self._request.stages, None
+        self.callback_seconds.observe(elapsed, callback)
+        self.request_bytes.observe(request_bytes, callback)
+        self.response_bytes.observe(response_bytes, callback)
+        if self.slow_callback_seconds is not None and elapsed >= self.slow_callback_seconds:
+            self.slow_callbacks.inc(callback)
+            return elapsed, stages
+        return None
+
+    def render(self):
+        lines = []
+        for metric in (self.stage_seconds, self.callback_seconds, self.request_bytes, self.response_bytes,
+                       self.upload_bytes, self.report_puts, self.report_tickers, self.rendered_tickers,
+                       self.rendered_puts, self.cache_requests, self.slow_callbacks):
+            lines.extend(metric.render())
+        for collect in self._collectors:
+            lines.extend(collect())
+        return "\n".join(lines) + "\n"
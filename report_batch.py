@@ -0,0 +1,104 @@
+"""Pre-parse ITM_Analysis_Summary reports into the dashboard's memory-mapped snapshots, one process per core.
+
+    python report_batch.py [--snapshot-dir DIR] [--jobs N] [--force] REPORT_OR_DIRECTORY [...]
+
+Each report is published under its content hash in the snapshot directory (ITM_SNAPSHOT_DIR by default), in
+the report_snapshot.py format. The dashboard then maps it instead of parsing: for the default report, for
+uploads of the same file and for ?report=<key> links, which work even if the file was never uploaded.
+"""
+import argparse
+import fnmatch
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+def find_reports(paths, pattern):
+    """Files in paths, with directories searched recursively for names matching pattern, in a stable order"""
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(fnmatch.filter(files, pattern)):
+                yield os.path.join(root, name)
+
+
+def prebuild(path, force=False):
+    """Parse one report and publish its snapshot; returns (key, bytes read, puts or None if skipped, seconds)"""
+    import app
+
+    started = time.perf_counter()
+    with open(path, 'rb') as f:
+        raw = f.read()
+    key = app.report_key(raw)
+    snapshot_path = os.path.join(app.SNAPSHOT_DIR, key)
+    if os.path.isdir(snapshot_path):
+        if not force:
+            return key, len(raw), None, time.perf_counter() - started
+        shutil.rmtree(snapshot_path)
+    report = app.parse_report(raw.decode('utf-8'))
+    if not app.publish_report_snapshot(key, report):
+        raise OSError(f"could not write {snapshot_path}")
+    return key, len(raw), len(report.puts_frame), time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('paths', nargs='+', help="report files, or directories to search for --pattern")
+    parser.add_argument('--snapshot-dir', help="where to publish snapshots (default: the dashboard's ITM_SNAPSHOT_DIR)")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help="worker processes (default: all cores)")
+    parser.add_argument('--pattern', default='*.txt', help="file names to pick up in directories (default: *.txt)")
+    parser.add_argument('--force', action='store_true', help="re-parse reports that already have a snapshot")
+    args = parser.parse_args(argv)
+
+    # Read by app at import, here and in the pool's processes: no reload thread, no default report parse
+    if args.snapshot_dir:
+        os.environ['ITM_SNAPSHOT_DIR'] = args.snapshot_dir
+    os.environ['ITM_RELOAD_INTERVAL'] = '0'
+    os.environ['ITM_WARM_UP'] = '0'
+    os.environ.pop('ITM_PRELOAD', None)
+    import app
+
+    if not app.SNAPSHOT_DIR:
+        sys.exit("Snapshots are disabled (ITM_SNAPSHOT_DIR is empty); pass --snapshot-dir")
+    paths = list(dict.fromkeys(find_reports(args.paths, args.pattern)))
+    if not paths:
+        sys.exit("No reports found")
+    jobs = max(1, min(args.jobs, len(paths)))
+    print(f"Pre-parsing {len(paths)} report(s) into {app.SNAPSHOT_DIR} with {jobs} process(es)")
+
+    started = time.perf_counter()
+    parsed = skipped = failed = total_bytes = total_puts = 0
+    with ProcessPoolExecutor(jobs) as pool:
+        futures = {pool.submit(prebuild, path, args.force): path for path in paths}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                key, size, puts, seconds = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"⚠️ {path}: {str(e)}")
+                continue
+            if puts is None:
+                skipped += 1
+                print(f"- {path}: already published (?report={key})")
+                continue
+            parsed += 1
+            total_bytes += size
+            total_puts += puts
+            print(f"✓ {path}: {puts:,} puts in {seconds:.2f}s (?report={key})")
+    elapsed = time.perf_counter() - started
+
+    print(f"{parsed} parsed, {skipped} already published, {failed} failed in {elapsed:.2f}s")
+    if parsed:
+        print(f"Throughput: {parsed / elapsed:.1f} reports/s, {total_bytes / 2 ** 20 / elapsed:.1f} MB/s, "
+              f"{total_puts / elapsed:,.0f} puts/s on {jobs} process(es)")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
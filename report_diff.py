@@ -0,0 +1,102 @@
+"""Put-level comparison of two parsed reports: puts added, removed and repriced between them.
+
+The two puts frames (app.build_puts_frame) are stacked and their (ticker, strike, expiration) keys factorized in
+one pass; premiums and presence per key are bincounts over the codes, so the outer join never goes through a
+pandas merge. The counts, totals and tables of a ReportDiff all come from the joined frame.
+"""
+KEY_COLUMNS = ('ticker', 'strike', 'expiration')
+STATUSES = ('added', 'removed', 'changed', 'unchanged')
+# Premium moves smaller than half a cent are rounding in the report, not a change
+PREMIUM_TOLERANCE = 0.005
+
+
+def _first_positions(codes, n_groups):
+    """Position of the first row of each group code (-1 for groups with no row)"""
+    import numpy as np
+
+    first = np.full(n_groups, -1, dtype=np.int64)
+    # Fancy assignment keeps the last write per index, so writing in reverse leaves the first row
+    first[codes[::-1]] = np.arange(len(codes) - 1, -1, -1)
+    return first
+
+
+class ReportDiff:
+    """Puts of a new report against an old one, joined on (ticker, strike, expiration).
+
+    frame has one row per key in either report, in report order (the old report's, then puts new in the new
+    one), with its status (added, removed, changed or unchanged), the expiration label of its first line, the
+    old and new premium (NaN where the put is missing, summed over repeated lines) and premium_delta (new - old,
+    missing counted as 0). The counts, premium totals, per-ticker changes and the top_n rows of each status are
+    computed up front, so rendering a cached diff doesn't touch the frame again.
+    """
+
+    def __init__(self, old_frame, new_frame, top_n=25):
+        import numpy as np
+        import pandas as pd
+
+        # Both reports' rows stacked and factorized once: a key's group code is its row in the joined frame
+        tickers = old_frame['ticker'].cat.categories.union(new_frame['ticker'].cat.categories)
+        frames = (old_frame, new_frame)
+        ticker_codes = np.concatenate([
+            pd.Categorical(frame['ticker'], categories=tickers).codes.astype(np.int64) for frame in frames])
+        labels = old_frame['expiration_label'].cat.categories.union(new_frame['expiration_label'].cat.categories)
+        label_codes = np.concatenate([
+            pd.Categorical(frame['expiration_label'], categories=labels).codes for frame in frames])
+        strike_codes, strikes = pd.factorize(np.concatenate([frame['strike'].to_numpy() for frame in frames]))
+        # Unparseable labels (Exp: TBD) are NaT; they need a code of their own, not -1, or the combined key collides
+        expiry_codes, expirations = pd.factorize(np.concatenate([frame['expiration'].to_numpy() for frame in frames]),
+                                                 use_na_sentinel=False)
+        combined = (ticker_codes * len(strikes) + strike_codes) * len(expirations) + expiry_codes
+        codes, _ = pd.factorize(combined)
+        n_groups = int(codes.max()) + 1 if len(codes) else 0
+        first = _first_positions(codes, n_groups)
+
+        n_old = len(old_frame)
+        sides = {}
+        for name, frame, side_codes in (('old', old_frame, codes[:n_old]), ('new', new_frame, codes[n_old:])):
+            present = np.bincount(side_codes, minlength=n_groups) > 0
+            premium = np.bincount(side_codes, weights=frame['premium'].to_numpy(), minlength=n_groups)
+            earnings = np.bincount(side_codes, weights=frame['is_earnings'].to_numpy(), minlength=n_groups) > 0
+            itm_by = np.full(n_groups, np.nan)
+            itm_by[present] = frame['itm_by'].to_numpy()[_first_positions(side_codes, n_groups)[present]]
+            sides[name] = (present, np.where(present, premium, np.nan), earnings, itm_by)
+        (in_old, premium_old, earnings_old, itm_by_old), (in_new, premium_new, earnings_new, itm_by_new) = (
+            sides['old'], sides['new'])
+
+        delta = np.nan_to_num(premium_new) - np.nan_to_num(premium_old)
+        status = np.select([~in_old, ~in_new, np.abs(delta) >= PREMIUM_TOLERANCE], [0, 1, 2], 3).astype(np.int8)
+        self.frame = pd.DataFrame({
+            'ticker': pd.Categorical.from_codes(ticker_codes[first], categories=tickers),
+            'strike': strikes[strike_codes[first]],
+            'expiration': expirations[expiry_codes[first]],
+            'expiration_label': labels[label_codes[first]],
+            'is_earnings': np.where(in_new, earnings_new, earnings_old),
+            'status': pd.Categorical.from_codes(status, categories=STATUSES),
+            'premium_old': premium_old,
+            'premium_new': premium_new,
+            'premium_delta': delta,
+            'itm_by_old': itm_by_old,
+            'itm_by_new': itm_by_new,
+        })
+
+        self.counts = dict(zip(STATUSES, np.bincount(status, minlength=len(STATUSES)).tolist()))
+        self.premium_changes = dict(zip(STATUSES, np.bincount(status, weights=delta, minlength=len(STATUSES)).tolist()))
+        self.total_premium = (float(np.nansum(premium_old)), float(np.nansum(premium_new)))
+
+        old_tickers = np.bincount(ticker_codes[:n_old], minlength=len(tickers)) > 0
+        new_tickers = np.bincount(ticker_codes[n_old:], minlength=len(tickers)) > 0
+        self.added_tickers = sorted(tickers[new_tickers & ~old_tickers].tolist())
+        self.removed_tickers = sorted(tickers[old_tickers & ~new_tickers].tolist())
+
+        by_ticker = self.frame.groupby('ticker', observed=True, sort=False)[
+            ['premium_old', 'premium_new', 'premium_delta']].sum()
+        by_ticker = by_ticker[by_ticker['premium_delta'].abs() >= PREMIUM_TOLERANCE]
+        self.ticker_changes = self._records(by_ticker.reset_index(), top_n)
+        self.top_rows = {name: self._records(self.frame[status == code], top_n)
+                         for code, name in enumerate(STATUSES[:3])}
+
+    @staticmethod
+    def _records(frame, top_n):
+        """Up to top_n rows of frame with the largest premium moves, as dicts"""
+        order = frame['premium_delta'].abs().to_numpy().argsort(kind='stable')[::-1][:top_n]
+        return frame.iloc[order].to_dict('records')
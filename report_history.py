@@ -0,0 +1,189 @@
+"""Append-only SQLite history of parsed ITM reports, keyed by their "Generated:" timestamp"""
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+SCHEMA = """
+PRAGMA journal_mode = WAL;
+
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    generated TEXT NOT NULL UNIQUE,
+    content_hash TEXT,
+    source TEXT,
+    ingested_at TEXT NOT NULL,
+    num_tickers INTEGER NOT NULL,
+    num_puts INTEGER NOT NULL,
+    total_premium REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS tickers (
+    report_id INTEGER NOT NULL REFERENCES reports(id),
+    ticker TEXT NOT NULL,
+    is_earnings INTEGER NOT NULL,
+    current_price REAL NOT NULL,
+    num_puts INTEGER NOT NULL,
+    total_premium REAL NOT NULL,
+    PRIMARY KEY (report_id, is_earnings, ticker)
+);
+CREATE INDEX IF NOT EXISTS tickers_by_ticker ON tickers (ticker, report_id);
+
+CREATE TABLE IF NOT EXISTS puts (
+    report_id INTEGER NOT NULL REFERENCES reports(id),
+    ticker TEXT NOT NULL,
+    is_earnings INTEGER NOT NULL,
+    put_number INTEGER NOT NULL,
+    strike REAL NOT NULL,
+    spot REAL NOT NULL,
+    itm_by REAL NOT NULL,
+    premium REAL NOT NULL,
+    expiration TEXT,
+    expiration_label TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS puts_by_ticker ON puts (ticker, report_id);
+CREATE INDEX IF NOT EXISTS puts_by_expiration ON puts (expiration, report_id);
+"""
+
+
+class ReportHistory:
+    """Reports are only ever appended; a report whose Generated timestamp is already stored is skipped"""
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self):
+        # sqlite3 connections can't be shared across threads or carried over a fork, so each thread of
+        # each process gets its own
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=30)
+            self._local.pid = os.getpid()
+        return conn
+
+    def has_report(self, generated):
+        row = self._connection().execute("SELECT 1 FROM reports WHERE generated = ?", (generated,)).fetchone()
+        return row is not None
+
+    def ingest(self, report, content_hash=None, source=None):
+        """Store a ParsedReport; returns False if it has no Generated timestamp or was ingested before"""
+        if not report.generated or self.has_report(report.generated):
+            return False
+
+        tickers = [
+            (ticker, int(is_earnings), d['current_price'], d['num_puts'], d['total_premium'])
+            for is_earnings, tickers_data in ((False, report.tickers_data), (True, report.earnings_tickers_data))
+            for ticker, d in tickers_data.items()
+        ]
+        frame = report.puts_frame
+        missing = frame['expiration'].isna().tolist()
+        expirations = [None if is_missing else expiry.date().isoformat()
+                       for expiry, is_missing in zip(frame['expiration'], missing)]
+        puts = list(zip(
+            frame['ticker'].astype(str).tolist(), frame['is_earnings'].astype(int).tolist(),
+            frame['put_number'].tolist(), frame['strike'].tolist(), frame['spot'].tolist(),
+            frame['itm_by'].tolist(), frame['premium'].tolist(), expirations,
+            frame['expiration_label'].astype(str).tolist()
+        ))
+
+        conn = self._connection()
+        with conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO reports (generated, content_hash, source, ingested_at, num_tickers, num_puts,"
+                " total_premium) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (report.generated, content_hash, source, datetime.now().isoformat(timespec='seconds'),
+                 len(tickers), len(puts), float(frame['premium'].sum()))
+            )
+            if cursor.rowcount == 0:
+                # Another worker ingested the same report first
+                return False
+            report_id = cursor.lastrowid
+            conn.executemany(
+                "INSERT INTO tickers (report_id, ticker, is_earnings, current_price, num_puts, total_premium)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                [(report_id, *row) for row in tickers]
+            )
+            conn.executemany(
+                "INSERT INTO puts (report_id, ticker, is_earnings, put_number, strike, spot, itm_by, premium,"
+                " expiration, expiration_label) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(report_id, *row) for row in puts]
+            )
+        return True
+
+    def reports(self, last_n=None):
+        """(generated, source, num_tickers, num_puts, total_premium) for the latest reports, oldest first"""
+        rows = self._connection().execute(
+            "SELECT generated, source, num_tickers, num_puts, total_premium FROM reports"
+            " ORDER BY generated DESC LIMIT ?", (last_n if last_n else -1,)
+        ).fetchall()
+        return rows[::-1]
+
+    def tickers(self):
+        """Every ticker that appears in any stored report"""
+        return [row[0] for row in self._connection().execute("SELECT DISTINCT ticker FROM tickers ORDER BY ticker")]
+
+    def premium_trend(self, ticker, last_n=30, is_earnings=None):
+        """(generated, num_puts, total_premium) for ticker over the latest last_n reports, oldest first.
+
+        Reports the ticker is missing from are included with zero puts and premium. Normal and
+        earnings entries are summed unless is_earnings picks one of them.
+        """
+        query = ("SELECT r.generated, COALESCE(SUM(t.num_puts), 0), COALESCE(SUM(t.total_premium), 0)"
+                 " FROM (SELECT id, generated FROM reports ORDER BY generated DESC LIMIT ?) r"
+                 " LEFT JOIN tickers t ON t.report_id = r.id AND t.ticker = ?")
+        params = [last_n, ticker]
+        if is_earnings is not None:
+            query += " AND t.is_earnings = ?"
+            params.append(int(is_earnings))
+        query += " GROUP BY r.id ORDER BY r.generated"
+        return self._connection().execute(query, params).fetchall()
+
+    def ticker_streaks(self, last_n=30):
+        """{ticker: number of consecutive reports, counting back from the latest, the ticker appears in}"""
+        conn = self._connection()
+        report_ids = [row[0] for row in conn.execute(
+            "SELECT id FROM reports ORDER BY generated DESC LIMIT ?", (last_n,))]
+        if not report_ids:
+            return {}
+        present = {}
+        placeholders = ",".join("?" * len(report_ids))
+        for report_id, ticker in conn.execute(
+                f"SELECT DISTINCT report_id, ticker FROM tickers WHERE report_id IN ({placeholders})", report_ids):
+            present.setdefault(ticker, set()).add(report_id)
+
+        streaks = {}
+        for ticker, ids in present.items():
+            streak = 0
+            for report_id in report_ids:
+                if report_id not in ids:
+                    break
+                streak += 1
+            if streak:
+                streaks[ticker] = streak
+        return streaks
+
+    def tickers_in_a_row(self, n):
+        """Tickers present in each of the latest n reports"""
+        return sorted(ticker for ticker, streak in self.ticker_streaks(last_n=n).items() if streak >= n)
+
+
+if __name__ == '__main__':
+    import sys
+    os.environ.setdefault('ITM_WARM_UP', '0')
+    from app import parse_report, report_key
+
+    if len(sys.argv) < 3:
+        sys.exit("usage: python report_history.py HISTORY_DB REPORT.txt [REPORT.txt ...]")
+    history = ReportHistory(sys.argv[1])
+    for report_path in sys.argv[2:]:
+        with open(report_path, 'rb') as f:
+            raw = f.read()
+        report = parse_report(raw.decode('utf-8'))
+        if history.ingest(report, content_hash=report_key(raw), source=os.path.basename(report_path)):
+            print(f"✓ Ingested {report_path} (Generated: {report.generated})")
+        else:
+            print(f"- Skipped {report_path}: already ingested or missing a Generated timestamp")
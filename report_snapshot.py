@@ -0,0 +1,62 @@
+"""Parsed reports published as memory-mapped column files, so gunicorn workers share one copy through the page cache"""
+import json
+import os
+import shutil
+
+# Column order of build_puts_frame in app.py
+PUTS_FRAME_COLUMNS = ('ticker', 'is_earnings', 'put_number', 'strike', 'spot', 'itm_by', 'premium', 'expiration',
+                      'expiration_label')
+CATEGORICAL_COLUMNS = ('ticker', 'expiration_label')
+
+
+def write_snapshot(path, puts_frame, meta):
+    """Publish a puts frame and its JSON-able metadata as a directory of .npy files at path.
+
+    The directory is written under a temporary name and renamed into place, so readers either find a
+    complete snapshot or none. Returns False if another process published the same snapshot first.
+    """
+    import numpy as np
+
+    if os.path.isdir(path):
+        return False
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    os.makedirs(tmp_path, exist_ok=True)
+    meta = dict(meta, num_puts=len(puts_frame), categories={})
+    for name in PUTS_FRAME_COLUMNS:
+        column = puts_frame[name]
+        if name in CATEGORICAL_COLUMNS:
+            meta['categories'][name] = column.cat.categories.tolist()
+            values = column.cat.codes.to_numpy()
+        else:
+            values = column.to_numpy()
+        np.save(os.path.join(tmp_path, f"{name}.npy"), values)
+    with open(os.path.join(tmp_path, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    try:
+        os.rename(tmp_path, path)
+    except OSError:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        return False
+    return True
+
+
+def read_snapshot(path):
+    """(metadata, puts frame) for the snapshot at path, or None if there is none.
+
+    Numeric columns are read-only memory maps of the .npy files; only the small categorical codes are copied.
+    """
+    import numpy as np
+    import pandas as pd
+
+    try:
+        with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+    except FileNotFoundError:
+        return None
+    columns = {}
+    for name in PUTS_FRAME_COLUMNS:
+        values = np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r')
+        if name in CATEGORICAL_COLUMNS:
+            values = pd.Categorical.from_codes(values, categories=meta['categories'][name])
+        columns[name] = values
+    return meta, pd.DataFrame(columns, copy=False)
@@ -0,0 +1,135 @@
+"""The finviz short-interest screener (finviz_short.csv) as a compact table indexed by ticker.
+
+The CSV is read with the csv module; pandas is only imported once a join or grouping needs the frame.
+"""
+import csv
+import functools
+import hashlib
+import io
+import math
+import time
+
+# Screener columns kept from the CSV; the rest are numbers stored as float32 ('Change' is a percentage string)
+COLUMNS = ('Ticker', 'Sector', 'Industry', 'Market Cap', 'Price', 'Change', 'Volume')
+CATEGORY_COLUMNS = ('Sector', 'Industry')
+FLOAT32_COLUMNS = ('Market Cap', 'Price', 'Change')
+
+# Market-cap bands over finviz's "Market Cap" column, which is in millions of dollars
+CAP_BANDS = ('Nano', 'Micro', 'Small', 'Mid', 'Large', 'Mega')
+CAP_BAND_EDGES = (0, 50, 300, 2_000, 10_000, 200_000, math.inf)
+
+UNLISTED = "Not in screener"
+
+
+def _to_number(value):
+    try:
+        return float(value.rstrip('%').replace(',', ''))
+    except ValueError:
+        return math.nan
+
+
+class ShortInterestTable:
+    """Screener rows keyed by upper-case ticker.
+
+    `ticker in table` is the high short interest check behind the ⚠️ badge and only needs the ticker set.
+    The frame, with a 'Cap Band' categorical, is built from the parsed columns on first use; join() and
+    group_totals() look ITM tickers up in it with one reindex instead of a Python loop.
+    """
+
+    def __init__(self, columns, digest=None, load_seconds=0.0):
+        self.columns = columns
+        self.digest = digest
+        self.load_seconds = load_seconds
+        self.tickers = frozenset(columns['Ticker'])
+
+    @classmethod
+    def empty(cls):
+        return cls({name: [] for name in COLUMNS})
+
+    def __contains__(self, ticker):
+        return ticker in self.tickers
+
+    def __len__(self):
+        return len(self.tickers)
+
+    @functools.cached_property
+    def frame(self):
+        import pandas as pd
+
+        started = time.perf_counter()
+        frame = pd.DataFrame({
+            name: (pd.Categorical(self.columns[name]) if name in CATEGORY_COLUMNS
+                   else pd.array(self.columns[name], dtype='float32' if name in FLOAT32_COLUMNS else 'float64'))
+            for name in COLUMNS[1:]
+        }, index=pd.Index(self.columns['Ticker'], dtype='string', name='Ticker'))
+        frame['Cap Band'] = pd.cut(frame['Market Cap'], CAP_BAND_EDGES, labels=CAP_BANDS, right=False)
+        self.load_seconds += time.perf_counter() - started
+        return frame
+
+    @property
+    def memory_bytes(self):
+        """Size of the frame, or None until it has been built"""
+        if 'frame' not in self.__dict__:
+            return None
+        return int(self.frame.memory_usage(deep=True).sum() + self.frame.index.memory_usage(deep=True))
+
+    def stats(self):
+        return {'tickers': len(self), 'load_ms': round(self.load_seconds * 1000, 1), 'memory_bytes': self.memory_bytes,
+                'sectors': len({sector for sector in self.columns['Sector'] if sector})}
+
+    def join(self, tickers):
+        """Screener columns for tickers, in their order; rows for tickers not in the screener are NaN"""
+        import pandas as pd
+
+        return self.frame.reindex(pd.Index(tickers, dtype='string'))
+
+    def groups(self):
+        """{ticker: (sector, cap band)} for every screener ticker"""
+        groups = self.frame[['Sector', 'Cap Band']].astype(object)
+        groups = groups.where(groups.notna(), None)
+        return dict(zip(groups.index, zip(groups['Sector'], groups['Cap Band'])))
+
+    def group_totals(self, values, by):
+        """Sum of a ticker-indexed Series per screener column `by` ('Sector', 'Cap Band', ...), largest first.
+
+        Tickers that aren't in the screener are totalled under UNLISTED.
+        """
+        groups = self.join(values.index)[by].astype(object).fillna(UNLISTED).to_numpy()
+        return values.groupby(groups, sort=False).sum().sort_values(ascending=False)
+
+
+def read_short_interest(data, digest=None):
+    """Parse the screener CSV bytes into a ShortInterestTable, keeping only COLUMNS.
+
+    Raises ValueError if there is no Ticker column; other missing columns are left empty. Blank and
+    repeated tickers are skipped.
+    """
+    started = time.perf_counter()
+    reader = csv.reader(io.StringIO(data.decode('utf-8-sig')))
+    header = [name.strip() for name in next(reader, [])]
+    if 'Ticker' not in header:
+        raise ValueError("'Ticker' column not found")
+    ticker_position = header.index('Ticker')
+    positions = [(name, header.index(name) if name in header else None) for name in COLUMNS[1:]]
+    columns = {name: [] for name in COLUMNS}
+    seen = set()
+    for row in reader:
+        ticker = row[ticker_position].strip().upper() if ticker_position < len(row) else ''
+        if not ticker or ticker in seen:
+            continue
+        seen.add(ticker)
+        columns['Ticker'].append(ticker)
+        for name, position in positions:
+            value = row[position].strip() if position is not None and position < len(row) else ''
+            columns[name].append((value or None) if name in CATEGORY_COLUMNS else _to_number(value))
+    return ShortInterestTable(columns, digest, time.perf_counter() - started)
+
+
+def load_short_interest(path, previous=None):
+    """ShortInterestTable for the CSV at path; previous is returned as is when the file's content hasn't changed"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    if previous is not None and previous.digest == digest:
+        return previous
+    return read_short_interest(data, digest)